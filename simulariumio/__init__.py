@@ -12,6 +12,9 @@ except PackageNotFoundError:
 
 from .data_objects import (  # noqa: F401
     AgentData,
+    RaggedAgentData,
+    RaggedArray,
+    BoundsData,
     DisplayData,
     CameraData,
     DimensionData,
@@ -23,9 +26,14 @@ from .data_objects import (  # noqa: F401
     TrajectoryData,
     UnitData,
     FrameData,
+    FrameBatchData,
+    FrameCache,
+    AgentIndex,
+    AgentTimeSeriesData,
     SimulariumFileData,
     JsonData,
     BinaryData,
+    ChunkedBinaryData,
 )
 # DO NOT ISORT DISPLAY_TYPE, CAUSES CIRCULAR DEP
 from .constants import BINARY_SETTINGS, DISPLAY_TYPE  # noqa: F401
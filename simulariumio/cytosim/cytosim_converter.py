@@ -12,6 +12,7 @@ from ..data_objects import (
     UnitData,
     DimensionData,
     DisplayData,
+    BoundsData,
 )
 from ..constants import VIZ_TYPE, DISPLAY_TYPE, SUBPOINT_VALUES_PER_ITEM
 from ..exceptions import InputDataError
@@ -191,13 +192,15 @@ class CytosimConverter(TrajectoryConverter):
         used_unique_IDs: List[int],
         overall_line: int,
         total_lines: int,
-        scale_factor: float = None,
+        bounds: BoundsData,
     ) -> Tuple[Dict[str, Any], List[int], int]:
         """
         Parse a Cytosim output file containing objects
-        (fibers, solids, singles, or couples) to get agents
+        (fibers, solids, singles, or couples) to get agents,
+        and add the extent of each frame's new agents to the bounds
         """
         time_index = -1
+        first_agent = 0
         uids = {}
         is_fiber = "fiber" in object_type
         for line in data_lines:
@@ -208,7 +211,15 @@ class CytosimConverter(TrajectoryConverter):
             if line[0] == "%":
                 if "frame" in line:
                     # start of frame
+                    if time_index >= 0:
+                        bounds.add_frame(
+                            result,
+                            time_index,
+                            first_agent,
+                            SUBPOINT_VALUES_PER_ITEM(DISPLAY_TYPE.FIBER),
+                        )
                     time_index += 1
+                    first_agent = int(result.n_agents[time_index])
                 elif "time" in line:
                     # time metadata
                     result.times[time_index] = float(columns[2])
@@ -274,12 +285,15 @@ class CytosimConverter(TrajectoryConverter):
                 )
                 result.n_agents[time_index] += 1
             self.check_report_progress(overall_line / total_lines)
-        result, scale_factor = TrajectoryConverter.scale_agent_data(
-            result, scale_factor
-        )
-        result = TrajectoryConverter.center_fiber_positions(result)
+        if time_index >= 0:
+            bounds.add_frame(
+                result,
+                time_index,
+                first_agent,
+                SUBPOINT_VALUES_PER_ITEM(DISPLAY_TYPE.FIBER),
+            )
         result.n_timesteps = time_index + 1
-        return (result, used_unique_IDs, overall_line, scale_factor)
+        return (result, used_unique_IDs, overall_line)
 
     def _read(self, input_data: CytosimData) -> TrajectoryData:
         """
@@ -308,9 +322,10 @@ class CytosimConverter(TrajectoryConverter):
         )
 
         uids = []
+        bounds = BoundsData()
         for object_type in input_data.object_info:
             try:
-                (agent_data, uids, overall_line, scale_factor) = self._parse_objects(
+                (agent_data, uids, overall_line) = self._parse_objects(
                     object_type,
                     cytosim_data[object_type],
                     input_data.object_info[object_type],
@@ -318,10 +333,16 @@ class CytosimConverter(TrajectoryConverter):
                     uids,
                     overall_line,
                     total_lines,
-                    input_data.meta_data.scale_factor,
+                    bounds,
                 )
             except Exception as e:
                 raise InputDataError(f"Error reading input cytosim data: {e}")
+        agent_data, scale_factor = TrajectoryConverter.scale_agent_data(
+            agent_data,
+            input_data.meta_data.scale_factor,
+            bounds.get_min_max_positions(),
+        )
+        agent_data = TrajectoryConverter.center_fiber_positions(agent_data)
         # get display data (geometry and color)
         for object_type in input_data.object_info:
             for tid in input_data.object_info[object_type].display_data:
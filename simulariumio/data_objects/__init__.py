@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 
 from .agent_data import AgentData  # noqa: F401
+from .ragged_array import RaggedArray  # noqa: F401
+from .ragged_agent_data import RaggedAgentData  # noqa: F401
+from .bounds_data import BoundsData  # noqa: F401
 from .display_data import DisplayData  # noqa: F401
 from .trajectory_data import TrajectoryData  # noqa: F401
 from .meta_data import MetaData  # noqa: F401
@@ -14,5 +17,10 @@ from .histogram_plot_data import HistogramPlotData  # noqa: F401
 from .scatter_plot_data import ScatterPlotData  # noqa: F401
 from .json_data import JsonData  # noqa: F401
 from .binary_data import BinaryData  # noqa: F401
+from .chunked_binary_data import ChunkedBinaryData  # noqa: F401
 from .simularium_file_data import SimulariumFileData  # noqa: F401
 from .frame_data import FrameData  # noqa: F401
+from .frame_batch_data import FrameBatchData  # noqa: F401
+from .frame_cache import FrameCache  # noqa: F401
+from .agent_index import AgentIndex  # noqa: F401
+from .agent_time_series_data import AgentTimeSeriesData  # noqa: F401
@@ -165,31 +165,51 @@ class AgentData:
         """
         Get dimensions of a simularium JSON dict containing buffers
         """
-        bundle_data = buffer_data["spatialData"]["bundleData"]
-        result = DimensionData(total_steps=len(bundle_data), max_agents=0)
-        for time_index in range(result.total_steps):
-            # buffer = packed agent data as a list of numbers
-            buffer = bundle_data[time_index]["data"]
-            buffer_index = 0
-            agents = 0
-            while buffer_index < len(buffer):
-                # a new agent should start at this index
-                agents += 1
-                buffer_index += V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                # get the number of subpoints
-                subpoints = buffer[buffer_index]
-                if subpoints > result.max_subpoints:
-                    result.max_subpoints = int(subpoints)
-                buffer_index += int(
-                    buffer[buffer_index]
-                    + (
-                        V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT
-                        - V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
+        (
+            _,
+            frame_values,
+            frame_starts,
+            frame_ends,
+        ) = AgentData._get_frame_buffers(buffer_data["spatialData"]["bundleData"])
+        agent_starts, agent_frames = AgentData._get_agent_start_indices(
+            frame_values, frame_starts, frame_ends
+        )
+        n_agents = np.bincount(agent_frames, minlength=len(frame_starts))
+        return DimensionData(
+            total_steps=len(frame_starts),
+            max_agents=int(np.amax(n_agents, initial=0)),
+            max_subpoints=max(
+                int(
+                    np.amax(
+                        frame_values[agent_starts + V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX],
+                        initial=0,
                     )
-                )
-            if agents > result.max_agents:
-                result.max_agents = agents
-        return result
+                ),
+                0,
+            ),
+        )
+
+    @staticmethod
+    def _get_frame_buffers(
+        bundle_data: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the time of each frame in a simularium JSON bundleData,
+        all the frames' packed agent data converted into one numpy array,
+        and the index in it where each frame's data starts and ends
+        """
+        times = np.array([frame["time"] for frame in bundle_data], dtype=float)
+        frame_lengths = np.array(
+            [len(frame["data"]) for frame in bundle_data], dtype=np.int64
+        )
+        frame_ends = np.cumsum(frame_lengths)
+        frame_starts = frame_ends - frame_lengths
+        frame_values = np.zeros(int(np.sum(frame_lengths)))
+        for time_index, frame in enumerate(bundle_data):
+            frame_values[frame_starts[time_index] : frame_ends[time_index]] = frame[
+                "data"
+            ]
+        return times, frame_values, frame_starts, frame_ends
 
     def get_type_ids_and_mapping(self) -> Tuple[np.ndarray, Dict[str, Any]]:
         """
@@ -232,14 +252,14 @@ class AgentData:
         """
         Generate the type_names list from a type_ids array and a type_mapping
         """
-        result = []
-        for time_index in range(type_ids.shape[0]):
-            result.append([])
-            for agent_index in range(int(len(type_ids[time_index]))):
-                result[time_index].append(
-                    type_mapping[str(int(type_ids[time_index][agent_index]))]["name"]
-                )
-        return result
+        unique_type_ids, type_indices = np.unique(
+            np.asarray(type_ids).astype(int), return_inverse=True
+        )
+        unique_type_names = np.array(
+            [type_mapping[str(type_id)]["name"] for type_id in unique_type_ids],
+            dtype=object,
+        )
+        return unique_type_names[type_indices.reshape(np.shape(type_ids))].tolist()
 
     @staticmethod
     def get_display_data(
@@ -272,76 +292,256 @@ class AgentData:
 
     @classmethod
     def from_buffer_data(
-        cls, buffer_data: Dict[str, Any], display_data: Dict[int, DisplayData] = None
+        cls,
+        buffer_data: Dict[str, Any],
+        display_data: Dict[int, DisplayData] = None,
+        type_names: List[str] = None,
+        unique_ids: List[int] = None,
     ):
         """
-        Create AgentData from a simularium JSON dict containing buffers
+        Create AgentData from a simularium JSON dict containing buffers,
+        optionally only the agents with the given type names and unique IDs
+        """
+        spatial_data = buffer_data["spatialData"]
+        if "bundleData" in spatial_data:
+            (
+                times,
+                frame_values,
+                frame_starts,
+                frame_ends,
+            ) = AgentData._get_frame_buffers(spatial_data["bundleData"])
+        else:
+            # spatial data loaded as frame buffers from a binary file
+            times = spatial_data["times"]
+            frame_values = spatial_data["frameValues"]
+            frame_starts = spatial_data["frameStarts"]
+            frame_ends = spatial_data["frameEnds"]
+        return cls.from_frame_buffers(
+            times=times,
+            frame_values=frame_values,
+            frame_starts=frame_starts,
+            frame_ends=frame_ends,
+            type_mapping=buffer_data["trajectoryInfo"]["typeMapping"],
+            display_data=display_data,
+            type_names=type_names,
+            unique_ids=unique_ids,
+        )
+
+    @staticmethod
+    def _get_agent_start_indices(
+        frame_values: np.ndarray,
+        frame_starts: np.ndarray,
+        frame_ends: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the index where each agent starts in packed frame buffers
+        by stepping from each agent to the next using its number of subpoints,
+        for all frames at once.
+        Return the start index of each agent and the index of its frame,
+        ordered by frame and then by agent
+        """
+        buffer_struct = V1_SPATIAL_BUFFER_STRUCT
+        positions = np.asarray(frame_starts, dtype=np.int64)
+        frames = np.arange(len(positions))
+        agent_starts = [np.zeros(0, dtype=np.int64)]
+        agent_frames = [np.zeros(0, dtype=np.int64)]
+        while True:
+            in_frame = positions + buffer_struct.NSP_INDEX < frame_ends[frames]
+            positions = positions[in_frame]
+            frames = frames[in_frame]
+            if len(positions) < 1:
+                break
+            agent_starts.append(positions)
+            agent_frames.append(frames)
+            n_subpoints = frame_values[positions + buffer_struct.NSP_INDEX]
+            positions = (
+                positions
+                + buffer_struct.NSP_INDEX
+                + np.maximum(
+                    (
+                        n_subpoints + (buffer_struct.SP_INDEX - buffer_struct.NSP_INDEX)
+                    ).astype(np.int64),
+                    1,
+                )
+            )
+        agent_starts = np.concatenate(agent_starts)
+        agent_frames = np.concatenate(agent_frames)
+        order = np.lexsort((agent_starts, agent_frames))
+        return agent_starts[order], agent_frames[order]
+
+    @staticmethod
+    def _get_agent_indices(
+        frame_values: np.ndarray,
+        frame_starts: np.ndarray,
+        frame_ends: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find where each agent starts in packed frame buffers
+        Return the start index of each agent, the index of its frame,
+        its index within the frame, and the number of agents in each frame
+        """
+        agent_starts, agent_frames = AgentData._get_agent_start_indices(
+            frame_values, frame_starts, frame_ends
+        )
+        agent_indices, n_agents = AgentData._get_indices_in_frames(
+            agent_frames, len(frame_starts)
+        )
+        return agent_starts, agent_frames, agent_indices, n_agents
+
+    @staticmethod
+    def _get_indices_in_frames(
+        agent_frames: np.ndarray, n_frames: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        From the frame index of each agent, ordered by frame,
+        get each agent's index within its frame and the number of agents
+        in each frame
+        """
+        n_agents = np.bincount(agent_frames, minlength=n_frames)
+        agent_offsets = np.zeros(n_frames + 1, dtype=np.int64)
+        np.cumsum(n_agents, out=agent_offsets[1:])
+        agent_indices = np.arange(len(agent_frames)) - agent_offsets[agent_frames]
+        return agent_indices, n_agents
+
+    @staticmethod
+    def _get_selected_agents(
+        frame_values: np.ndarray,
+        agent_starts: np.ndarray,
+        type_mapping: Dict[str, Any],
+        type_names: List[str] = None,
+        unique_ids: List[int] = None,
+    ) -> np.ndarray:
+        """
+        Get a mask of the agents in packed frame buffers
+        that have one of the type names and one of the unique IDs
+        (or any type or ID if those aren't given)
+        """
+        buffer_struct = V1_SPATIAL_BUFFER_STRUCT
+        result = np.ones(len(agent_starts), dtype=bool)
+        if type_names is not None:
+            type_ids = [
+                int(type_id)
+                for type_id, type_info in type_mapping.items()
+                if type_info["name"] in type_names
+            ]
+            result &= np.isin(
+                frame_values[agent_starts + buffer_struct.TID_INDEX], type_ids
+            )
+        if unique_ids is not None:
+            result &= np.isin(
+                frame_values[agent_starts + buffer_struct.UID_INDEX],
+                np.asarray(list(unique_ids), dtype=float),
+            )
+        return result
+
+    @classmethod
+    def from_frame_buffers(
+        cls,
+        times: np.ndarray,
+        frame_values: np.ndarray,
+        frame_starts: np.ndarray,
+        frame_ends: np.ndarray,
+        type_mapping: Dict[str, Any],
+        display_data: Dict[int, DisplayData] = None,
+        type_names: List[str] = None,
+        unique_ids: List[int] = None,
+    ):
         """
-        bundle_data = buffer_data["spatialData"]["bundleData"]
-        dimensions = AgentData._get_buffer_data_dimensions(buffer_data)
+        Create AgentData from the packed buffer of agent data for each frame,
+        with all frames stored in one array,
+        decoding all the agents with numpy instead of one value at a time
+
+        Parameters
+        ----------
+        times : np.ndarray (shape = [timesteps])
+            The elapsed simulated time at each timestep
+        frame_values : np.ndarray
+            An array containing the packed agent data for every frame
+        frame_starts : np.ndarray (shape = [timesteps])
+            The index in frame_values where each frame's agent data starts
+        frame_ends : np.ndarray (shape = [timesteps])
+            The index in frame_values where each frame's agent data ends
+        type_mapping : Dict[str, Any]
+            The typeMapping from the trajectoryInfo
+        display_data : Dict[int, DisplayData] (optional)
+            DisplayData to use for type IDs without geometry in the type_mapping
+            Default: None
+        type_names : List[str] (optional)
+            Only decode agents with these type names
+            Default: None (agents of any type)
+        unique_ids : List[int] (optional)
+            Only decode agents with these unique IDs
+            Default: None (agents with any ID)
+        """
+        buffer_struct = V1_SPATIAL_BUFFER_STRUCT
+        frame_starts = np.asarray(frame_starts, dtype=np.int64)
+        frame_ends = np.asarray(frame_ends, dtype=np.int64)
+        total_steps = len(frame_starts)
+        (
+            agent_starts,
+            agent_frames,
+            agent_indices,
+            n_agents,
+        ) = AgentData._get_agent_indices(frame_values, frame_starts, frame_ends)
+        if type_names is not None or unique_ids is not None:
+            # drop the other agents before any of their data is read
+            selected = AgentData._get_selected_agents(
+                frame_values, agent_starts, type_mapping, type_names, unique_ids
+            )
+            agent_starts = agent_starts[selected]
+            agent_frames = agent_frames[selected]
+            agent_indices, n_agents = AgentData._get_indices_in_frames(
+                agent_frames, total_steps
+            )
+        n_subpoints = np.asarray(
+            frame_values[agent_starts + buffer_struct.NSP_INDEX]
+        ).astype(np.int64)
+        dimensions = DimensionData(
+            total_steps=total_steps,
+            max_agents=int(np.amax(n_agents)) if total_steps > 0 else 0,
+            max_subpoints=max(int(np.amax(n_subpoints, initial=0)), 0),
+        )
         print(f"original dim = {dimensions}")
         agent_data = AgentData.from_dimensions(dimensions)
         type_ids = np.zeros((dimensions.total_steps, dimensions.max_agents))
-        for time_index in range(dimensions.total_steps):
-            agent_data.times[time_index] = bundle_data[time_index]["time"]
-            frame_data = bundle_data[time_index]["data"]
-            agent_index = 0
-            buffer_index = 0
-            while buffer_index + V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX < len(frame_data):
-                # a new agent should start at this index
-                agent_data.viz_types[time_index][agent_index] = frame_data[
-                    buffer_index + V1_SPATIAL_BUFFER_STRUCT.VIZ_TYPE_INDEX
-                ]
-                agent_data.unique_ids[time_index][agent_index] = frame_data[
-                    buffer_index + V1_SPATIAL_BUFFER_STRUCT.UID_INDEX
-                ]
-                type_ids[time_index][agent_index] = frame_data[
-                    buffer_index + V1_SPATIAL_BUFFER_STRUCT.TID_INDEX
-                ]
-                agent_data.positions[time_index][agent_index] = [
-                    frame_data[buffer_index + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX],
-                    frame_data[buffer_index + V1_SPATIAL_BUFFER_STRUCT.POSY_INDEX],
-                    frame_data[buffer_index + V1_SPATIAL_BUFFER_STRUCT.POSZ_INDEX],
-                ]
-                agent_data.rotations[time_index][agent_index] = [
-                    frame_data[buffer_index + V1_SPATIAL_BUFFER_STRUCT.ROTX_INDEX],
-                    frame_data[buffer_index + V1_SPATIAL_BUFFER_STRUCT.ROTY_INDEX],
-                    frame_data[buffer_index + V1_SPATIAL_BUFFER_STRUCT.ROTZ_INDEX],
-                ]
-                agent_data.radii[time_index][agent_index] = frame_data[
-                    buffer_index + V1_SPATIAL_BUFFER_STRUCT.R_INDEX
-                ]
-                buffer_index += V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                # get the subpoints
-                if dimensions.max_subpoints < 1:
-                    buffer_index += int(
-                        V1_SPATIAL_BUFFER_STRUCT.SP_INDEX
-                        - V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                    )
-                    agent_index += 1
-                    continue
-                agent_data.n_subpoints[time_index][agent_index] = int(
-                    frame_data[buffer_index]
-                )
-                for i in range(int(frame_data[buffer_index])):
-                    agent_data.subpoints[time_index][agent_index][i] = frame_data[
-                        buffer_index + 1 + i
-                    ]
-                buffer_index += int(
-                    frame_data[buffer_index]
-                    + (
-                        V1_SPATIAL_BUFFER_STRUCT.SP_INDEX
-                        - V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                    )
-                )
-                agent_index += 1
-            agent_data.n_agents[time_index] = agent_index
-        type_names = AgentData.get_type_names(
-            type_ids, buffer_data["trajectoryInfo"]["typeMapping"]
-        )
-        display_data = AgentData.get_display_data(
-            buffer_data["trajectoryInfo"]["typeMapping"], display_data
-        )
+        agent_data.times[:] = times
+        agent_data.n_agents[:] = n_agents
+        index = (agent_frames, agent_indices)
+        agent_data.viz_types[index] = frame_values[
+            agent_starts + buffer_struct.VIZ_TYPE_INDEX
+        ]
+        agent_data.unique_ids[index] = frame_values[
+            agent_starts + buffer_struct.UID_INDEX
+        ]
+        type_ids[index] = frame_values[agent_starts + buffer_struct.TID_INDEX]
+        xyz = np.arange(VALUES_PER_3D_POINT)
+        agent_data.positions[index] = frame_values[
+            agent_starts[:, np.newaxis] + buffer_struct.POSX_INDEX + xyz
+        ]
+        agent_data.rotations[index] = frame_values[
+            agent_starts[:, np.newaxis] + buffer_struct.ROTX_INDEX + xyz
+        ]
+        agent_data.radii[index] = frame_values[agent_starts + buffer_struct.R_INDEX]
+        if dimensions.max_subpoints > 0:
+            agent_data.n_subpoints[index] = n_subpoints
+            subpoints_lengths = np.maximum(n_subpoints, 0)
+            subpoints_offsets = np.zeros(len(agent_starts) + 1, dtype=np.int64)
+            np.cumsum(subpoints_lengths, out=subpoints_offsets[1:])
+            subpoint_agents = np.repeat(np.arange(len(agent_starts)), subpoints_lengths)
+            subpoint_indices = (
+                np.arange(subpoints_offsets[-1]) - subpoints_offsets[subpoint_agents]
+            )
+            agent_data.subpoints[
+                agent_frames[subpoint_agents],
+                agent_indices[subpoint_agents],
+                subpoint_indices,
+            ] = frame_values[
+                agent_starts[subpoint_agents]
+                + buffer_struct.SP_INDEX
+                + subpoint_indices
+            ]
+        type_names = AgentData.get_type_names(type_ids, type_mapping)
+        display_data = AgentData.get_display_data(type_mapping, display_data)
         return cls(
             times=agent_data.times,
             n_agents=agent_data.n_agents,
@@ -576,6 +776,26 @@ class AgentData:
         result.draw_fiber_points = self.draw_fiber_points
         return result
 
+    def take_frames(self, frame_indices: np.ndarray) -> AgentData:
+        """
+        Get a copy with only the given frames, in the given order
+        """
+        frame_indices = np.asarray(frame_indices, dtype=int)
+        return AgentData(
+            times=self.times[frame_indices],
+            n_agents=self.n_agents[frame_indices],
+            viz_types=self.viz_types[frame_indices],
+            unique_ids=self.unique_ids[frame_indices],
+            types=[list(self.types[time_index]) for time_index in frame_indices],
+            positions=self.positions[frame_indices],
+            radii=self.radii[frame_indices],
+            rotations=self.rotations[frame_indices],
+            n_subpoints=self.n_subpoints[frame_indices],
+            subpoints=self.subpoints[frame_indices],
+            display_data=self.display_data,
+            draw_fiber_points=self.draw_fiber_points,
+        )
+
     def check_increase_buffer_size(
         self,
         next_index: int,
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+from typing import Tuple
+
+import numpy as np
+
+
+class AgentIndex:
+    def __init__(
+        self,
+        unique_ids: np.ndarray,
+        offsets: np.ndarray,
+        frames: np.ndarray,
+        byte_offsets: np.ndarray,
+        file_size: int = 0,
+        source_key: str = "",
+    ):
+        """
+        This object maps each agent's unique ID to the frames it is in
+        and where its data starts in each of those frames
+        in a binary .simularium file, so one agent's data can be read
+        without decoding whole frames
+
+        Parameters
+        ----------
+        unique_ids : np.ndarray (shape = [unique IDs])
+            Each unique ID in the file, sorted
+        offsets : np.ndarray (shape = [unique IDs + 1])
+            The index in frames and byte_offsets where the entries
+            for each unique ID start, followed by the total number of entries
+        frames : np.ndarray (shape = [entries])
+            The index of the frame for each entry, in order for each unique ID
+        byte_offsets : np.ndarray (shape = [entries])
+            The offset in bytes from the start of the file
+            to the agent's data for each entry
+        file_size : int (optional)
+            Size in bytes of the indexed file, used to check
+            that an index saved to a file is up to date
+            Default: 0
+        source_key : str (optional)
+            Identifies the contents of the indexed file, from its modification
+            time and hashes of its frame table and of the indexed unique IDs,
+            used to check that an index saved to a file is up to date
+            Default: ""
+        """
+        self.unique_ids = unique_ids
+        self.offsets = offsets
+        self.frames = frames
+        self.byte_offsets = byte_offsets
+        self.file_size = file_size
+        self.source_key = source_key
+
+    @classmethod
+    def from_agent_starts(
+        cls,
+        unique_ids: np.ndarray,
+        agent_frames: np.ndarray,
+        byte_offsets: np.ndarray,
+        file_size: int = 0,
+        source_key: str = "",
+    ) -> AgentIndex:
+        """
+        Create an AgentIndex from the unique ID, frame index, and byte offset
+        of every agent in every frame, ordered by frame
+        """
+        # a stable sort keeps each unique ID's entries in frame order
+        order = np.argsort(unique_ids, kind="stable")
+        sorted_ids = unique_ids[order]
+        index_ids, first_entries = np.unique(sorted_ids, return_index=True)
+        offsets = np.append(first_entries, len(sorted_ids)).astype(np.int64)
+        return cls(
+            unique_ids=index_ids.astype(np.int64),
+            offsets=offsets,
+            frames=agent_frames[order].astype(np.int64),
+            byte_offsets=byte_offsets[order].astype(np.int64),
+            file_size=file_size,
+            source_key=source_key,
+        )
+
+    def get(self, unique_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the frame indices and byte offsets of the agent
+        with the unique ID, or empty arrays if there is no such agent
+        """
+        index = int(np.searchsorted(self.unique_ids, unique_id))
+        if index >= len(self.unique_ids) or self.unique_ids[index] != unique_id:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        entries = slice(self.offsets[index], self.offsets[index + 1])
+        return self.frames[entries], self.byte_offsets[entries]
+
+    def save(self, path: str) -> None:
+        """
+        Save the index to a .npz file
+        """
+        with open(path, "wb") as index_file:
+            np.savez(
+                index_file,
+                unique_ids=self.unique_ids,
+                offsets=self.offsets,
+                frames=self.frames,
+                byte_offsets=self.byte_offsets,
+                file_size=np.array(self.file_size),
+                source_key=np.array(self.source_key),
+            )
+
+    @classmethod
+    def load(
+        cls, path: str, file_size: int = None, source_key: str = None
+    ) -> AgentIndex:
+        """
+        Load an index saved to a .npz file.
+        Return None if there is no file at the path,
+        or if a file_size or source_key is given and doesn't match
+        the indexed file's
+        """
+        if not os.path.isfile(path):
+            return None
+        with np.load(path) as index_data:
+            if file_size is not None and int(index_data["file_size"]) != file_size:
+                return None
+            saved_key = (
+                str(index_data["source_key"]) if "source_key" in index_data else ""
+            )
+            if source_key is not None and saved_key != source_key:
+                return None
+            return cls(
+                unique_ids=index_data["unique_ids"],
+                offsets=index_data["offsets"],
+                frames=index_data["frames"],
+                byte_offsets=index_data["byte_offsets"],
+                file_size=int(index_data["file_size"]),
+                source_key=saved_key,
+            )
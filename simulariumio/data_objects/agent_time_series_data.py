@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class AgentTimeSeriesData:
+    def __init__(
+        self,
+        unique_id: int,
+        frame_numbers: np.ndarray,
+        times: np.ndarray,
+        viz_types: np.ndarray,
+        type_ids: np.ndarray,
+        positions: np.ndarray,
+        rotations: np.ndarray,
+        radii: np.ndarray,
+        n_subpoints: np.ndarray,
+        subpoints: np.ndarray,
+    ):
+        """
+        This object holds the data for one agent
+        in each frame of simularium data that it is in
+
+        Parameters
+        ----------
+        unique_id : int
+            The unique ID of the agent
+        frame_numbers : np.ndarray (shape = [frames])
+            Index of each frame the agent is in
+        times : np.ndarray (shape = [frames])
+            Elapsed simulation time of each frame
+        viz_types : np.ndarray (shape = [frames])
+            The agent's viz type in each frame
+        type_ids : np.ndarray (shape = [frames])
+            The agent's type ID in each frame,
+            the keys of the trajectory info's typeMapping
+        positions : np.ndarray (shape = [frames, 3])
+            The agent's XYZ position in each frame
+        rotations : np.ndarray (shape = [frames, 3])
+            The agent's XYZ euler angles in each frame
+        radii : np.ndarray (shape = [frames])
+            The agent's radius in each frame
+        n_subpoints : np.ndarray (shape = [frames])
+            The agent's number of subpoints in each frame
+        subpoints : np.ndarray (shape = [frames, max subpoints])
+            The agent's subpoint values in each frame, padded with zeros
+        """
+        self.unique_id = unique_id
+        self.frame_numbers = frame_numbers
+        self.times = times
+        self.viz_types = viz_types
+        self.type_ids = type_ids
+        self.positions = positions
+        self.rotations = rotations
+        self.radii = radii
+        self.n_subpoints = n_subpoints
+        self.subpoints = subpoints
@@ -1,34 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
 from typing import Dict, List, Tuple
 import numpy as np
 
+from .agent_data import AgentData
+from .agent_index import AgentIndex
+from .agent_time_series_data import AgentTimeSeriesData
+from .frame_cache import FrameCache
 from .frame_data import FrameData
 from .input_file_data import InputFileData
 from .trajectory_data import TrajectoryData
 from .simularium_file_data import SimulariumFileData
-from ..constants import BINARY_BLOCK_TYPE, BINARY_SETTINGS
+from ..constants import (
+    BINARY_BLOCK_TYPE,
+    BINARY_SETTINGS,
+    V1_SPATIAL_BUFFER_STRUCT,
+    VALUES_PER_3D_POINT,
+)
+from ..exceptions import DataError
 from ..readers import BinaryBlockInfo, SimulariumBinaryReader
 
 
 class BinaryData(SimulariumFileData):
-    def __init__(self, file_contents: bytes):
+    def __init__(
+        self,
+        file_contents: bytes = None,
+        file_path: str = "",
+        memory_map: bool = False,
+        cache_max_bytes: int = 0,
+        read_ahead: int = 0,
+        n_read_ahead_workers: int = 1,
+    ):
         """
         This object holds binary encoded simulation trajectory file's
         data while staying close to the original file format
 
         Parameters
         ----------
-        file_contents : bytes
+        file_contents : bytes (optional)
             A byte array containing the data of an open .simularium file
+            Default: use file_path instead
+        file_path : str (optional)
+            A string path to a .simularium file
+            Default: use file_contents instead
+        memory_map : bool (optional)
+            Map the file at file_path into memory instead of reading it,
+            so opening it is fast and each frame is read from disk
+            only when it is requested
+            Default: False
+        cache_max_bytes : int (optional)
+            Keep recently requested frames in memory, up to this many bytes
+            of frame data, evicting the least recently used frames first
+            Default: 0 (don't cache frames)
+        read_ahead : int (optional)
+            When caching frames, how many frames after each requested frame
+            to read into the cache in the background, or before it if frames
+            are being requested in reverse
+            Default: 0 (don't read ahead)
+        n_read_ahead_workers : int (optional)
+            How many threads to read ahead with
+            Default: 1
         """
-        self.file_contents = InputFileData(file_contents=file_contents)
+        if memory_map and not file_path:
+            raise DataError("A file_path is required to memory map a BinaryData")
+        self.file_contents = InputFileData(
+            file_path=file_path, file_contents=file_contents
+        )
         self.file_data = SimulariumBinaryReader._binary_data_from_source(
-            self.file_contents
+            self.file_contents, memory_map
         )
         self.frame_metadata: List[FrameMetadata] = []
         self.block_info: BinaryBlockInfo = None
         # Maps block type id to block index
         self.block_indices: Dict[int, int] = {}
+        self._agent_index: AgentIndex = None
         self._parse_file()
+        self.frame_cache: FrameCache = None
+        if cache_max_bytes > 0:
+            self.frame_cache = FrameCache(
+                read_frame=self._read_frame_at_index,
+                n_frames=self.get_num_frames(),
+                max_bytes=cache_max_bytes,
+                read_ahead=read_ahead,
+                n_workers=n_read_ahead_workers,
+            )
+
+    def close(self) -> None:
+        """
+        Stop the frame cache's read ahead threads, if there are any,
+        waiting for frames being read to finish, and close the memory map
+        and its file handle if the file was memory mapped.
+        Frames read from file contents can still be read afterwards,
+        without reading ahead, but a memory mapped file can't be read
+        after it is closed
+        """
+        if self.frame_cache is not None:
+            self.frame_cache.close()
+        byte_view = self.file_data.byte_view
+        if isinstance(byte_view, mmap.mmap):
+            # the numpy views export the mapping's buffer,
+            # so release them before closing it
+            self.file_data.int_view = None
+            self.file_data.float_view = None
+            self.file_data.byte_view = None
+            byte_view.close()
+
+    def __enter__(self) -> BinaryData:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     def _parse_file(self):
         # Read offset and length for each data block
@@ -77,6 +161,7 @@ class BinaryData(SimulariumFileData):
                 FrameMetadata(offset, length, frame_number, time)
             )
             current_frame_offset += int(length / BINARY_SETTINGS.BYTES_PER_VALUE)
+        self._set_frame_times([frame.time for frame in self.frame_metadata])
 
     def get_frame_at_index(self, frame_number: int) -> FrameData:
         """
@@ -86,7 +171,14 @@ class BinaryData(SimulariumFileData):
         if frame_number < 0 or frame_number >= len(self.frame_metadata):
             # invalid frame number requested
             return None
+        if self.frame_cache is not None:
+            return self.frame_cache.get(frame_number)
+        return self._read_frame_at_index(frame_number)
 
+    def _read_frame_at_index(self, frame_number: int) -> FrameData:
+        """
+        Read the frame data for frame at index from the file
+        """
         metadata: FrameMetadata = self.frame_metadata[frame_number]
         start, end = metadata.get_start_end_indices()
         data = self.file_data.byte_view[start:end]
@@ -99,23 +191,171 @@ class BinaryData(SimulariumFileData):
             data=data,
         )
 
-    def get_index_for_time(self, time: float) -> int:
+    def _get_frame_values(self, frame_number: int) -> Tuple[float, np.ndarray]:
+        """
+        Return the time and the packed agent data values
+        for the frame at index, as a view of the file data
+        """
+        metadata: FrameMetadata = self.frame_metadata[frame_number]
+        start, end = metadata.get_start_end_indices()
+        return (
+            metadata.time,
+            self.file_data.float_view[
+                int(start / BINARY_SETTINGS.BYTES_PER_VALUE)
+                + BINARY_SETTINGS.FRAME_HEADER_N_VALUES : int(
+                    end / BINARY_SETTINGS.BYTES_PER_VALUE
+                )
+            ],
+        )
+
+    def _get_frame_value_ranges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the index in the float view of the file
+        where each frame's agent data starts and ends
+        """
+        offsets = np.array(
+            [metadata.offset for metadata in self.frame_metadata], dtype=np.int64
+        )
+        lengths = np.array(
+            [metadata.length for metadata in self.frame_metadata], dtype=np.int64
+        )
+        return (
+            offsets // BINARY_SETTINGS.BYTES_PER_VALUE
+            + BINARY_SETTINGS.FRAME_HEADER_N_VALUES,
+            (offsets + lengths) // BINARY_SETTINGS.BYTES_PER_VALUE,
+        )
+
+    def _get_agent_starts(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find where each agent's data starts in every frame,
+        and return those indices, the frame index and the unique ID
+        of each agent
+        """
+        float_view = self.file_data.float_view
+        frame_starts, frame_ends = self._get_frame_value_ranges()
+        agent_starts, agent_frames = AgentData._get_agent_start_indices(
+            float_view, frame_starts, frame_ends
+        )
+        unique_ids = float_view[
+            agent_starts + V1_SPATIAL_BUFFER_STRUCT.UID_INDEX
+        ].astype(np.int64)
+        return agent_starts, agent_frames, unique_ids
+
+    def _get_agent_index_key(self, unique_ids: np.ndarray) -> str:
         """
-        Return index for frame closest to a given timestamp
+        Identify the contents of the file at file_path
+        from its modification time and hashes of the frame table
+        and of each agent's unique ID, so a saved agent index is rebuilt
+        if the file changes, even if its size stays the same
+        """
+        frame_table = np.array(
+            [[frame.offset, frame.length] for frame in self.frame_metadata],
+            dtype=np.int64,
+        )
+        return ":".join(
+            [
+                str(os.stat(self.file_contents.file_path).st_mtime_ns),
+                hashlib.sha1(frame_table.tobytes()).hexdigest(),
+                hashlib.sha1(unique_ids.tobytes()).hexdigest(),
+            ]
+        )
+
+    def get_agent_index(self, sidecar: bool = False) -> AgentIndex:
         """
-        closest_frame = -1
-        min_dist = np.inf
-        for frame in self.frame_metadata:
-            dist = abs(frame.time - time)
-            if dist < min_dist:
-                min_dist = dist
-                closest_frame = frame.frame_number
-            else:
-                # if dist is increasing, we've passed the closest frame
-                break
+        Return the index of each agent's data in the frames,
+        building it the first time it is requested
 
-        # frame index must be <= self.get_num_frames() - 1
-        return min(closest_frame, self.get_num_frames() - 1)
+        Parameters
+        ----------
+        sidecar : bool (optional)
+            Load the index from file_path + ".agent_index.npz" if it exists
+            and was built from a file with the same size, modification time,
+            frame table and unique IDs, otherwise build it and save it there
+            Default: False
+        """
+        if self._agent_index is not None:
+            return self._agent_index
+        if sidecar and not self.file_contents.file_path:
+            raise DataError("A file_path is required to save a BinaryData agent index")
+        agent_starts, agent_frames, unique_ids = self._get_agent_starts()
+        file_size = len(self.file_data.byte_view)
+        source_key = ""
+        sidecar_path = None
+        if sidecar:
+            source_key = self._get_agent_index_key(unique_ids)
+            sidecar_path = f"{self.file_contents.file_path}.agent_index.npz"
+            self._agent_index = AgentIndex.load(sidecar_path, file_size, source_key)
+        if self._agent_index is None:
+            self._agent_index = AgentIndex.from_agent_starts(
+                unique_ids=unique_ids,
+                agent_frames=agent_frames,
+                byte_offsets=agent_starts * BINARY_SETTINGS.BYTES_PER_VALUE,
+                file_size=file_size,
+                source_key=source_key,
+            )
+            if sidecar_path is not None:
+                self._agent_index.save(sidecar_path)
+        return self._agent_index
+
+    def get_agent_time_series(
+        self, unique_id: int, sidecar: bool = False
+    ) -> AgentTimeSeriesData:
+        """
+        Return the data for the agent with the unique ID in each frame
+        it is in, reading only that agent's data
+
+        Parameters
+        ----------
+        unique_id : int
+            The unique ID of the agent
+        sidecar : bool (optional)
+            Load or save the agent index next to the file,
+            see get_agent_index()
+            Default: False
+        """
+        frames, byte_offsets = self.get_agent_index(sidecar).get(unique_id)
+        if len(frames) < 1:
+            raise DataError(f"No agent with unique ID {unique_id} was found")
+        buffer_struct = V1_SPATIAL_BUFFER_STRUCT
+        float_view = self.file_data.float_view
+        agent_starts = byte_offsets // BINARY_SETTINGS.BYTES_PER_VALUE
+        xyz = np.arange(VALUES_PER_3D_POINT)
+        n_subpoints = float_view[agent_starts + buffer_struct.NSP_INDEX].astype(
+            np.int64
+        )
+        max_subpoints = max(int(np.amax(n_subpoints)), 0)
+        subpoint_indices = np.arange(max_subpoints)
+        has_subpoint = subpoint_indices[np.newaxis, :] < n_subpoints[:, np.newaxis]
+        subpoints = np.zeros((len(frames), max_subpoints))
+        subpoints[has_subpoint] = float_view[
+            (
+                agent_starts[:, np.newaxis]
+                + buffer_struct.SP_INDEX
+                + subpoint_indices[np.newaxis, :]
+            )[has_subpoint]
+        ]
+        return AgentTimeSeriesData(
+            unique_id=unique_id,
+            frame_numbers=frames,
+            times=np.array(
+                [self.frame_metadata[frame].time for frame in frames], dtype=float
+            ),
+            viz_types=float_view[agent_starts + buffer_struct.VIZ_TYPE_INDEX].astype(
+                float
+            ),
+            type_ids=float_view[agent_starts + buffer_struct.TID_INDEX].astype(
+                np.int64
+            ),
+            positions=float_view[
+                agent_starts[:, np.newaxis] + buffer_struct.POSX_INDEX + xyz
+            ].astype(float),
+            rotations=float_view[
+                agent_starts[:, np.newaxis] + buffer_struct.ROTX_INDEX + xyz
+            ].astype(float),
+            radii=float_view[agent_starts + buffer_struct.R_INDEX].astype(float),
+            n_subpoints=n_subpoints,
+            subpoints=subpoints,
+        )
 
     def get_trajectory_info(self) -> Dict:
         """
@@ -135,12 +375,27 @@ class BinaryData(SimulariumFileData):
             block_index, self.block_info, self.file_data.byte_view
         )
 
-    def get_trajectory_data_object(self) -> TrajectoryData:
+    def get_trajectory_data_object(
+        self, type_names: List[str] = None, unique_ids: List[int] = None
+    ) -> TrajectoryData:
         """
         Return the data of the trajectory, as a TrajectoryData object
+
+        Parameters
+        ----------
+        type_names : List[str] (optional)
+            Only decode agents with these type names
+            Default: None (agents of any type)
+        unique_ids : List[int] (optional)
+            Only decode agents with these unique IDs
+            Default: None (agents with any ID)
         """
-        trajectory_dict = SimulariumBinaryReader.load_binary(self.file_contents)
-        return TrajectoryData.from_buffer_data(trajectory_dict)
+        trajectory_dict = SimulariumBinaryReader._load_binary_file_data(
+            self.file_data, spatial_data_as_frames=True
+        )
+        return TrajectoryData.from_buffer_data(
+            trajectory_dict, type_names=type_names, unique_ids=unique_ids
+        )
 
     def get_file_contents(self) -> bytes:
         """
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .agent_data import AgentData
+from .display_data import DisplayData
+from ..constants import SUBPOINT_VALUES_PER_ITEM, VALUES_PER_3D_POINT
+
+###############################################################################
+
+log = logging.getLogger(__name__)
+
+###############################################################################
+
+
+class BoundsData:
+    min_dimensions: np.ndarray
+    max_dimensions: np.ndarray
+
+    def __init__(self):
+        """
+        This object accumulates the min and max XYZ extent of agents
+        as they are added, so a converter can add each frame as it is parsed
+        and know the scale factor and the translation to center the data
+        at the end of parsing, without reading all the agent data again.
+        Agents extend from their position +/- their radius,
+        fiber subpoints are XYZ points, sphere group subpoints
+        are XYZ +/- the radius of each sphere, and other subpoints
+        aren't positions so they're skipped
+        """
+        self.min_dimensions = np.full(VALUES_PER_3D_POINT, np.inf)
+        self.max_dimensions = np.full(VALUES_PER_3D_POINT, -np.inf)
+
+    def is_empty(self) -> bool:
+        """
+        Have no agents been added yet?
+        """
+        return bool(np.any(self.min_dimensions > self.max_dimensions))
+
+    def add_positions(self, positions: np.ndarray, radii: np.ndarray = None) -> None:
+        """
+        Add spheres at the given positions (shape = [n, 3])
+        with the given radii (shape = [n]), or points if radii is None
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, VALUES_PER_3D_POINT)
+        if len(positions) < 1:
+            return
+        if radii is None:
+            min_positions = max_positions = positions
+        else:
+            radii = np.asarray(radii, dtype=float).reshape(-1, 1)
+            min_positions = positions - radii
+            max_positions = positions + radii
+        np.minimum(
+            self.min_dimensions, np.amin(min_positions, 0), out=self.min_dimensions
+        )
+        np.maximum(
+            self.max_dimensions, np.amax(max_positions, 0), out=self.max_dimensions
+        )
+
+    def add_subpoints(self, subpoints: np.ndarray, values_per_item: int) -> None:
+        """
+        Add the items in a flat array of subpoint values
+        with the given number of values per item
+        """
+        if values_per_item < VALUES_PER_3D_POINT:
+            return
+        items = np.asarray(subpoints).reshape(-1, values_per_item)
+        self.add_positions(
+            items[:, :VALUES_PER_3D_POINT],
+            items[:, VALUES_PER_3D_POINT]
+            if values_per_item > VALUES_PER_3D_POINT
+            else None,
+        )
+
+    def add_agents(
+        self,
+        positions: np.ndarray,
+        radii: np.ndarray,
+        n_subpoints: np.ndarray = None,
+        subpoints: np.ndarray = None,
+        values_per_item: np.ndarray = None,
+    ) -> None:
+        """
+        Add agents with the given positions (shape = [n, 3]), radii,
+        number of subpoint values and subpoint values per item (shape = [n]),
+        and all their subpoint values in one flat array
+        """
+        self.add_positions(positions, radii)
+        if n_subpoints is None or not np.any(n_subpoints > 0):
+            return
+        value_values_per_item = np.repeat(values_per_item, n_subpoints)
+        for n_values in np.unique(values_per_item[n_subpoints > 0]):
+            self.add_subpoints(
+                subpoints[value_values_per_item == n_values], int(n_values)
+            )
+
+    @staticmethod
+    def _get_subpoints_values_per_item(
+        type_names: List[str],
+        n_subpoints: np.ndarray,
+        display_data: Dict[str, DisplayData],
+    ) -> np.ndarray:
+        """
+        Get the number of subpoint values per item for each agent
+        from the display type of its agent type, or 3 (XYZ)
+        for agent types without DisplayData yet
+        """
+        result = np.zeros(len(n_subpoints), dtype=int)
+        has_subpoints = n_subpoints > 0
+        if not np.any(has_subpoints):
+            return result
+        unique_type_names, type_codes = np.unique(
+            np.array([str(type_name) for type_name in type_names]),
+            return_inverse=True,
+        )
+        type_values_per_item = np.array(
+            [
+                SUBPOINT_VALUES_PER_ITEM(display_data[type_name].display_type)
+                if type_name in display_data
+                else VALUES_PER_3D_POINT
+                for type_name in unique_type_names
+            ],
+            dtype=int,
+        )
+        result[has_subpoints] = type_values_per_item[
+            type_codes.reshape(-1)[has_subpoints]
+        ]
+        return result
+
+    def add_frame(
+        self,
+        agent_data: AgentData,
+        time_index: int,
+        first_agent: int = 0,
+        values_per_item: int = None,
+    ) -> None:
+        """
+        Add the agents in a frame of (padded) AgentData
+
+        Parameters
+        ----------
+        agent_data : AgentData
+            The agent data being filled
+        time_index : int
+            The index of the frame to add
+        first_agent : int (optional)
+            Only add the agents in the frame from this index
+            to the number of agents in the frame
+            Default: 0
+        values_per_item : int (optional)
+            The number of subpoint values per item for every agent added,
+            if they're known while parsing
+            Default: None (look up the display type of each agent type
+            in the agent data's display data)
+        """
+        agents = slice(first_agent, int(agent_data.n_agents[time_index]))
+        positions = agent_data.positions[time_index][agents]
+        radii = agent_data.radii[time_index][agents]
+        if agent_data.subpoints is None or agent_data.subpoints.ndim < 3:
+            self.add_agents(positions, radii)
+            return
+        n_subpoints = agent_data.n_subpoints[time_index][agents].astype(int)
+        subpoints_mask = (
+            np.arange(agent_data.subpoints.shape[2])[np.newaxis, :]
+            < n_subpoints[:, np.newaxis]
+        )
+        if values_per_item is None:
+            agent_values_per_item = BoundsData._get_subpoints_values_per_item(
+                agent_data.types[time_index][agents],
+                n_subpoints,
+                agent_data.display_data,
+            )
+        else:
+            agent_values_per_item = np.full(len(n_subpoints), values_per_item)
+        self.add_agents(
+            positions,
+            radii,
+            n_subpoints,
+            agent_data.subpoints[time_index][agents][subpoints_mask],
+            agent_values_per_item,
+        )
+
+    def get_min_max_positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the min and max XYZ extent of the agents added so far,
+        or None if no agents have been added
+        """
+        if self.is_empty():
+            return None
+        return (self.min_dimensions.copy(), self.max_dimensions.copy())
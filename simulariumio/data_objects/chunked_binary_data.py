@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import copy
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .binary_data import BinaryData
+from .frame_data import FrameData
+from .trajectory_data import TrajectoryData
+from .simularium_file_data import SimulariumFileData
+from ..exceptions import DataError
+from ..readers import SimulariumBinaryReader
+
+
+class ChunkedBinaryData(SimulariumFileData):
+    def __init__(self, file_paths: List[str], memory_map: bool = True):
+        """
+        This object holds the data of a simulation trajectory
+        that was saved to more than one binary .simularium file
+        because it was too large for one file,
+        and treats the files as one trajectory
+
+        Parameters
+        ----------
+        file_paths : List[str]
+            String paths to the .simularium files, in order
+        memory_map : bool (optional)
+            Map the files into memory instead of reading them,
+            so each frame is read from disk only when it is requested
+            Default: True
+        """
+        if len(file_paths) < 1:
+            raise DataError("At least one file is required for a ChunkedBinaryData")
+        self.chunks: List[BinaryData] = [
+            BinaryData(file_path=file_path, memory_map=memory_map)
+            for file_path in file_paths
+        ]
+        # global index of the first frame in each chunk, then the total
+        self.chunk_offsets = np.zeros(len(self.chunks) + 1, dtype=np.int64)
+        np.cumsum(
+            [chunk.get_num_frames() for chunk in self.chunks],
+            out=self.chunk_offsets[1:],
+        )
+        self._set_frame_times(
+            [frame.time for chunk in self.chunks for frame in chunk.frame_metadata]
+        )
+
+    def close(self) -> None:
+        """
+        Close each file, including its memory map if it was memory mapped
+        """
+        for chunk in self.chunks:
+            chunk.close()
+
+    def __enter__(self) -> ChunkedBinaryData:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @classmethod
+    def from_output_path(cls, output_path: str, memory_map: bool = True):
+        """
+        Open the files BinaryWriter saved at the output path,
+        either output_path.simularium or each output_path_{index}.simularium
+
+        Parameters
+        ----------
+        output_path : str
+            The output path given when the files were saved,
+            without the .simularium extension
+        memory_map : bool (optional)
+            Map the files into memory instead of reading them
+            Default: True
+        """
+        file_paths = []
+        while os.path.isfile(f"{output_path}_{len(file_paths)}.simularium"):
+            file_paths.append(f"{output_path}_{len(file_paths)}.simularium")
+        if len(file_paths) < 1 and os.path.isfile(f"{output_path}.simularium"):
+            file_paths.append(f"{output_path}.simularium")
+        if len(file_paths) < 1:
+            raise DataError(f"No .simularium files found at {output_path}")
+        return cls(file_paths, memory_map)
+
+    def _get_chunk_index(self, frame_number: int) -> Tuple[int, int]:
+        """
+        Return the index of the chunk containing the frame at a global index
+        and the index of the frame within that chunk
+        """
+        chunk_index = (
+            int(np.searchsorted(self.chunk_offsets, frame_number, side="right")) - 1
+        )
+        return chunk_index, frame_number - int(self.chunk_offsets[chunk_index])
+
+    def get_frame_at_index(self, frame_number: int) -> FrameData:
+        """
+        Return frame data for frame at index. If there is no frame at the index,
+        return None.
+        """
+        if frame_number < 0 or frame_number >= self.get_num_frames():
+            # invalid frame number requested
+            return None
+        chunk_index, chunk_frame_number = self._get_chunk_index(frame_number)
+        frame = self.chunks[chunk_index].get_frame_at_index(chunk_frame_number)
+        return FrameData(
+            frame_number=frame_number,
+            n_agents=frame.n_agents,
+            time=frame.time,
+            data=frame.data,
+        )
+
+    def _get_frame_values(self, frame_number: int) -> Tuple[float, np.ndarray]:
+        """
+        Return the time and the packed agent data values
+        for the frame at index, as a view of the file data
+        """
+        chunk_index, chunk_frame_number = self._get_chunk_index(frame_number)
+        return self.chunks[chunk_index]._get_frame_values(chunk_frame_number)
+
+    def get_trajectory_info(self) -> Dict:
+        """
+        Return trajectory info block for trajectory, as dict,
+        with the total number of steps in all the files
+        """
+        result = copy.copy(self.chunks[0].get_trajectory_info())
+        result["totalSteps"] = self.get_num_frames()
+        return result
+
+    def get_plot_data(self) -> Dict:
+        """
+        Return plot data block for trajectory, as dict
+        """
+        return self.chunks[0].get_plot_data()
+
+    def get_trajectory_data_object(
+        self, type_names: List[str] = None, unique_ids: List[int] = None
+    ) -> TrajectoryData:
+        """
+        Return the data of the trajectory in all the files,
+        as a TrajectoryData object
+
+        Parameters
+        ----------
+        type_names : List[str] (optional)
+            Only decode agents with these type names
+            Default: None (agents of any type)
+        unique_ids : List[int] (optional)
+            Only decode agents with these unique IDs
+            Default: None (agents with any ID)
+        """
+        times = []
+        frame_values = []
+        frame_starts = []
+        frame_ends = []
+        n_values = 0
+        for chunk in self.chunks:
+            spatial_data = SimulariumBinaryReader._load_binary_file_data(
+                chunk.file_data, spatial_data_as_frames=True
+            )["spatialData"]
+            if spatial_data["bundleSize"] < 1:
+                continue
+            # only copy the frames, not the rest of each file
+            start = int(spatial_data["frameStarts"][0])
+            end = int(spatial_data["frameEnds"][-1])
+            times.append(spatial_data["times"])
+            frame_values.append(spatial_data["frameValues"][start:end])
+            frame_starts.append(spatial_data["frameStarts"] - start + n_values)
+            frame_ends.append(spatial_data["frameEnds"] - start + n_values)
+            n_values += end - start
+        trajectory_dict = {
+            "trajectoryInfo": self.get_trajectory_info(),
+            "spatialData": {
+                "version": 1,
+                "msgType": 1,
+                "bundleStart": 0,
+                "bundleSize": self.get_num_frames(),
+                "times": np.concatenate(times) if times else np.zeros(0),
+                "frameValues": (
+                    np.concatenate(frame_values) if frame_values else np.zeros(0)
+                ),
+                "frameStarts": (
+                    np.concatenate(frame_starts)
+                    if frame_starts
+                    else np.zeros(0, dtype=np.int64)
+                ),
+                "frameEnds": (
+                    np.concatenate(frame_ends)
+                    if frame_ends
+                    else np.zeros(0, dtype=np.int64)
+                ),
+            },
+            "plotData": self.get_plot_data(),
+        }
+        return TrajectoryData.from_buffer_data(
+            trajectory_dict, type_names=type_names, unique_ids=unique_ids
+        )
+
+    def get_file_contents(self) -> List[bytes]:
+        """
+        Return raw file data for each file, as bytes
+        """
+        return [chunk.get_file_contents() for chunk in self.chunks]
+
+    def get_num_frames(self) -> int:
+        """
+        Return number of frames in the trajectory
+        """
+        return int(self.chunk_offsets[-1])
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class FrameBatchData:
+    def __init__(
+        self,
+        frame_numbers: np.ndarray,
+        times: np.ndarray,
+        n_agents: np.ndarray,
+        viz_types: np.ndarray,
+        unique_ids: np.ndarray,
+        type_ids: np.ndarray,
+        positions: np.ndarray,
+        rotations: np.ndarray,
+        radii: np.ndarray,
+        n_subpoints: np.ndarray,
+    ):
+        """
+        This object holds the agent data for a batch of frames
+        of simularium data, stacked in numpy arrays padded with zeros
+        to the max number of agents in any of the frames
+
+        Parameters
+        ----------
+        frame_numbers : np.ndarray (shape = [frames])
+            Index of each frame in the simulation
+        times : np.ndarray (shape = [frames])
+            Elapsed simulation time of each frame
+        n_agents : np.ndarray (shape = [frames])
+            Number of agents in each frame
+        viz_types : np.ndarray (shape = [frames, agents])
+            The viz type for each agent in each frame
+        unique_ids : np.ndarray (shape = [frames, agents])
+            The unique ID for each agent in each frame
+        type_ids : np.ndarray (shape = [frames, agents])
+            The type ID for each agent in each frame,
+            the keys of the trajectory info's typeMapping
+        positions : np.ndarray (shape = [frames, agents, 3])
+            The XYZ position for each agent in each frame
+        rotations : np.ndarray (shape = [frames, agents, 3])
+            The XYZ euler angles for each agent in each frame
+        radii : np.ndarray (shape = [frames, agents])
+            The radius for each agent in each frame
+        n_subpoints : np.ndarray (shape = [frames, agents])
+            The number of subpoints for each agent in each frame
+        """
+        self.frame_numbers = frame_numbers
+        self.times = times
+        self.n_agents = n_agents
+        self.viz_types = viz_types
+        self.unique_ids = unique_ids
+        self.type_ids = type_ids
+        self.positions = positions
+        self.rotations = rotations
+        self.radii = radii
+        self.n_subpoints = n_subpoints
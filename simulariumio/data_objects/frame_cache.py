@@ -0,0 +1,172 @@
+import collections
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+from .frame_data import FrameData
+
+
+class FrameCache:
+    def __init__(
+        self,
+        read_frame: Callable[[int], FrameData],
+        n_frames: int,
+        max_bytes: int,
+        read_ahead: int = 0,
+        n_workers: int = 1,
+    ):
+        """
+        This object keeps recently used frames of simularium data in memory,
+        evicting the least recently used frames when the cached frames
+        hold more than max_bytes, and optionally reads ahead the next frames
+        in the direction frames are being requested on a thread pool
+
+        Parameters
+        ----------
+        read_frame : Callable[[int], FrameData]
+            Function to read the frame at an index from the file
+        n_frames : int
+            Number of frames in the file
+        max_bytes : int
+            Max total size of the cached frames' data, in bytes
+        read_ahead : int (optional)
+            How many frames after each requested frame to read in the background,
+            or before it if frames are being requested in reverse
+            Default: 0 (don't read ahead)
+        n_workers : int (optional)
+            How many threads to read ahead with
+            Default: 1
+        """
+        self.read_frame = read_frame
+        self.n_frames = n_frames
+        self.max_bytes = max_bytes
+        self.read_ahead = read_ahead
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._frames: Dict[int, FrameData] = collections.OrderedDict()
+        self._pending: Dict[int, Future] = {}
+        self._last_frame_number = None
+        self._lock = threading.Lock()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=n_workers) if read_ahead > 0 else None
+        )
+
+    @staticmethod
+    def _frame_size(frame: FrameData) -> int:
+        return len(frame.data)
+
+    def _add(self, frame_number: int, frame: FrameData) -> None:
+        """
+        Cache a frame and evict the least recently used frames until
+        the cache fits in max_bytes. Call while holding the lock
+        """
+        frame_size = FrameCache._frame_size(frame)
+        if frame_number in self._frames or frame_size > self.max_bytes:
+            return
+        self._frames[frame_number] = frame
+        self.n_bytes += frame_size
+        while self.n_bytes > self.max_bytes:
+            _, evicted = self._frames.popitem(last=False)
+            self.n_bytes -= FrameCache._frame_size(evicted)
+            self.evictions += 1
+
+    def _prefetch(self, frame_number: int) -> None:
+        """
+        Read a frame in the background and cache it
+        """
+        try:
+            frame = self.read_frame(frame_number)
+            with self._lock:
+                self._add(frame_number, frame)
+        finally:
+            with self._lock:
+                self._pending.pop(frame_number, None)
+
+    def _start_read_ahead(self, frame_number: int) -> None:
+        """
+        Start reading the next frames in the direction frames
+        are being requested. Call while holding the lock
+        """
+        if self._executor is None:
+            return
+        direction = (
+            -1
+            if self._last_frame_number is not None
+            and frame_number < self._last_frame_number
+            else 1
+        )
+        self._last_frame_number = frame_number
+        for offset in range(1, self.read_ahead + 1):
+            next_frame = frame_number + direction * offset
+            if next_frame < 0 or next_frame >= self.n_frames:
+                break
+            if next_frame in self._frames or next_frame in self._pending:
+                continue
+            self._pending[next_frame] = self._executor.submit(
+                self._prefetch, next_frame
+            )
+
+    def get(self, frame_number: int) -> FrameData:
+        """
+        Return the frame at the index, from the cache if possible
+        """
+        with self._lock:
+            self._start_read_ahead(frame_number)
+            frame = self._frames.get(frame_number)
+            if frame is not None:
+                self._frames.move_to_end(frame_number)
+                self.hits += 1
+                return frame
+            pending = self._pending.get(frame_number)
+        if pending is not None:
+            # the frame is already being read ahead, so wait for it
+            pending.result()
+            with self._lock:
+                frame = self._frames.get(frame_number)
+                if frame is not None:
+                    self._frames.move_to_end(frame_number)
+                    self.hits += 1
+                    return frame
+        frame = self.read_frame(frame_number)
+        with self._lock:
+            self.misses += 1
+            self._add(frame_number, frame)
+        return frame
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters, to help choose a cache size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "n_frames": len(self._frames),
+                "n_bytes": self.n_bytes,
+            }
+
+    def clear(self) -> None:
+        """
+        Remove all the cached frames (the counters are kept)
+        """
+        with self._lock:
+            self._frames.clear()
+            self.n_bytes = 0
+
+    def close(self) -> None:
+        """
+        Stop reading ahead, waiting for frames being read to finish
+        """
+        with self._lock:
+            executor = self._executor
+            if executor is None:
+                return
+            # stop new frames being read ahead before the lock is released,
+            # so get() can't submit to the executor after it is shut down
+            self._executor = None
+            executor.shutdown(wait=False)
+        # wait outside the lock, since frames being read ahead need it
+        executor.shutdown(wait=True)
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import mmap
 from typing import Union
 
 from ..exceptions import DataError
@@ -60,6 +61,14 @@ class InputFileData:
         with open(self.file_path, "r") as myfile:
             return myfile.read()
 
+    def get_memory_map(self) -> mmap.mmap:
+        """
+        Return the contents of the file at file_path mapped read-only
+        into memory, so data is only read from disk when it is accessed.
+        """
+        with open(self.file_path, "rb") as myfile:
+            return mmap.mmap(myfile.fileno(), 0, access=mmap.ACCESS_READ)
+
     def _is_binary(self):
         """
         Is this data in binary? (or JSON?)
@@ -1,26 +1,120 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple, Union
+import copy
 import json
 import numpy as np
 
+from .agent_data import AgentData
 from .frame_data import FrameData
+from .input_file_data import InputFileData
 from .simularium_file_data import SimulariumFileData
 from .trajectory_data import TrajectoryData
 from ..constants import V1_SPATIAL_BUFFER_STRUCT
+from ..readers import SimulariumJsonScanner
 
 
 class JsonData(SimulariumFileData):
-    def __init__(self, file_contents: str):
+    def __init__(
+        self,
+        file_contents: Union[str, bytes] = None,
+        file_path: str = "",
+        lazy: bool = False,
+    ):
         """
         This object holds JSON encoded simulation trajectory file's
         data while staying close to the original file format
 
         Parameters
         ----------
-        file_contents : str
+        file_contents : str or bytes (optional)
             A string of the data of an open .simularium file
+            Default: use file_path instead
+        file_path : str (optional)
+            A string path to a .simularium file
+            Default: use file_contents instead
+        lazy : bool (optional)
+            Instead of parsing the whole file, scan it for where each
+            frame is and only parse frames when they are requested.
+            With a file_path, the file is mapped into memory
+            instead of being read
+            Default: False
+        """
+        input_file = InputFileData(file_path=file_path, file_contents=file_contents)
+        self._source = None
+        self._frame_starts = None
+        self._frame_ends = None
+        if not lazy:
+            self.data = json.loads(input_file.get_contents())
+            self.n_agents = JsonData._get_n_agents(self.data)
+            self._set_frame_times(
+                [frame["time"] for frame in self.data["spatialData"]["bundleData"]]
+            )
+            return
+        if file_contents:
+            self._source = (
+                file_contents.encode("utf-8")
+                if isinstance(file_contents, str)
+                else file_contents
+            )
+        else:
+            self._source = input_file.get_memory_map()
+        (
+            array_start,
+            array_end,
+            self._frame_starts,
+            self._frame_ends,
+        ) = SimulariumJsonScanner._bundle_data_offsets(self._source)
+        # parse everything except the frames, leaving bundleData empty
+        self.data = json.loads(
+            self._source[: array_start + 1] + self._source[array_end:]
+        )
+        # count agents when each frame is first parsed
+        self.n_agents = [None] * self.get_num_frames()
+        self._set_frame_times(
+            [
+                self._get_lazy_frame_time(frame_number)
+                for frame_number in range(self.get_num_frames())
+            ]
+        )
+
+    def _get_lazy_frame_time(self, frame_number: int) -> float:
         """
-        self.data = json.loads(file_contents)
-        self.n_agents = JsonData._get_n_agents(self.data)
+        Read the time of a frame in lazy mode,
+        parsing the frame only if the time can't be found without it
+        """
+        time = SimulariumJsonScanner._frame_time(
+            self._source,
+            self._frame_starts[frame_number],
+            self._frame_ends[frame_number],
+        )
+        if time is None:
+            return self._get_bundle_frame(frame_number)["time"]
+        return time
+
+    def _get_bundle_frame(self, frame_number: int) -> Dict:
+        """
+        Return the bundleData entry for the frame at index,
+        parsing it from the file in lazy mode
+        """
+        if self._source is None:
+            return self.data["spatialData"]["bundleData"][frame_number]
+        return json.loads(
+            self._source[
+                self._frame_starts[frame_number] : self._frame_ends[frame_number] + 1
+            ]
+        )
+
+    def _get_frame_n_agents(self, frame_number: int, frame_data: List) -> int:
+        """
+        Return the number of agents in a frame, counting them
+        the first time the frame is requested in lazy mode
+        """
+        if self.n_agents[frame_number] is None:
+            frame_values = np.asarray(frame_data, dtype=float)
+            agent_starts, _ = AgentData._get_agent_start_indices(
+                frame_values, np.array([0]), np.array([len(frame_values)])
+            )
+            self.n_agents[frame_number] = len(agent_starts)
+        return self.n_agents[frame_number]
 
     def _get_n_agents(data: Dict) -> List[int]:
         # return number of agents in each timestamp as a list
@@ -45,37 +139,25 @@ class JsonData(SimulariumFileData):
         Return frame data for frame at index. If there is no frame at the index,
         return None.
         """
-        if frame_number < 0 or frame_number >= len(
-            self.data["spatialData"]["bundleData"]
-        ):
+        if frame_number < 0 or frame_number >= self.get_num_frames():
             # invalid frame number requested
             return None
 
-        frame_data = self.data["spatialData"]["bundleData"][frame_number]
+        frame_data = self._get_bundle_frame(frame_number)
         return FrameData(
             frame_number=frame_number,
-            n_agents=self.n_agents[frame_number],
+            n_agents=self._get_frame_n_agents(frame_number, frame_data["data"]),
             time=frame_data["time"],
             data=frame_data["data"],
         )
 
-    def get_index_for_time(self, time: float) -> int:
+    def _get_frame_values(self, frame_number: int) -> Tuple[float, np.ndarray]:
         """
-        Return index for frame closest to a given timestamp
+        Return the time and the packed agent data values
+        for the frame at index
         """
-        closest_frame = -1
-        min_dist = np.inf
-        for frame in self.data["spatialData"]["bundleData"]:
-            dist = abs(frame["time"] - time)
-            if dist < min_dist:
-                min_dist = dist
-                closest_frame = frame["frameNumber"]
-            else:
-                # if dist is increasing, we've passed the closest frame
-                break
-
-        # frame index must be <= self.get_num_frames() - 1
-        return min(closest_frame, self.get_num_frames() - 1)
+        frame_data = self._get_bundle_frame(frame_number)
+        return frame_data["time"], np.asarray(frame_data["data"], dtype=float)
 
     def get_trajectory_info(self) -> Dict:
         """
@@ -89,20 +171,45 @@ class JsonData(SimulariumFileData):
         """
         return self.data["plotData"]
 
-    def get_trajectory_data_object(self) -> TrajectoryData:
+    def get_trajectory_data_object(
+        self, type_names: List[str] = None, unique_ids: List[int] = None
+    ) -> TrajectoryData:
         """
         Return the data of the trajectory, as a TrajectoryData object
-        """
-        return TrajectoryData.from_buffer_data(self.data)
+        (in lazy mode, this parses every frame)
+
+        Parameters
+        ----------
+        type_names : List[str] (optional)
+            Only decode agents with these type names
+            Default: None (agents of any type)
+        unique_ids : List[int] (optional)
+            Only decode agents with these unique IDs
+            Default: None (agents with any ID)
+        """
+        return TrajectoryData.from_buffer_data(
+            self.get_file_contents(), type_names=type_names, unique_ids=unique_ids
+        )
 
     def get_file_contents(self) -> Dict:
         """
         Return raw file data, as a dict
-        """
-        return self.data
+        (in lazy mode, this parses every frame)
+        """
+        if self._source is None:
+            return self.data
+        result = copy.copy(self.data)
+        result["spatialData"] = copy.copy(self.data["spatialData"])
+        result["spatialData"]["bundleData"] = [
+            self._get_bundle_frame(frame_number)
+            for frame_number in range(self.get_num_frames())
+        ]
+        return result
 
     def get_num_frames(self) -> int:
         """
         Return number of frames in the trajectory
         """
+        if self._source is not None:
+            return len(self._frame_starts)
         return len(self.data["spatialData"]["bundleData"])
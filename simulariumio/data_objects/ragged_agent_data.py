@@ -0,0 +1,425 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import copy
+import logging
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from ..constants import VALUES_PER_3D_POINT
+from ..exceptions import DataError
+from .agent_data import AgentData
+from .dimension_data import DimensionData
+from .display_data import DisplayData
+from .ragged_array import RaggedArray
+
+###############################################################################
+
+log = logging.getLogger(__name__)
+
+###############################################################################
+
+
+class RaggedAgentData(AgentData):
+    viz_types: RaggedArray
+    unique_ids: RaggedArray
+    positions: RaggedArray
+    radii: RaggedArray
+    rotations: RaggedArray
+    n_subpoints: RaggedArray
+    subpoints: RaggedArray
+
+    def __init__(
+        self,
+        times: Union[np.ndarray, List[float]],
+        n_agents: Union[np.ndarray, List[int]],
+        viz_types: Union[np.ndarray, RaggedArray],
+        unique_ids: Union[np.ndarray, RaggedArray],
+        types: List[List[str]],
+        positions: Union[np.ndarray, RaggedArray],
+        radii: Union[np.ndarray, RaggedArray],
+        rotations: Union[np.ndarray, RaggedArray] = None,
+        n_subpoints: Union[np.ndarray, RaggedArray] = None,
+        subpoints: Union[np.ndarray, RaggedArray] = None,
+        display_data: Dict[str, DisplayData] = None,
+        draw_fiber_points: bool = False,
+        n_timesteps: int = -1,
+    ):
+        """
+        This object contains spatial simulation data like AgentData,
+        but without padding every frame to the max number of agents
+        and every agent to the max number of subpoints.
+        The data for all agents in all frames is concatenated,
+        and offsets select the agents in each frame (CSR layout).
+        Indexing by [time_index, agent_index] works like in AgentData,
+        so writers and filters can use this object directly
+
+        Parameters
+        ----------
+        times : np.ndarray or List[float] (shape = [timesteps])
+            A numpy ndarray or list containing the elapsed simulated
+            time at each timestep (in the units specified by
+            TrajectoryData.time_units)
+        n_agents : np.ndarray or List[int] (shape = [timesteps])
+            A numpy ndarray or list containing the number of agents
+            that exist at each timestep
+        viz_types : np.ndarray (shape = [total agents])
+            The viz type for each agent in each frame, concatenated
+        unique_ids : np.ndarray (shape = [total agents])
+            The unique ID for each agent in each frame, concatenated
+        types : List[List[str]] (list of shape [timesteps, agents])
+            A list containing timesteps, for each a list of
+            the string name for the type of each agent
+        positions : np.ndarray (shape = [total agents, 3])
+            The XYZ position for each agent in each frame, concatenated
+        radii : np.ndarray (shape = [total agents])
+            The radius for each agent in each frame, concatenated
+        rotations : np.ndarray (shape = [total agents, 3]) (optional)
+            The XYZ euler angles for each agent in each frame, concatenated
+            Default: [0, 0, 0] for each agent
+        n_subpoints : np.ndarray (shape = [total agents]) (optional)
+            The number of subpoints for each agent in each frame, concatenated
+            Default: 0 for each agent
+        subpoints : np.ndarray (shape = [total subpoints]) (optional)
+            The subpoints for each agent in each frame, concatenated
+            (the lengths must match n_subpoints)
+            Default: None
+        display_data: Dict[str,DisplayData] (optional)
+            A dictionary mapping agent type name to DisplayData
+            to use for that type
+            Default: None
+        draw_fiber_points: bool (optional)
+            Draw spheres at every other fiber point for fibers?
+            Default: False
+        n_timesteps : int (optional)
+            Use the first n_timesteps frames of data
+            Default: -1 (use the full length of the buffer)
+        """
+        self.times = np.array(times)
+        self.n_agents = np.array(n_agents)
+        self.agent_offsets = RaggedArray.offsets_from_lengths(self.n_agents)
+        total_agents = int(self.agent_offsets[-1])
+        self.viz_types = self._per_agent(viz_types, float)
+        self.unique_ids = self._per_agent(unique_ids, float)
+        self.types = types
+        self.positions = self._per_agent(positions, float)
+        self.radii = self._per_agent(radii, float)
+        self.rotations = self._per_agent(
+            rotations
+            if rotations is not None
+            else np.zeros((total_agents, VALUES_PER_3D_POINT)),
+            float,
+        )
+        self.set_subpoints(
+            n_subpoints if n_subpoints is not None else np.zeros(total_agents),
+            subpoints if subpoints is not None else np.zeros(0),
+        )
+        self.display_data = display_data if display_data is not None else {}
+        self.draw_fiber_points = draw_fiber_points
+        self.n_timesteps = n_timesteps
+
+    def _per_agent(
+        self, values: Union[np.ndarray, RaggedArray], dtype: Any
+    ) -> RaggedArray:
+        """
+        Wrap concatenated values for each agent so they are indexed by frame
+        """
+        if isinstance(values, RaggedArray):
+            values = values.values
+        values = np.asarray(values, dtype=dtype)
+        if values.shape[0] != self.agent_offsets[-1]:
+            raise DataError(
+                f"Expected values for {self.agent_offsets[-1]} agents, "
+                f"found {values.shape[0]}"
+            )
+        return RaggedArray(values, self.agent_offsets)
+
+    def set_subpoints(
+        self,
+        n_subpoints: Union[np.ndarray, RaggedArray],
+        subpoints: Union[np.ndarray, RaggedArray],
+    ) -> None:
+        """
+        Replace the subpoints for all agents,
+        subpoints are the concatenated values for each agent in each frame
+        """
+        self.n_subpoints = self._per_agent(n_subpoints, int)
+        if isinstance(subpoints, RaggedArray):
+            subpoints = subpoints.leaf
+        subpoints = np.asarray(subpoints, dtype=float)
+        subpoint_offsets = RaggedArray.offsets_from_lengths(self.n_subpoints.values)
+        if subpoints.shape[0] != subpoint_offsets[-1]:
+            raise DataError(
+                f"Expected {subpoint_offsets[-1]} subpoint values "
+                f"from n_subpoints, found {subpoints.shape[0]}"
+            )
+        self.subpoints = RaggedArray(
+            RaggedArray(subpoints, subpoint_offsets), self.agent_offsets
+        )
+
+    @staticmethod
+    def _agents_mask(agent_data: AgentData) -> np.ndarray:
+        """
+        Get a mask of the entries in padded AgentData arrays
+        that hold an agent (shape = [timesteps, max agents])
+        """
+        total_steps = agent_data.total_timesteps()
+        max_agents = agent_data.viz_types.shape[1]
+        return (
+            np.arange(max_agents)[np.newaxis, :]
+            < agent_data.n_agents[:total_steps, np.newaxis]
+        )
+
+    @classmethod
+    def from_agent_data(cls, agent_data: AgentData) -> RaggedAgentData:
+        """
+        Create RaggedAgentData from (padded) AgentData
+        """
+        if isinstance(agent_data, RaggedAgentData):
+            return copy.deepcopy(agent_data)
+        total_steps = agent_data.total_timesteps()
+        mask = RaggedAgentData._agents_mask(agent_data)
+        n_subpoints = agent_data.n_subpoints[:total_steps][mask].astype(int)
+        if len(agent_data.subpoints.shape) > 2 and n_subpoints.size > 0:
+            max_subpoints = agent_data.subpoints.shape[2]
+            subpoints_mask = (
+                np.arange(max_subpoints)[np.newaxis, :] < n_subpoints[:, np.newaxis]
+            )
+            subpoints = agent_data.subpoints[:total_steps][mask][subpoints_mask]
+        else:
+            n_subpoints = np.zeros_like(n_subpoints)
+            subpoints = np.zeros(0)
+        return cls(
+            times=np.copy(agent_data.times[:total_steps]),
+            n_agents=np.copy(agent_data.n_agents[:total_steps]).astype(int),
+            viz_types=agent_data.viz_types[:total_steps][mask],
+            unique_ids=agent_data.unique_ids[:total_steps][mask],
+            types=[
+                list(
+                    agent_data.types[time_index][: int(agent_data.n_agents[time_index])]
+                )
+                for time_index in range(total_steps)
+            ],
+            positions=agent_data.positions[:total_steps][mask],
+            radii=agent_data.radii[:total_steps][mask],
+            rotations=agent_data.rotations[:total_steps][mask],
+            n_subpoints=n_subpoints,
+            subpoints=subpoints,
+            display_data=copy.deepcopy(agent_data.display_data),
+            draw_fiber_points=agent_data.draw_fiber_points,
+        )
+
+    def to_agent_data(self) -> AgentData:
+        """
+        Create (padded) AgentData with the same data
+        """
+        result = AgentData.from_dimensions(self.get_dimensions())
+        total_steps = self.total_timesteps()
+        result.times[:] = self.times[:total_steps]
+        result.n_agents[:] = self.n_agents[:total_steps]
+        mask = RaggedAgentData._agents_mask(result)
+        result.viz_types[mask] = self.viz_types.values
+        result.unique_ids[mask] = self.unique_ids.values
+        result.positions[mask] = self.positions.values
+        result.radii[mask] = self.radii.values
+        result.rotations[mask] = self.rotations.values
+        result.n_subpoints[mask] = self.n_subpoints.values
+        if self.subpoints.size > 0:
+            result.subpoints[mask] = self.subpoints.values.to_padded()
+        result.types = [list(frame_types) for frame_types in self.types]
+        result.display_data = copy.deepcopy(self.display_data)
+        result.draw_fiber_points = self.draw_fiber_points
+        return result
+
+    def get_dimensions(self) -> DimensionData:
+        """
+        Get the dimensions of the padded arrays this data would fill
+        """
+        total_steps = self.total_timesteps()
+        return DimensionData(
+            total_steps=total_steps,
+            max_agents=int(np.amax(self.n_agents[:total_steps]))
+            if total_steps > 0
+            else 0,
+            max_subpoints=int(self.n_subpoints.max()),
+        )
+
+    def get_type_ids_and_mapping(self) -> Tuple[RaggedArray, Dict[str, Any]]:
+        """
+        Generate a type_ids array, indexed like the other agent fields,
+        from the type_names list
+        """
+        type_ids = np.zeros(self.agent_offsets[-1])
+        type_name_mapping = {}
+        type_id_mapping = {}
+        for time_index in range(len(self.types)):
+            start = self.agent_offsets[time_index]
+            for agent_index, type_name in enumerate(self.types[time_index]):
+                if len(type_name) == 0:
+                    continue
+                if type_name not in type_id_mapping:
+                    tid = len(type_id_mapping)
+                    type_id_mapping[type_name] = tid
+                    if type_name not in self.display_data:
+                        raise DataError(
+                            f"Please provide DisplayData for agent type {type_name}"
+                        )
+                    type_name_mapping[str(tid)] = {
+                        "name": type_name,
+                        "geometry": dict(self.display_data[type_name]),
+                    }
+                type_ids[start + agent_index] = type_id_mapping[type_name]
+        return RaggedArray(type_ids, self.agent_offsets), type_name_mapping
+
+    def get_copy_with_increased_buffer_size(
+        self, added_dimensions: DimensionData, axis: int = 1
+    ) -> AgentData:
+        raise DataError("RaggedAgentData is not stored in padded buffers")
+
+    def take_frames(self, frame_indices: np.ndarray) -> RaggedAgentData:
+        """
+        Get a copy with only the given frames, in the given order
+        """
+        frame_indices = np.asarray(frame_indices, dtype=int)
+        subpoints = self.subpoints.take(frame_indices)
+        return RaggedAgentData(
+            times=self.times[frame_indices],
+            n_agents=self.n_agents[frame_indices],
+            viz_types=self.viz_types.take(frame_indices),
+            unique_ids=self.unique_ids.take(frame_indices),
+            types=[list(self.types[time_index]) for time_index in frame_indices],
+            positions=self.positions.take(frame_indices),
+            radii=self.radii.take(frame_indices),
+            rotations=self.rotations.take(frame_indices),
+            n_subpoints=self.n_subpoints.take(frame_indices),
+            subpoints=subpoints.leaf,
+            display_data=self.display_data,
+            draw_fiber_points=self.draw_fiber_points,
+        )
+
+    def take_agents(self, keep: np.ndarray) -> RaggedAgentData:
+        """
+        Get a copy with only the agents selected by keep,
+        a mask over all agents in all frames (shape = [total agents])
+        """
+        keep = np.asarray(keep, dtype=bool)
+        agent_frames = np.repeat(np.arange(len(self.n_agents)), self.n_agents)
+        n_agents = np.bincount(agent_frames[keep], minlength=len(self.n_agents)).astype(
+            int
+        )
+        types = []
+        for time_index in range(len(self.n_agents)):
+            start = self.agent_offsets[time_index]
+            end = self.agent_offsets[time_index + 1]
+            frame_keep = keep[start:end]
+            types.append(
+                [
+                    type_name
+                    for type_name, k in zip(self.types[time_index], frame_keep)
+                    if k
+                ]
+            )
+        return RaggedAgentData(
+            times=np.copy(self.times),
+            n_agents=n_agents,
+            viz_types=self.viz_types.values[keep],
+            unique_ids=self.unique_ids.values[keep],
+            types=types,
+            positions=self.positions.values[keep],
+            radii=self.radii.values[keep],
+            rotations=self.rotations.values[keep],
+            n_subpoints=self.n_subpoints.values[keep],
+            subpoints=self.subpoints.values.take(keep).leaf,
+            display_data=self.display_data,
+            draw_fiber_points=self.draw_fiber_points,
+        )
+
+    def append_agents(self, new_agents: RaggedAgentData) -> RaggedAgentData:
+        """
+        Get a copy with the new agents added after the current agents
+        in each frame (unique IDs are used as given)
+        """
+        total_steps = len(self.n_agents)
+        n_agents = self.n_agents.astype(int) + new_agents.n_agents.astype(int)
+        offsets = RaggedArray.offsets_from_lengths(n_agents)
+        # index in the result for each current agent and each new agent
+        frames = np.repeat(np.arange(total_steps), self.n_agents.astype(int))
+        current_indices = (
+            offsets[frames] + np.arange(frames.shape[0]) - self.agent_offsets[frames]
+        )
+        new_frames = np.repeat(np.arange(total_steps), new_agents.n_agents.astype(int))
+        new_indices = (
+            offsets[new_frames]
+            + self.n_agents[new_frames].astype(int)
+            + np.arange(new_frames.shape[0])
+            - new_agents.agent_offsets[new_frames]
+        )
+        order = np.zeros(offsets[-1], dtype=int)
+        order[current_indices] = np.arange(current_indices.shape[0])
+        order[new_indices] = current_indices.shape[0] + np.arange(new_indices.shape[0])
+
+        def combine(current: RaggedArray, new: RaggedArray) -> np.ndarray:
+            return np.concatenate([current.values, new.values])[order]
+
+        subpoints = RaggedArray.from_lengths(
+            np.concatenate([self.subpoints.leaf, new_agents.subpoints.leaf]),
+            np.concatenate([self.n_subpoints.values, new_agents.n_subpoints.values]),
+        ).take(order)
+        display_data = copy.copy(self.display_data)
+        display_data.update(new_agents.display_data)
+        return RaggedAgentData(
+            times=np.copy(self.times),
+            n_agents=n_agents,
+            viz_types=combine(self.viz_types, new_agents.viz_types),
+            unique_ids=combine(self.unique_ids, new_agents.unique_ids),
+            types=[
+                list(self.types[time_index]) + list(new_agents.types[time_index])
+                for time_index in range(total_steps)
+            ],
+            positions=combine(self.positions, new_agents.positions),
+            radii=combine(self.radii, new_agents.radii),
+            rotations=combine(self.rotations, new_agents.rotations),
+            n_subpoints=combine(self.n_subpoints, new_agents.n_subpoints),
+            subpoints=subpoints.leaf,
+            display_data=display_data,
+            draw_fiber_points=self.draw_fiber_points,
+        )
+
+    def __deepcopy__(self, memo):
+        result = type(self)(
+            times=np.copy(self.times),
+            n_agents=np.copy(self.n_agents),
+            viz_types=np.copy(self.viz_types.values),
+            unique_ids=np.copy(self.unique_ids.values),
+            types=copy.deepcopy(self.types, memo),
+            positions=np.copy(self.positions.values),
+            radii=np.copy(self.radii.values),
+            rotations=np.copy(self.rotations.values),
+            n_subpoints=np.copy(self.n_subpoints.values),
+            subpoints=np.copy(self.subpoints.leaf),
+            display_data=copy.deepcopy(self.display_data, memo),
+            draw_fiber_points=self.draw_fiber_points,
+            n_timesteps=self.n_timesteps,
+        )
+        return result
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, RaggedAgentData)
+            and self.n_timesteps == other.n_timesteps
+            and self.times.shape == other.times.shape
+            and False not in np.isclose(self.times, other.times)
+            and np.array_equal(self.n_agents, other.n_agents)
+            and self.viz_types.isclose(other.viz_types)
+            and self.unique_ids.isclose(other.unique_ids)
+            and self.types == other.types
+            and self.positions.isclose(other.positions)
+            and self.radii.isclose(other.radii)
+            and self.rotations.isclose(other.rotations)
+            and self.n_subpoints.isclose(other.n_subpoints)
+            and self.subpoints.isclose(other.subpoints)
+            and self.display_data == other.display_data
+            and self.draw_fiber_points == other.draw_fiber_points
+        )
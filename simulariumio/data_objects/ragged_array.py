@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import logging
+from typing import Any, Tuple, Union
+
+import numpy as np
+
+###############################################################################
+
+log = logging.getLogger(__name__)
+
+###############################################################################
+
+
+class RaggedArray:
+    values: Union[np.ndarray, RaggedArray]
+    offsets: np.ndarray
+
+    def __init__(
+        self,
+        values: Union[np.ndarray, RaggedArray],
+        offsets: np.ndarray,
+    ):
+        """
+        This object holds rows of different lengths
+        concatenated end to end in one array (CSR layout),
+        so no memory is spent on padding
+
+        Parameters
+        ----------
+        values : np.ndarray or RaggedArray
+            The items of every row concatenated along the first axis.
+            Use a RaggedArray to nest another level of rows,
+            e.g. subpoints for each agent in each frame
+        offsets : np.ndarray (shape = [rows + 1])
+            The index in values where each row starts,
+            followed by the total number of items
+        """
+        self.values = values
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @staticmethod
+    def offsets_from_lengths(lengths: np.ndarray) -> np.ndarray:
+        """
+        Get the offsets for rows with the given lengths
+        """
+        result = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(np.asarray(lengths, dtype=np.int64), out=result[1:])
+        return result
+
+    @classmethod
+    def from_lengths(
+        cls, values: Union[np.ndarray, RaggedArray], lengths: np.ndarray
+    ) -> RaggedArray:
+        """
+        Create a RaggedArray from concatenated values and the length of each row
+        """
+        return cls(values, RaggedArray.offsets_from_lengths(lengths))
+
+    @property
+    def leaf(self) -> np.ndarray:
+        """
+        The innermost array holding the actual values
+        """
+        if isinstance(self.values, RaggedArray):
+            return self.values.leaf
+        return self.values
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """
+        The number of items in each row
+        """
+        return np.diff(self.offsets)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """
+        The shape this data would have as a zero-padded numpy array
+        """
+        lengths = self.lengths
+        max_length = int(np.amax(lengths)) if lengths.size > 0 else 0
+        return (len(self), max_length) + tuple(self.values.shape[1:])
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        """
+        The number of values stored (not counting padding)
+        """
+        return self.leaf.size
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.leaf.dtype
+
+    def _row(self, index: int) -> Union[np.ndarray, RaggedArray]:
+        """
+        Get a view of the items in one row
+        """
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(f"row {index} is out of bounds for {len(self)} rows")
+        return self.values[self.offsets[index] : self.offsets[index + 1]]
+
+    def _slice(self, start: int, stop: int) -> RaggedArray:
+        """
+        Get a view of a contiguous range of rows
+        """
+        offsets = self.offsets[start : stop + 1]
+        return RaggedArray(self.values[offsets[0] : offsets[-1]], offsets - offsets[0])
+
+    def take(self, rows: np.ndarray) -> RaggedArray:
+        """
+        Get a copy of the given rows, in the given order
+        """
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        lengths = self.lengths[rows]
+        new_offsets = RaggedArray.offsets_from_lengths(lengths)
+        # index of each item in values = row start + position within row
+        item_indices = np.repeat(
+            self.offsets[rows] - new_offsets[:-1], lengths
+        ) + np.arange(new_offsets[-1])
+        return RaggedArray(self._take_values(item_indices), new_offsets)
+
+    def _take_values(self, item_indices: np.ndarray) -> Union[np.ndarray, RaggedArray]:
+        if isinstance(self.values, RaggedArray):
+            return self.values.take(item_indices)
+        return self.values[item_indices]
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, tuple):
+            if len(key) == 0:
+                return self
+            result = self[key[0]]
+            rest = key[1:]
+            if len(rest) == 0:
+                return result
+            return result[rest if len(rest) > 1 else rest[0]]
+        if isinstance(key, (int, np.integer)):
+            return self._row(int(key))
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return self._slice(start, max(start, stop))
+            return self.take(np.arange(start, stop, step))
+        return self.take(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if isinstance(key, tuple) and len(key) > 1:
+            rest = key[1:]
+            self[key[0]][rest if len(rest) > 1 else rest[0]] = value
+            return
+        if isinstance(key, tuple):
+            key = key[0]
+        if isinstance(key, (int, np.integer)):
+            self._row(int(key))[...] = value
+            return
+        raise IndexError("RaggedArray only supports assigning to single rows")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._row(index)
+
+    def max(self, axis: int = None, out: Any = None, **kwargs) -> Any:
+        """
+        Get the maximum value (no axis is supported)
+        Returns 0 if there are no values, matching a zero-padded array
+        """
+        if axis is not None:
+            raise ValueError("RaggedArray.max() does not support an axis")
+        leaf = self.leaf
+        return leaf.max() if leaf.size > 0 else leaf.dtype.type(0)
+
+    def min(self, axis: int = None, out: Any = None, **kwargs) -> Any:
+        """
+        Get the minimum value (no axis is supported)
+        Returns 0 if there are no values, matching a zero-padded array
+        """
+        if axis is not None:
+            raise ValueError("RaggedArray.min() does not support an axis")
+        leaf = self.leaf
+        return leaf.min() if leaf.size > 0 else leaf.dtype.type(0)
+
+    def flatten(self) -> np.ndarray:
+        """
+        Get a flat copy of the values, without any padding
+        """
+        return self.leaf.flatten()
+
+    def with_leaf(self, leaf: np.ndarray) -> RaggedArray:
+        """
+        Get a RaggedArray with the same rows as this one
+        holding the given values
+        """
+        if isinstance(self.values, RaggedArray):
+            return RaggedArray(self.values.with_leaf(leaf), self.offsets)
+        return RaggedArray(leaf, self.offsets)
+
+    def to_padded(self, fill: float = 0) -> np.ndarray:
+        """
+        Get the data as a numpy array padded with the fill value
+        """
+        result = np.full(self.shape, fill, dtype=self.dtype)
+        if isinstance(self.values, RaggedArray):
+            inner = self.values.to_padded(fill)
+            result[self._padded_mask()] = inner
+        else:
+            result[self._padded_mask()] = self.values
+        return result
+
+    def _padded_mask(self) -> np.ndarray:
+        """
+        Get a mask of the valid entries in the first two dimensions
+        of the padded array
+        """
+        shape = self.shape
+        return np.arange(shape[1])[np.newaxis, :] < self.lengths[:, np.newaxis]
+
+    def copy(self) -> RaggedArray:
+        if isinstance(self.values, RaggedArray):
+            return RaggedArray(self.values.copy(), np.copy(self.offsets))
+        return RaggedArray(np.copy(self.values), np.copy(self.offsets))
+
+    def __mul__(self, other: Any) -> RaggedArray:
+        return self.with_leaf(self.leaf * other)
+
+    def __rmul__(self, other: Any) -> RaggedArray:
+        return self.with_leaf(other * self.leaf)
+
+    def __imul__(self, other: Any) -> RaggedArray:
+        self.leaf[...] *= other
+        return self
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RaggedArray):
+            return (
+                np.array_equal(self.offsets, other.offsets)
+                and isinstance(self.values, RaggedArray)
+                == isinstance(other.values, RaggedArray)
+                and (
+                    self.values == other.values
+                    if isinstance(self.values, RaggedArray)
+                    else np.array_equal(self.values, other.values)
+                )
+            )
+        return False
+
+    def isclose(self, other: RaggedArray) -> bool:
+        """
+        Are the rows the same and the values close?
+        """
+        if not isinstance(other, RaggedArray) or not np.array_equal(
+            self.offsets, other.offsets
+        ):
+            return False
+        if isinstance(self.values, RaggedArray):
+            return self.values.isclose(other.values)
+        return self.values.shape == other.values.shape and bool(
+            np.all(np.isclose(self.values, other.values))
+        )
+
+    def __str__(self) -> str:
+        return f"RaggedArray(shape={self.shape}, size={self.size})"
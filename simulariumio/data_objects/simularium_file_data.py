@@ -1,10 +1,25 @@
-from typing import Dict, Union
+from typing import Dict, Iterator, List, Tuple, Union
 from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .agent_data import AgentData
 from .trajectory_data import TrajectoryData
 from .frame_data import FrameData
+from .frame_batch_data import FrameBatchData
+from ..constants import (
+    BINARY_SETTINGS,
+    V1_SPATIAL_BUFFER_STRUCT,
+    VALUES_PER_3D_POINT,
+)
 
 
 class SimulariumFileData(ABC):
+    # the time of each frame sorted, and the frame index for each sorted time,
+    # set by _set_frame_times() or built on first use
+    _sorted_times: np.ndarray = None
+    _time_order: np.ndarray = None
+
     def __init__(self, file_contents: Union[str, bytes]):
         pass
 
@@ -12,9 +27,60 @@ class SimulariumFileData(ABC):
     def get_frame_at_index(self, frame_number: int) -> Union[FrameData, None]:
         pass
 
-    @abstractmethod
+    def _set_frame_times(self, times: np.ndarray) -> None:
+        """
+        Sort the time of each frame once so frames can be looked up by time
+        """
+        times = np.asarray(times, dtype=float)
+        self._time_order = np.argsort(times, kind="stable")
+        self._sorted_times = times[self._time_order]
+
+    def _get_time_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the sorted frame times and the frame index for each of them,
+        reading the time of each frame if the subclass didn't set them
+        """
+        if self._sorted_times is None:
+            self._set_frame_times(
+                [
+                    self.get_frame_at_index(frame_number).time
+                    for frame_number in range(self.get_num_frames())
+                ]
+            )
+        return self._sorted_times, self._time_order
+
+    def get_indices_for_times(self, times: np.ndarray) -> np.ndarray:
+        """
+        Return the index of the frame closest to each of the given timestamps.
+        If frames are equally close, return the earliest frame.
+        If there are no frames, return -1 for each timestamp
+        """
+        times = np.asarray(times, dtype=float)
+        sorted_times, time_order = self._get_time_index()
+        if len(sorted_times) < 1:
+            return np.full(times.shape, -1, dtype=np.int64)
+        last = len(sorted_times) - 1
+        after = np.clip(np.searchsorted(sorted_times, times, side="left"), 0, last)
+        before = np.clip(after - 1, 0, last)
+        # stable sort means the first match is the earliest of equal times
+        after_frames = time_order[
+            np.searchsorted(sorted_times, sorted_times[after], side="left")
+        ]
+        before_frames = time_order[
+            np.searchsorted(sorted_times, sorted_times[before], side="left")
+        ]
+        after_dist = np.abs(sorted_times[after] - times)
+        before_dist = np.abs(sorted_times[before] - times)
+        use_before = (before_dist < after_dist) | (
+            (before_dist == after_dist) & (before_frames < after_frames)
+        )
+        return np.where(use_before, before_frames, after_frames)
+
     def get_index_for_time(self, time: float) -> int:
-        pass
+        """
+        Return index for frame closest to a given timestamp
+        """
+        return int(self.get_indices_for_times([time])[0])
 
     @abstractmethod
     def get_trajectory_info(self) -> Dict:
@@ -25,7 +91,9 @@ class SimulariumFileData(ABC):
         pass
 
     @abstractmethod
-    def get_trajectory_data_object(self) -> TrajectoryData:
+    def get_trajectory_data_object(
+        self, type_names: List[str] = None, unique_ids: List[int] = None
+    ) -> TrajectoryData:
         pass
 
     @abstractmethod
@@ -35,3 +103,107 @@ class SimulariumFileData(ABC):
     @abstractmethod
     def get_num_frames(self) -> int:
         pass
+
+    def _get_frame_values(self, frame_number: int) -> Tuple[float, np.ndarray]:
+        """
+        Return the time and the packed agent data values
+        for the frame at index, read from get_frame_at_index().
+        Subclasses can override this to read the values
+        without building FrameData
+        """
+        frame = self.get_frame_at_index(frame_number)
+        if isinstance(frame.data, (bytes, bytearray, memoryview)):
+            # a binary frame starts with its header values
+            values = np.frombuffer(frame.data, dtype=np.dtype("f").newbyteorder("<"))
+            return frame.time, values[BINARY_SETTINGS.FRAME_HEADER_N_VALUES :]
+        return frame.time, np.asarray(frame.data, dtype=float)
+
+    def iter_frames(
+        self, start: int = 0, stop: int = None, step: int = 1
+    ) -> Iterator[FrameData]:
+        """
+        Yield the frame data for each frame from start up to stop
+        (not including stop), every step frames.
+        Frames that are not requested are not read
+        """
+        frame_numbers = range(*slice(start, stop, step).indices(self.get_num_frames()))
+        for frame_number in frame_numbers:
+            yield self.get_frame_at_index(frame_number)
+
+    def _get_frame_numbers(
+        self, frame_numbers: Union[List[int], np.ndarray, range, slice]
+    ) -> np.ndarray:
+        """
+        Return the requested frame numbers as an array,
+        checking they are valid
+        """
+        if isinstance(frame_numbers, slice):
+            frame_numbers = range(*frame_numbers.indices(self.get_num_frames()))
+        frame_numbers = np.asarray(frame_numbers, dtype=np.int64).reshape(-1)
+        invalid = (frame_numbers < 0) | (frame_numbers >= self.get_num_frames())
+        if np.any(invalid):
+            raise IndexError(
+                f"Frame {frame_numbers[invalid][0]} is out of range "
+                f"for {self.get_num_frames()} frames"
+            )
+        return frame_numbers
+
+    def get_frames_batch(
+        self, frame_numbers: Union[List[int], np.ndarray, range, slice]
+    ) -> FrameBatchData:
+        """
+        Return the agent data for the frames at the given indices
+        stacked in numpy arrays. Frames that are not requested are not read
+
+        Parameters
+        ----------
+        frame_numbers : List[int], np.ndarray, range, or slice
+            Indices of the frames to read, in the order to return them
+        """
+        frame_numbers = self._get_frame_numbers(frame_numbers)
+        times = np.zeros(len(frame_numbers))
+        frame_buffers = []
+        for index, frame_number in enumerate(frame_numbers):
+            times[index], frame_buffer = self._get_frame_values(int(frame_number))
+            frame_buffers.append(frame_buffer)
+        frame_lengths = np.array([len(buffer) for buffer in frame_buffers], dtype=int)
+        frame_ends = np.cumsum(frame_lengths)
+        frame_values = (
+            np.concatenate(frame_buffers) if len(frame_buffers) > 0 else np.zeros(0)
+        )
+        (
+            agent_starts,
+            agent_frames,
+            agent_indices,
+            n_agents,
+        ) = AgentData._get_agent_indices(
+            frame_values, frame_ends - frame_lengths, frame_ends
+        )
+        shape = (len(frame_numbers), int(np.amax(n_agents, initial=0)))
+        index = (agent_frames, agent_indices)
+        buffer_struct = V1_SPATIAL_BUFFER_STRUCT
+        xyz = np.arange(VALUES_PER_3D_POINT)
+        result = {}
+        for name, value_index in [
+            ("viz_types", buffer_struct.VIZ_TYPE_INDEX),
+            ("unique_ids", buffer_struct.UID_INDEX),
+            ("type_ids", buffer_struct.TID_INDEX),
+            ("radii", buffer_struct.R_INDEX),
+            ("n_subpoints", buffer_struct.NSP_INDEX),
+        ]:
+            result[name] = np.zeros(shape)
+            result[name][index] = frame_values[agent_starts + value_index]
+        for name, value_index in [
+            ("positions", buffer_struct.POSX_INDEX),
+            ("rotations", buffer_struct.ROTX_INDEX),
+        ]:
+            result[name] = np.zeros(shape + (VALUES_PER_3D_POINT,))
+            result[name][index] = frame_values[
+                agent_starts[:, np.newaxis] + value_index + xyz
+            ]
+        return FrameBatchData(
+            frame_numbers=frame_numbers,
+            times=times,
+            n_agents=n_agents,
+            **result,
+        )
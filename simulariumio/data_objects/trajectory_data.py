@@ -8,6 +8,7 @@ from typing import Any, Dict, List
 import numpy as np
 
 from .agent_data import AgentData
+from .ragged_agent_data import RaggedAgentData
 from .unit_data import UnitData
 from .meta_data import MetaData
 from .display_data import DisplayData
@@ -73,16 +74,23 @@ class TrajectoryData:
 
     @classmethod
     def from_buffer_data(
-        cls, buffer_data: Dict[str, Any], display_data: Dict[int, DisplayData] = None
+        cls,
+        buffer_data: Dict[str, Any],
+        display_data: Dict[int, DisplayData] = None,
+        type_names: List[str] = None,
+        unique_ids: List[int] = None,
     ):
         """
-        Create TrajectoryData from a simularium JSON dict containing buffers
+        Create TrajectoryData from a simularium JSON dict containing buffers,
+        optionally only the agents with the given type names and unique IDs
         """
         if display_data is None:
             display_data = {}
         return cls(
             meta_data=MetaData.from_dict(buffer_data["trajectoryInfo"]),
-            agent_data=AgentData.from_buffer_data(buffer_data, display_data),
+            agent_data=AgentData.from_buffer_data(
+                buffer_data, display_data, type_names, unique_ids
+            ),
             time_units=UnitData.from_dict(
                 buffer_data["trajectoryInfo"]["timeUnits"], default_mag=1.0
             ),
@@ -97,6 +105,9 @@ class TrajectoryData:
         Concatenate the new AgentData with the current data,
         generate new unique IDs and type IDs as needed
         """
+        if isinstance(self.agent_data, RaggedAgentData):
+            self._append_agents_ragged(new_agents)
+            return
         # create appropriate length buffer with current agents
         current_dimensions = self.agent_data.get_dimensions()
         added_dimensions = new_agents.get_dimensions()
@@ -137,6 +148,26 @@ class TrajectoryData:
         result.display_data.update(new_agents.display_data)
         self.agent_data = result
 
+    def _append_agents_ragged(self, new_agents: AgentData):
+        """
+        Concatenate the new AgentData with the current data stored without
+        padding, generate new unique IDs as needed
+        """
+        new_agents = RaggedAgentData.from_agent_data(new_agents)
+        used_uids = set(np.unique(self.agent_data.unique_ids.flatten()).astype(int))
+        raw_uids = new_agents.unique_ids.values.astype(int)
+        unique_raw_uids, first_indices = np.unique(raw_uids, return_index=True)
+        new_uids = {}
+        # assign IDs in the order the agents first appear
+        for raw_uid in unique_raw_uids[np.argsort(first_indices)]:
+            uid = int(raw_uid)
+            while uid in used_uids:
+                uid += 1
+            new_uids[int(raw_uid)] = uid
+            used_uids.add(uid)
+        new_agents.unique_ids.values[:] = [new_uids[uid] for uid in raw_uids]
+        self.agent_data = self.agent_data.append_agents(new_agents)
+
     def __deepcopy__(self, memo):
         result = type(self)(
             meta_data=copy.deepcopy(self.meta_data, memo),
@@ -3,7 +3,7 @@
 
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from .trajectory_converter import TrajectoryConverter
 from .data_objects import TrajectoryData, UnitData, InputFileData, DisplayData
@@ -19,7 +19,11 @@ log = logging.getLogger(__name__)
 
 class FileConverter(TrajectoryConverter):
     def __init__(
-        self, input_file: InputFileData, display_data: Dict[int, DisplayData] = None
+        self,
+        input_file: InputFileData,
+        display_data: Dict[int, DisplayData] = None,
+        type_names: List[str] = None,
+        unique_ids: List[int] = None,
     ):
         """
         This object loads data from the input file in .simularium format.
@@ -28,12 +32,23 @@ class FileConverter(TrajectoryConverter):
         ----------
         input_file: InputFileData
             A InputFileData object containing .simularium data to load
+        display_data: Dict[int, DisplayData] (optional)
+            DisplayData to use for type IDs without geometry in the typeMapping
+            Default: None
+        type_names: List[str] (optional)
+            Only load agents with these type names
+            Default: None (agents of any type)
+        unique_ids: List[int] (optional)
+            Only load agents with these unique IDs
+            Default: None (agents with any ID)
         """
         if display_data is None:
             display_data = {}
         if input_file._is_binary():
             print("Reading Simularium binary -------------")
-            buffer_data = SimulariumBinaryReader.load_binary(input_file)
+            buffer_data = SimulariumBinaryReader.load_binary(
+                input_file, spatial_data_as_frames=True
+            )
         else:
             print("Reading Simularium JSON -------------")
             buffer_data = json.loads(input_file.get_contents())
@@ -42,7 +57,9 @@ class FileConverter(TrajectoryConverter):
             < CURRENT_VERSION.TRAJECTORY_INFO
         ):
             buffer_data = FileConverter.update_trajectory_info_version(buffer_data)
-        self._data = TrajectoryData.from_buffer_data(buffer_data, display_data)
+        self._data = TrajectoryData.from_buffer_data(
+            buffer_data, display_data, type_names, unique_ids
+        )
 
     @staticmethod
     def _update_trajectory_info_v1_to_v2(data: Dict[str, Any]) -> Dict[str, Any]:
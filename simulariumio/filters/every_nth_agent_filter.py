@@ -2,13 +2,14 @@
 # -*- coding: utf-8 -*-
 
 from simulariumio.data_objects.agent_data import AgentData
-from typing import Dict
+from simulariumio.data_objects.ragged_agent_data import RaggedAgentData
+from typing import Dict, List
 import logging
 
 import numpy as np
 
 from .filter import Filter
-from ..data_objects import TrajectoryData
+from ..data_objects import TrajectoryData, DimensionData
 
 ###############################################################################
 
@@ -20,6 +21,7 @@ log = logging.getLogger(__name__)
 class EveryNthAgentFilter(Filter):
     n_per_type: Dict[str, int]
     default_n: int
+    per_frame = True
 
     def __init__(self, n_per_type: Dict[str, int], default_n: int = 1):
         """
@@ -38,63 +40,134 @@ class EveryNthAgentFilter(Filter):
         self.n_per_type = n_per_type
         self.default_n = default_n
 
+    @staticmethod
+    def _flat_types(types: List[List[str]], n_agents: np.ndarray) -> List[str]:
+        """
+        Get the type name of each agent in each frame in one list
+        """
+        return [
+            type_name
+            for time_index, frame_types in enumerate(types)
+            for type_name in frame_types[: int(n_agents[time_index])]
+        ]
+
+    def _get_kept_agents(
+        self, types: List[List[str]], n_agents: np.ndarray
+    ) -> np.ndarray:
+        """
+        Get a mask over all agents in all frames, in order,
+        of the agents to keep: every nth agent of each type in each frame,
+        found by counting agents of each type in each frame with numpy
+        """
+        n_agents = np.asarray(n_agents).astype(int)
+        type_names, type_codes = np.unique(
+            np.array(
+                [
+                    str(type_name)
+                    for type_name in EveryNthAgentFilter._flat_types(types, n_agents)
+                ]
+            ),
+            return_inverse=True,
+        )
+        type_n = np.array(
+            [
+                self.n_per_type.get(type_name, self.default_n)
+                for type_name in type_names
+            ],
+            dtype=int,
+        )[type_codes]
+        # number of earlier agents of the same type in the same frame
+        agent_frames = np.repeat(np.arange(len(n_agents)), n_agents)
+        groups = agent_frames * max(len(type_names), 1) + type_codes
+        order = np.argsort(groups, kind="stable")
+        sorted_groups = groups[order]
+        is_first = np.ones(len(sorted_groups), dtype=bool)
+        is_first[1:] = sorted_groups[1:] != sorted_groups[:-1]
+        group_starts = np.maximum.accumulate(
+            np.where(is_first, np.arange(len(sorted_groups)), 0)
+        )
+        type_counts = np.empty(len(groups), dtype=int)
+        type_counts[order] = np.arange(len(sorted_groups)) - group_starts
+        return (type_n >= 1) & (type_counts % np.maximum(type_n, 1) == 0)
+
     def apply(self, data: TrajectoryData) -> TrajectoryData:
         """
         Reduce the number of agents in each frame of the simularium
         data by filtering out all but every nth agent
         """
         print("Filtering: every Nth agent -------------")
-        # get filtered data
-        start_dimensions = data.agent_data.get_dimensions()
-        result = AgentData.from_dimensions(start_dimensions)
-        result.times = data.agent_data.times
-        result.draw_fiber_points = data.agent_data.draw_fiber_points
-        result.display_data = data.agent_data.display_data
-        for time_index in range(start_dimensions.total_steps):
-            new_agent_index = 0
-            n_found = {}
-            n_a = int(data.agent_data.n_agents[time_index])
-            for agent_index in range(n_a):
-                type_name = str(data.agent_data.types[time_index][agent_index])
-                if type_name not in n_found:
-                    n_found[type_name] = -1
-                n_found[type_name] += 1
-                if type_name in self.n_per_type:
-                    inc = self.n_per_type[type_name]
-                else:
-                    inc = self.default_n
-                if inc < 1 or n_found[type_name] % inc != 0:
-                    continue
-                result.viz_types[time_index][
-                    new_agent_index
-                ] = data.agent_data.viz_types[time_index][agent_index]
-                result.unique_ids[time_index][
-                    new_agent_index
-                ] = data.agent_data.unique_ids[time_index][agent_index]
-                result.types[time_index].append(
-                    data.agent_data.types[time_index][agent_index]
-                )
-                result.positions[time_index][
-                    new_agent_index
-                ] = data.agent_data.positions[time_index][agent_index]
-                result.radii[time_index][new_agent_index] = data.agent_data.radii[
-                    time_index
-                ][agent_index]
-                result.rotations[time_index][
-                    new_agent_index
-                ] = data.agent_data.rotations[time_index][agent_index]
-                result.n_subpoints[time_index][
-                    new_agent_index
-                ] = data.agent_data.n_subpoints[time_index][agent_index]
-                result.subpoints[time_index][new_agent_index][
-                    : np.shape(data.agent_data.subpoints[time_index][agent_index])[0]
-                ] = data.agent_data.subpoints[time_index][agent_index]
-                new_agent_index += 1
-            result.n_agents[time_index] = new_agent_index
-        data.agent_data = result
-        print(
-            f"filtered dims = {start_dimensions.total_steps} timesteps X "
-            f"{int(np.amax(result.n_agents))} agents X "
-            f"{int(np.amax(data.agent_data.n_subpoints))} subpoints"
-        )
+        data.agent_data = self.apply_to_agent_data(data.agent_data)
+        print(f"filtered dims = {data.agent_data.get_dimensions()}")
         return data
+
+    def apply_to_agent_data(self, agent_data: AgentData) -> AgentData:
+        """
+        Keep every nth agent of each type in each frame
+        """
+        if isinstance(agent_data, RaggedAgentData):
+            keep = self._get_kept_agents(agent_data.types, agent_data.n_agents)
+            return agent_data.take_agents(keep)
+        start_dimensions = agent_data.get_dimensions()
+        total_steps = start_dimensions.total_steps
+        n_agents = agent_data.n_agents[:total_steps].astype(int)
+        keep = self._get_kept_agents(agent_data.types[:total_steps], n_agents)
+        agent_frames = np.repeat(np.arange(total_steps), n_agents)
+        agent_indices, _ = AgentData._get_indices_in_frames(agent_frames, total_steps)
+        # move the kept agents to the front of each frame, in order
+        kept_frames = agent_frames[keep]
+        old_index = (kept_frames, agent_indices[keep])
+        new_indices, new_n_agents = AgentData._get_indices_in_frames(
+            kept_frames, total_steps
+        )
+        new_index = (kept_frames, new_indices)
+        max_subpoints = 0
+        if start_dimensions.max_subpoints > 0:
+            # size the subpoints for the kept agents only, keeping at least
+            # one (empty) value like the agents
+            max_subpoints = max(
+                int(np.amax(agent_data.n_subpoints[old_index], initial=0)), 1
+            )
+        result = AgentData.from_dimensions(
+            DimensionData(
+                total_steps=total_steps,
+                # keep at least one (empty) agent so the data can be saved
+                # even if every agent was filtered out
+                max_agents=max(int(np.amax(new_n_agents, initial=0)), 1),
+                max_subpoints=max_subpoints,
+            )
+        )
+        result.times = agent_data.times
+        result.draw_fiber_points = agent_data.draw_fiber_points
+        result.display_data = agent_data.display_data
+        result.n_agents[:] = new_n_agents
+        for attribute in [
+            "viz_types",
+            "unique_ids",
+            "positions",
+            "radii",
+            "rotations",
+            "n_subpoints",
+        ]:
+            getattr(result, attribute)[new_index] = getattr(agent_data, attribute)[
+                old_index
+            ]
+        if max_subpoints > 0:
+            result.subpoints[new_index] = agent_data.subpoints[old_index][
+                :, :max_subpoints
+            ]
+        kept_types = [
+            type_name
+            for type_name, kept in zip(
+                EveryNthAgentFilter._flat_types(
+                    agent_data.types[:total_steps], n_agents
+                ),
+                keep,
+            )
+            if kept
+        ]
+        type_offsets = np.cumsum(new_n_agents) - new_n_agents
+        result.types = [
+            kept_types[type_offsets[time_index] : type_offsets[time_index] + n_kept]
+            for time_index, n_kept in enumerate(new_n_agents)
+        ]
+        return result
@@ -1,14 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import math
-from typing import Dict
+from typing import Dict, Tuple
 import logging
 
 import numpy as np
 
 from .filter import Filter
-from ..data_objects import TrajectoryData
+from ..data_objects import TrajectoryData, AgentData, RaggedAgentData
 
 ###############################################################################
 
@@ -20,6 +19,7 @@ log = logging.getLogger(__name__)
 class EveryNthSubpointFilter(Filter):
     n_per_type: Dict[str, int]
     default_n: int
+    per_frame = True
 
     def __init__(self, n_per_type: Dict[str, int], default_n: int = 1):
         """
@@ -39,42 +39,86 @@ class EveryNthSubpointFilter(Filter):
         self.n_per_type = n_per_type
         self.default_n = default_n
 
+    def _get_kept_subpoints(
+        self, agent_data: AgentData
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find every nth subpoint item of every agent at once.
+        Return the new number of subpoint values for each agent
+        (in order by frame then by index in the frame)
+        and the kept values for all agents concatenated
+        """
+        (
+            values,
+            value_starts,
+            n_subpoints,
+            values_per_item,
+            type_names,
+            type_codes,
+        ) = self._get_subpoints_layout(agent_data)
+        n_per_type = {str(type_name): inc for type_name, inc in self.n_per_type.items()}
+        type_incs = np.array(
+            [n_per_type.get(type_name, self.default_n) for type_name in type_names],
+            dtype=int,
+        )
+        incs = type_incs[type_codes] if len(type_codes) > 0 else np.ones(0, dtype=int)
+        n_items = n_subpoints // np.maximum(values_per_item, 1)
+        new_n_subpoints = values_per_item * ((n_items + incs - 1) // incs)
+        # index of each kept value in the original values:
+        # item (index // values per item) * n, value (index % values per item)
+        value_offsets = np.cumsum(new_n_subpoints) - new_n_subpoints
+        value_agents = np.repeat(np.arange(len(new_n_subpoints)), new_n_subpoints)
+        new_value_indices = np.arange(len(value_agents)) - value_offsets[value_agents]
+        agent_values_per_item = values_per_item[value_agents]
+        kept_values = values[
+            value_starts[value_agents]
+            + (new_value_indices // agent_values_per_item)
+            * incs[value_agents]
+            * agent_values_per_item
+            + new_value_indices % agent_values_per_item
+        ]
+        return new_n_subpoints, kept_values
+
     def apply(self, data: TrajectoryData) -> TrajectoryData:
         """
         Reduce the number of subpoints in each frame of the simularium
         data by filtering out all but every nth subpoint
         """
         print("Filtering: every Nth subpoint -------------")
+        data.agent_data = self.apply_to_agent_data(data.agent_data)
+        print(f"filtered dims = {data.agent_data.get_dimensions()}")
+        return data
+
+    def apply_to_agent_data(self, agent_data: AgentData) -> AgentData:
+        """
+        Keep every nth subpoint item of each agent
+        """
+        new_n_agent_subpoints, kept_values = self._get_kept_subpoints(agent_data)
+        if isinstance(agent_data, RaggedAgentData):
+            # the kept subpoints are concatenated into a new flat array
+            agent_data.set_subpoints(new_n_agent_subpoints, kept_values)
+            return agent_data
         # get dimensions
-        total_steps = data.agent_data.times.size
-        max_agents = int(np.amax(data.agent_data.n_agents))
-        max_subpoints = int(np.amax(data.agent_data.n_subpoints))
+        total_steps = agent_data.times.size
+        max_agents = int(np.amax(agent_data.n_agents))
+        max_subpoints = int(np.amax(agent_data.n_subpoints))
         # get filtered data
+        agent_frames, agent_indices = np.nonzero(
+            RaggedAgentData._agents_mask(agent_data)
+        )
         new_n_subpoints = np.zeros((total_steps, max_agents))
+        new_n_subpoints[agent_frames, agent_indices] = new_n_agent_subpoints
         new_subpoints = np.zeros((total_steps, max_agents, max_subpoints))
-        for time_index in range(total_steps):
-            for agent_index in range(int(data.agent_data.n_agents[time_index])):
-                sp_items = self.get_items_from_subpoints(
-                    data.agent_data, time_index, agent_index
-                )
-                if sp_items is None:
-                    continue
-                # get the increment to use for this type
-                type_name = data.agent_data.types[time_index][agent_index]
-                if type_name in self.n_per_type:
-                    inc = self.n_per_type[type_name]
-                else:
-                    inc = self.default_n
-                new_n_items = math.ceil(sp_items.shape[0] / float(inc))
-                new_n_sp = sp_items.shape[1] * new_n_items
-                new_n_subpoints[time_index][agent_index] = new_n_sp
-                new_subpoints[time_index][agent_index][:new_n_sp] = sp_items[
-                    ::inc
-                ].flatten()
-        data.agent_data.n_subpoints = new_n_subpoints
-        data.agent_data.subpoints = new_subpoints
-        print(
-            f"filtered dims = {total_steps} timesteps X "
-            f"{max_agents} agents X {int(np.amax(new_n_subpoints))} subpoints"
-        )
-        return data
+        # scatter the kept values into the padded array
+        new_subpoints[
+            np.repeat(agent_frames, new_n_agent_subpoints),
+            np.repeat(agent_indices, new_n_agent_subpoints),
+            np.arange(len(kept_values))
+            - np.repeat(
+                np.cumsum(new_n_agent_subpoints) - new_n_agent_subpoints,
+                new_n_agent_subpoints,
+            ),
+        ] = kept_values
+        agent_data.n_subpoints = new_n_subpoints
+        agent_data.subpoints = new_subpoints
+        return agent_data
@@ -1,10 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import copy
 import logging
-import math
-from simulariumio.data_objects.dimension_data import DimensionData
-from simulariumio.data_objects.agent_data import AgentData
+from simulariumio.data_objects.ragged_agent_data import RaggedAgentData
 
 import numpy as np
 
@@ -20,10 +19,12 @@ log = logging.getLogger(__name__)
 
 class EveryNthTimestepFilter(Filter):
     n: int
+    copy_data: bool
 
     def __init__(
         self,
         n: int,
+        copy_data: bool = True,
     ):
         """
         This filter reduces the number
@@ -33,8 +34,16 @@ class EveryNthTimestepFilter(Filter):
         ----------
         n : int
             keep every nth time step, filter out all the others
+        copy_data : bool (optional)
+            Copy the kept timesteps into new arrays?
+            If False, the filtered arrays are strided views
+            of the original arrays, so filtering doesn't copy any data,
+            but changing the values in either one changes both.
+            Data stored without padding (RaggedAgentData) is always copied
+            Default: True
         """
         self.n = n
+        self.copy_data = copy_data
 
     def apply(self, data: TrajectoryData) -> TrajectoryData:
         """
@@ -44,55 +53,58 @@ class EveryNthTimestepFilter(Filter):
         print(f"Filtering: every {self.n}th timestep -------------")
         if self.n < 2:
             raise Exception("N < 2: no timesteps will be filtered")
-        # get filtered dimensions
-        new_dimensions = DimensionData(
-            total_steps=int(math.ceil(data.agent_data.times.size / float(self.n))),
-            max_agents=int(np.amax(data.agent_data.n_agents)),
-            max_subpoints=int(np.amax(data.agent_data.n_subpoints)),
-        )
-        result = AgentData.from_dimensions(new_dimensions)
-        # get filtered data
-        new_time_index = 0
-        for time_index in range(data.agent_data.times.size):
-            if time_index % self.n != 0:
-                continue
-            result.times[new_time_index] = data.agent_data.times[time_index]
-            n_a = int(data.agent_data.n_agents[time_index])
-            result.n_agents[new_time_index] = n_a
-            for agent_index in range(n_a):
-                result.viz_types[new_time_index][
-                    agent_index
-                ] = data.agent_data.viz_types[time_index][agent_index]
-                result.unique_ids[new_time_index][
-                    agent_index
-                ] = data.agent_data.unique_ids[time_index][agent_index]
-                result.types[new_time_index].append(
-                    data.agent_data.types[time_index][agent_index]
-                )
-                result.positions[new_time_index][
-                    agent_index
-                ] = data.agent_data.positions[time_index][agent_index]
-                result.radii[new_time_index][agent_index] = data.agent_data.radii[
-                    time_index
-                ][agent_index]
-                result.rotations[new_time_index][
-                    agent_index
-                ] = data.agent_data.rotations[time_index][agent_index]
-                result.n_subpoints[new_time_index][
-                    agent_index
-                ] = data.agent_data.n_subpoints[time_index][agent_index]
-                result.subpoints[new_time_index][agent_index][
-                    : np.shape(data.agent_data.subpoints[time_index][agent_index])[0]
-                ] = data.agent_data.subpoints[time_index][agent_index]
-            new_time_index += 1
+        if isinstance(data.agent_data, RaggedAgentData):
+            return self._apply_ragged(data)
+        agent_data = data.agent_data
+        kept_steps = slice(0, agent_data.times.size, self.n)
+        result = copy.copy(agent_data)
+        for attribute in [
+            "times",
+            "n_agents",
+            "viz_types",
+            "unique_ids",
+            "positions",
+            "radii",
+            "rotations",
+            "n_subpoints",
+            "subpoints",
+        ]:
+            kept_values = getattr(agent_data, attribute)[kept_steps]
+            setattr(
+                result,
+                attribute,
+                np.copy(kept_values) if self.copy_data else kept_values,
+            )
+        result.types = [
+            list(frame_types[: int(n_agents)])
+            for frame_types, n_agents in zip(
+                agent_data.types[kept_steps], result.n_agents
+            )
+        ]
+        result.n_timesteps = -1
         unique_types = set([tn for frame in result.types for tn in frame])
-        for type_name in unique_types:
-            if type_name in data.agent_data.display_data:
-                result.display_data[type_name] = data.agent_data.display_data[type_name]
+        result.display_data = {
+            type_name: agent_data.display_data[type_name]
+            for type_name in unique_types
+            if type_name in agent_data.display_data
+        }
         data.agent_data = result
-        print(
-            f"filtered dims = {new_dimensions.total_steps} timesteps X "
-            f"{new_dimensions.max_agents} agents X "
-            f"{new_dimensions.max_subpoints} subpoints"
+        print(f"filtered dims = {result.get_dimensions()}")
+        return data
+
+    def _apply_ragged(self, data: TrajectoryData) -> TrajectoryData:
+        """
+        Filter timesteps stored without padding by selecting the frames to keep
+        """
+        result = data.agent_data.take_frames(
+            np.arange(0, data.agent_data.times.size, self.n)
         )
+        unique_types = set([tn for frame in result.types for tn in frame])
+        result.display_data = {
+            type_name: data.agent_data.display_data[type_name]
+            for type_name in unique_types
+            if type_name in data.agent_data.display_data
+        }
+        data.agent_data = result
+        print(f"filtered dims = {result.get_dimensions()}")
         return data
@@ -3,11 +3,13 @@
 
 import logging
 from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
 
 import numpy as np
 
-from ..data_objects import TrajectoryData, AgentData
+from ..data_objects import TrajectoryData, AgentData, RaggedAgentData
 from ..constants import SUBPOINT_VALUES_PER_ITEM
+from ..exceptions import DataError
 
 ###############################################################################
 
@@ -17,10 +19,32 @@ log = logging.getLogger(__name__)
 
 
 class Filter(ABC):
+    # can the filter be applied to each frame on its own
+    # (e.g. while the frames are written) with apply_to_meta_data
+    # and apply_to_agent_data? False if it needs the data for other frames
+    per_frame: bool = False
+
     @abstractmethod
     def apply(self, data: TrajectoryData) -> TrajectoryData:
         pass
 
+    def apply_to_meta_data(self, data: TrajectoryData) -> TrajectoryData:
+        """
+        Apply the parts of a per-frame filter that don't change
+        the agent data, like the box size, units, and plots
+        """
+        return data
+
+    def apply_to_agent_data(self, agent_data: AgentData) -> AgentData:
+        """
+        Apply a per-frame filter to the agent data,
+        which can hold all the frames or any one of them
+        """
+        raise DataError(
+            f"{type(self).__name__} can't be applied to each frame on its own, "
+            "filter the data before saving instead"
+        )
+
     @staticmethod
     def get_items_from_subpoints(
         agent_data: AgentData, time_index: int, agent_index: int
@@ -37,3 +61,113 @@ class Filter(ABC):
         items = agent_data.subpoints[time_index][agent_index][:n_sp]
         items = items.reshape(n_items, values_per_item)
         return items
+
+    @staticmethod
+    def _get_subpoints_layout(
+        agent_data: AgentData,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str], np.ndarray]:
+        """
+        Describe where the subpoints of every agent in every frame are,
+        for agents in order by frame then by index in the frame.
+        Return a flat view of all the subpoint values,
+        the index in it where each agent's values start,
+        the number of subpoint values for each agent,
+        the number of values per item for each agent (0 if no subpoints),
+        the names of the agent types, and the index of each agent's type name
+        """
+        if isinstance(agent_data, RaggedAgentData):
+            n_agents = np.asarray(agent_data.n_agents).astype(int)
+            values = agent_data.subpoints.leaf
+            value_starts = agent_data.subpoints.values.offsets[:-1]
+            n_subpoints = agent_data.n_subpoints.values
+            agent_frames = np.repeat(np.arange(len(n_agents)), n_agents)
+            agent_indices = np.arange(len(n_subpoints)) - np.repeat(
+                agent_data.agent_offsets[:-1], n_agents
+            )
+        else:
+            agent_frames, agent_indices = np.nonzero(
+                RaggedAgentData._agents_mask(agent_data)
+            )
+            n_agents = np.bincount(agent_frames, minlength=len(agent_data.types))
+            if agent_data.subpoints.ndim < 3:
+                values = np.zeros(0)
+                value_starts = np.zeros(len(agent_frames), dtype=int)
+                n_subpoints = np.zeros(len(agent_frames), dtype=int)
+            else:
+                if not agent_data.subpoints.flags.c_contiguous:
+                    agent_data.subpoints = np.ascontiguousarray(agent_data.subpoints)
+                values = agent_data.subpoints.reshape(-1)
+                max_agents, max_subpoints = agent_data.subpoints.shape[1:3]
+                value_starts = (
+                    agent_frames * max_agents + agent_indices
+                ) * max_subpoints
+                n_subpoints = agent_data.n_subpoints[agent_frames, agent_indices]
+        n_subpoints = np.asarray(n_subpoints).astype(int)
+        type_names, type_codes = np.unique(
+            np.array(
+                [
+                    str(type_name)
+                    for time_index, frame_types in enumerate(agent_data.types)
+                    if time_index < len(n_agents)
+                    for type_name in frame_types[: n_agents[time_index]]
+                ]
+            ),
+            return_inverse=True,
+        )
+        type_codes = type_codes.reshape(-1)
+        # look up the display type of each type once,
+        # for the first agent of that type with subpoints
+        has_subpoints = n_subpoints >= 1
+        type_values_per_item = np.zeros(len(type_names), dtype=int)
+        first_agents = np.full(len(type_names), len(type_codes))
+        np.minimum.at(
+            first_agents,
+            type_codes[has_subpoints],
+            np.flatnonzero(has_subpoints),
+        )
+        for type_code in np.flatnonzero(first_agents < len(type_codes)):
+            agent = first_agents[type_code]
+            type_values_per_item[type_code] = SUBPOINT_VALUES_PER_ITEM(
+                agent_data.display_type_for_agent(
+                    agent_frames[agent], agent_indices[agent]
+                )
+            )
+        values_per_item = np.where(has_subpoints, type_values_per_item[type_codes], 0)
+        return (
+            values,
+            value_starts,
+            n_subpoints,
+            values_per_item,
+            type_names.tolist(),
+            type_codes,
+        )
+
+    @staticmethod
+    def get_all_subpoint_items(
+        agent_data: AgentData,
+    ) -> Tuple[np.ndarray, Dict[int, np.ndarray]]:
+        """
+        Find the items in the subpoints of every agent at once.
+        Return a flat view of all the subpoint values,
+        and for each number of values per item, the index in that view
+        where each item of the agents with that many values per item starts
+        """
+        (
+            values,
+            value_starts,
+            n_subpoints,
+            values_per_item,
+            _,
+            _,
+        ) = Filter._get_subpoints_layout(agent_data)
+        result = {}
+        for n_values in np.unique(values_per_item[values_per_item > 0]):
+            agents = np.flatnonzero(values_per_item == n_values)
+            n_items = n_subpoints[agents] // n_values
+            item_offsets = np.cumsum(n_items) - n_items
+            item_agents = np.repeat(np.arange(len(agents)), n_items)
+            result[int(n_values)] = (
+                value_starts[agents][item_agents]
+                + (np.arange(len(item_agents)) - item_offsets[item_agents]) * n_values
+            )
+        return values, result
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+from typing import Dict, List, Tuple
+import logging
+
+import numpy as np
+
+from .filter import Filter
+from .every_nth_agent_filter import EveryNthAgentFilter
+from .every_nth_timestep_filter import EveryNthTimestepFilter
+from .multiply_space_filter import MultiplySpaceFilter
+from .multiply_time_filter import MultiplyTimeFilter
+from .transform_spatial_axes_filter import TransformSpatialAxesFilter
+from .translate_filter import TranslateFilter
+from ..data_objects import TrajectoryData, AgentData, RaggedAgentData, DimensionData
+from ..constants import VALUES_PER_3D_POINT
+
+###############################################################################
+
+log = logging.getLogger(__name__)
+
+###############################################################################
+
+SELECTION_FILTERS = (EveryNthTimestepFilter, EveryNthAgentFilter)
+AFFINE_FILTERS = (MultiplySpaceFilter, TranslateFilter, TransformSpatialAxesFilter)
+# filters that don't depend on the other fused filters,
+# so they can be applied to the result afterwards
+DEFERRED_FILTERS = (MultiplyTimeFilter,)
+
+###############################################################################
+
+
+class FilterPipeline(Filter):
+    filters: List[Filter]
+
+    def __init__(self, filters: List[Filter]):
+        """
+        This filter applies a chain of filters to simularium data
+        in a single pass, without changing the input data.
+        The selection filters (EveryNthTimestepFilter, EveryNthAgentFilter)
+        become indices of the frames and agents to keep,
+        and the affine filters (MultiplySpaceFilter, TranslateFilter,
+        TransformSpatialAxesFilter) are composed into one transform,
+        so the kept agents are copied to the result and transformed at once.
+        Any other filter, and the filters after it, are applied
+        to the result in order afterwards
+
+        Parameters
+        ----------
+        filters : List[Filter]
+            the filters to apply, in order
+        """
+        self.filters = filters
+        self.n_fused = 0
+        for _filter in filters:
+            if not isinstance(
+                _filter, SELECTION_FILTERS + AFFINE_FILTERS + DEFERRED_FILTERS
+            ):
+                break
+            if isinstance(_filter, EveryNthTimestepFilter) and _filter.n < 2:
+                raise Exception("N < 2: no timesteps will be filtered")
+            self.n_fused += 1
+
+    def _compose_affine(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, float, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Compose the affine filters into one transform,
+        each position becomes scale * signs * position[axes] + translation,
+        with the translation for its type or the default translation.
+        Return the axes, signs, scale, default translation,
+        and translation per type
+        """
+        axes = np.arange(VALUES_PER_3D_POINT)
+        signs = np.ones(VALUES_PER_3D_POINT)
+        scale = 1.0
+        default_translation = np.zeros(VALUES_PER_3D_POINT)
+        translation_per_type = {}
+        for _filter in self.filters[: self.n_fused]:
+            if isinstance(_filter, MultiplySpaceFilter):
+                scale *= _filter.multiplier
+                default_translation = _filter.multiplier * default_translation
+                for type_name in translation_per_type:
+                    translation_per_type[type_name] = (
+                        _filter.multiplier * translation_per_type[type_name]
+                    )
+            elif isinstance(_filter, TranslateFilter):
+                filter_translations = {
+                    str(type_name): np.asarray(translation, dtype=float)
+                    for type_name, translation in _filter.translation_per_type.items()
+                }
+                for type_name in translation_per_type:
+                    if type_name not in filter_translations:
+                        translation_per_type[type_name] = (
+                            translation_per_type[type_name]
+                            + _filter.default_translation
+                        )
+                for type_name, translation in filter_translations.items():
+                    translation_per_type[type_name] = (
+                        translation_per_type.get(type_name, default_translation)
+                        + translation
+                    )
+                default_translation = default_translation + _filter.default_translation
+            elif isinstance(_filter, TransformSpatialAxesFilter):
+                axes = axes[_filter._axes]
+                signs = signs[_filter._axes] * _filter._signs
+                default_translation = (
+                    default_translation[_filter._axes] * _filter._signs
+                )
+                for type_name in translation_per_type:
+                    translation_per_type[type_name] = (
+                        translation_per_type[type_name][_filter._axes] * _filter._signs
+                    )
+        return axes, signs, scale, default_translation, translation_per_type
+
+    def _get_kept_agents(
+        self, agent_data: AgentData
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """
+        Apply the selection filters to the frames and agents.
+        Return the indices of the kept frames, the number of agents kept
+        in each of them, the index of each kept agent
+        in all the agents in the kept frames, and each kept agent's type name
+        """
+        total_steps = (
+            len(agent_data.n_agents)
+            if isinstance(agent_data, RaggedAgentData)
+            else agent_data.times.size
+        )
+        frame_indices = np.arange(total_steps)
+        for _filter in self.filters[: self.n_fused]:
+            if isinstance(_filter, EveryNthTimestepFilter):
+                frame_indices = frame_indices[:: _filter.n]
+        n_agents = np.asarray(agent_data.n_agents)[frame_indices].astype(int)
+        types = [
+            type_name
+            for time_index, frame_n_agents in zip(frame_indices, n_agents)
+            for type_name in agent_data.types[time_index][:frame_n_agents]
+        ]
+        kept_agents = np.arange(len(types))
+        for _filter in self.filters[: self.n_fused]:
+            if not isinstance(_filter, EveryNthAgentFilter):
+                continue
+            type_offsets = np.cumsum(n_agents) - n_agents
+            keep = _filter._get_kept_agents(
+                [
+                    types[type_offsets[index] : type_offsets[index] + frame_n_agents]
+                    for index, frame_n_agents in enumerate(n_agents)
+                ],
+                n_agents,
+            )
+            kept_agents = kept_agents[keep]
+            types = [type_name for type_name, kept in zip(types, keep) if kept]
+            n_agents = np.bincount(
+                np.repeat(np.arange(len(n_agents)), n_agents)[keep],
+                minlength=len(n_agents),
+            )
+        return frame_indices, n_agents, kept_agents, types
+
+    @staticmethod
+    def _get_translations(
+        types: List[str],
+        default_translation: np.ndarray,
+        translation_per_type: Dict[str, np.ndarray],
+    ) -> np.ndarray:
+        """
+        Get the translation for each agent from a table of translations per type
+        """
+        if len(translation_per_type) < 1 or len(types) < 1:
+            return default_translation
+        type_names, type_codes = np.unique(
+            np.array([str(type_name) for type_name in types]), return_inverse=True
+        )
+        translation_table = np.array(
+            [
+                translation_per_type.get(type_name, default_translation)
+                for type_name in type_names
+            ],
+            dtype=float,
+        ).reshape(-1, VALUES_PER_3D_POINT)
+        return translation_table[type_codes.reshape(-1)]
+
+    def _fused_agent_data(self, agent_data: AgentData) -> AgentData:
+        """
+        Copy the kept agents into new AgentData and transform them
+        """
+        frame_indices, n_agents, kept_agents, types = self._get_kept_agents(agent_data)
+        (
+            axes,
+            signs,
+            scale,
+            default_translation,
+            translation_per_type,
+        ) = self._compose_affine()
+        # the frame of each kept agent in the result and in agent_data
+        agent_frames = np.repeat(np.arange(len(n_agents)), n_agents)
+        n_selected = np.asarray(agent_data.n_agents)[frame_indices].astype(int)
+        selected_offsets = np.cumsum(n_selected) - n_selected
+        old_frames = frame_indices[agent_frames]
+        old_indices = kept_agents - selected_offsets[agent_frames]
+        type_offsets = np.cumsum(n_agents) - n_agents
+        frame_types = [
+            types[type_offsets[time_index] : type_offsets[time_index] + frame_n_agents]
+            for time_index, frame_n_agents in enumerate(n_agents)
+        ]
+        if isinstance(agent_data, RaggedAgentData):
+            old_agents = agent_data.agent_offsets[old_frames] + old_indices
+            positions = agent_data.positions.values[old_agents]
+            subpoints = agent_data.subpoints.values.take(old_agents).leaf
+            subpoints *= scale
+            result = RaggedAgentData(
+                times=agent_data.times[frame_indices],
+                n_agents=n_agents,
+                viz_types=agent_data.viz_types.values[old_agents],
+                unique_ids=agent_data.unique_ids.values[old_agents],
+                types=frame_types,
+                positions=scale * signs * positions[:, axes]
+                + FilterPipeline._get_translations(
+                    types, default_translation, translation_per_type
+                ),
+                radii=scale * agent_data.radii.values[old_agents],
+                rotations=agent_data.rotations.values[old_agents],
+                n_subpoints=agent_data.n_subpoints.values[old_agents],
+                subpoints=subpoints,
+            )
+        else:
+            max_subpoints = (
+                agent_data.subpoints.shape[2] if agent_data.subpoints.ndim > 2 else 0
+            )
+            result = AgentData.from_dimensions(
+                DimensionData(
+                    total_steps=len(frame_indices),
+                    # keep at least one (empty) agent so the data can be saved
+                    # even if every agent was filtered out
+                    max_agents=max(int(np.amax(n_agents, initial=0)), 1),
+                    max_subpoints=max_subpoints,
+                )
+            )
+            result.times[:] = agent_data.times[frame_indices]
+            result.types = frame_types
+            result.n_agents[:] = n_agents
+            new_indices, _ = AgentData._get_indices_in_frames(
+                agent_frames, len(n_agents)
+            )
+            new_index = (agent_frames, new_indices)
+            old_index = (old_frames, old_indices)
+            for attribute in ["viz_types", "unique_ids", "rotations", "n_subpoints"]:
+                getattr(result, attribute)[new_index] = getattr(agent_data, attribute)[
+                    old_index
+                ]
+            result.radii[new_index] = scale * agent_data.radii[old_index]
+            result.positions[new_index] = scale * signs * agent_data.positions[
+                old_index
+            ][:, axes] + FilterPipeline._get_translations(
+                types, default_translation, translation_per_type
+            )
+            if max_subpoints > 0:
+                result.subpoints[new_index] = scale * agent_data.subpoints[old_index]
+        result.draw_fiber_points = agent_data.draw_fiber_points
+        result.display_data = copy.deepcopy(agent_data.display_data)
+        if any(
+            isinstance(_filter, EveryNthTimestepFilter)
+            for _filter in self.filters[: self.n_fused]
+        ):
+            unique_types = set(types)
+            result.display_data = {
+                type_name: display_data
+                for type_name, display_data in result.display_data.items()
+                if type_name in unique_types
+            }
+        # only the first 3 values of each subpoint item are a position
+        if np.any(axes != np.arange(VALUES_PER_3D_POINT)) or np.any(signs < 0):
+            values, item_starts = self.get_all_subpoint_items(result)
+            for values_per_item in item_starts:
+                if values_per_item < VALUES_PER_3D_POINT:
+                    continue
+                value_indices = (
+                    item_starts[values_per_item][:, np.newaxis]
+                    + np.arange(VALUES_PER_3D_POINT)[np.newaxis, :]
+                )
+                values[value_indices] = signs * values[value_indices][:, axes]
+        return result
+
+    def apply(self, data: TrajectoryData) -> TrajectoryData:
+        """
+        Apply the filters to a copy of the simularium data,
+        copying the data only once
+        """
+        print(
+            f"Filtering: {self.n_fused} of {len(self.filters)} filters "
+            "in one pass -------------"
+        )
+        result = copy.copy(data)
+        result.agent_data = None
+        result = copy.deepcopy(result)
+        result.agent_data = self._fused_agent_data(data.agent_data)
+        # box size and spatial units
+        for _filter in self.filters[: self.n_fused]:
+            if isinstance(_filter, MultiplySpaceFilter):
+                result.meta_data.box_size = (
+                    _filter.multiplier * result.meta_data.box_size
+                )
+                result.spatial_units.multiply(1.0 / _filter.multiplier)
+            elif isinstance(_filter, TransformSpatialAxesFilter):
+                result.meta_data.box_size = _filter._transform_coordinate(
+                    result.meta_data.box_size, False
+                )
+        for _filter in self.filters[: self.n_fused]:
+            if isinstance(_filter, DEFERRED_FILTERS):
+                result = _filter.apply(result)
+        for _filter in self.filters[self.n_fused :]:
+            result = _filter.apply(result)
+        print(f"filtered dims = {result.agent_data.get_dimensions()}")
+        return result
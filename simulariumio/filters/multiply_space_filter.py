@@ -3,7 +3,7 @@
 
 import logging
 
-from ..data_objects import TrajectoryData
+from ..data_objects import TrajectoryData, AgentData
 from .filter import Filter
 
 ###############################################################################
@@ -15,6 +15,7 @@ log = logging.getLogger(__name__)
 
 class MultiplySpaceFilter(Filter):
     multiplier: float
+    per_frame = True
 
     def __init__(
         self,
@@ -37,9 +38,23 @@ class MultiplySpaceFilter(Filter):
         print(
             f"Filtering: multiplying spatial scale by {self.multiplier} -------------"
         )
+        data = self.apply_to_meta_data(data)
+        data.agent_data = self.apply_to_agent_data(data.agent_data)
+        return data
+
+    def apply_to_meta_data(self, data: TrajectoryData) -> TrajectoryData:
+        """
+        Multiply the box size and divide the spatial units
+        """
         data.meta_data.box_size = self.multiplier * data.meta_data.box_size
-        data.agent_data.positions = self.multiplier * data.agent_data.positions
-        data.agent_data.radii = self.multiplier * data.agent_data.radii
-        data.agent_data.subpoints = self.multiplier * data.agent_data.subpoints
         data.spatial_units.multiply(1.0 / self.multiplier)
         return data
+
+    def apply_to_agent_data(self, agent_data: AgentData) -> AgentData:
+        """
+        Multiply the positions, radii, and subpoints
+        """
+        agent_data.positions = self.multiplier * agent_data.positions
+        agent_data.radii = self.multiplier * agent_data.radii
+        agent_data.subpoints = self.multiplier * agent_data.subpoints
+        return agent_data
@@ -5,7 +5,7 @@ import logging
 
 import numpy as np
 
-from ..data_objects import TrajectoryData
+from ..data_objects import TrajectoryData, AgentData
 from .filter import Filter
 
 ###############################################################################
@@ -18,6 +18,7 @@ log = logging.getLogger(__name__)
 class MultiplyTimeFilter(Filter):
     multiplier: float
     apply_to_plots: bool
+    per_frame = True
 
     def __init__(
         self,
@@ -44,7 +45,14 @@ class MultiplyTimeFilter(Filter):
         Multiply time values in the data
         """
         print(f"Filtering: multiplying time by {self.multiplier} -------------")
-        # plot data
+        data = self.apply_to_meta_data(data)
+        data.agent_data = self.apply_to_agent_data(data.agent_data)
+        return data
+
+    def apply_to_meta_data(self, data: TrajectoryData) -> TrajectoryData:
+        """
+        Multiply time values in the plot data
+        """
         if self.apply_to_plots:
             for plot in range(len(data.plots)):
                 x_title = data.plots[plot]["layout"]["xaxis"]["title"]
@@ -53,6 +61,11 @@ class MultiplyTimeFilter(Filter):
                 for tr in range(len(data.plots[plot]["data"])):
                     trace = data.plots[plot]["data"][tr]
                     trace["x"] = (self.multiplier * np.array(trace["x"])).tolist()
-        # spatial data
-        data.agent_data.times = self.multiplier * data.agent_data.times
         return data
+
+    def apply_to_agent_data(self, agent_data: AgentData) -> AgentData:
+        """
+        Multiply the time of each frame
+        """
+        agent_data.times = self.multiplier * agent_data.times
+        return agent_data
@@ -1,13 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from typing import List
+from typing import List, Tuple
 import logging
 
 import numpy as np
 
 from .filter import Filter
-from ..data_objects import TrajectoryData
+from ..data_objects import TrajectoryData, AgentData, RaggedArray
 from ..exceptions import DataError
 from ..constants import VALUES_PER_3D_POINT
 
@@ -20,6 +20,7 @@ log = logging.getLogger(__name__)
 
 class TransformSpatialAxesFilter(Filter):
     axes_mapping: List[str]
+    per_frame = True
 
     def __init__(
         self,
@@ -42,24 +43,37 @@ class TransformSpatialAxesFilter(Filter):
         for d in range(len(axes_mapping)):
             axes_mapping[d] = axes_mapping[d].lower()
         self.axes_mapping = axes_mapping
+        self._axes, self._signs = TransformSpatialAxesFilter._compile_axes_mapping(
+            axes_mapping
+        )
+
+    @staticmethod
+    def _compile_axes_mapping(axes_mapping: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the signed permutation described by axes_mapping:
+        the input axis for each output axis, and the sign to multiply it by
+        """
+        axes = np.arange(VALUES_PER_3D_POINT)
+        signs = np.ones(VALUES_PER_3D_POINT)
+        for d in range(len(axes_mapping)):
+            axis = axes_mapping[d]
+            for input_axis, name in enumerate(["x", "y", "z"]):
+                if name in axis:
+                    axes[d] = input_axis
+            if "-" in axis:
+                signs[d] = -1.0
+        return axes, signs
 
     def _transform_coordinate(
         self, position: np.ndarray, set_direction: bool = True
     ) -> np.ndarray:
         """
-        Transform an +X+Y+Z coordinate according to axes_mapping
+        Transform +X+Y+Z coordinates according to axes_mapping,
+        for one coordinate or an array of them in the last dimension
         """
-        result = np.zeros_like(position)
-        for d in range(len(self.axes_mapping)):
-            axis = self.axes_mapping[d]
-            if "x" in axis:
-                result[d] = position[0]
-            if "y" in axis:
-                result[d] = position[1]
-            if "z" in axis:
-                result[d] = position[2]
-            if set_direction and "-" in axis:
-                result[d] *= -1.0
+        result = np.asarray(position)[..., self._axes]
+        if set_direction:
+            result = result * self._signs
         return result
 
     def apply(self, data: TrajectoryData) -> TrajectoryData:
@@ -67,38 +81,38 @@ class TransformSpatialAxesFilter(Filter):
         Transform spatial coordinates to rotate and/or reflect the scene
         """
         print(f"Filtering: transform spatial axes {self.axes_mapping} -------------")
-        # box size
+        data = self.apply_to_meta_data(data)
+        data.agent_data = self.apply_to_agent_data(data.agent_data)
+        return data
+
+    def apply_to_meta_data(self, data: TrajectoryData) -> TrajectoryData:
+        """
+        Transform the box size, without reflecting it
+        """
         data.meta_data.box_size = self._transform_coordinate(
             data.meta_data.box_size, False
         )
-        # get dimensions
-        start_dimensions = data.agent_data.get_dimensions()
-        max_subpoints = int(np.amax(data.agent_data.n_subpoints))
-        # get filtered data
-        for time_index in range(start_dimensions.total_steps):
-            for agent_index in range(int(data.agent_data.n_agents[time_index])):
-                data.agent_data.positions[time_index][
-                    agent_index
-                ] = self._transform_coordinate(
-                    data.agent_data.positions[time_index][agent_index]
-                )
-                # subpoints
-                if max_subpoints < 1:
-                    continue
-                sp_items = self.get_items_from_subpoints(
-                    data.agent_data, time_index, agent_index
-                )
-                if sp_items is None:
-                    continue
-                n_sp = int(data.agent_data.n_subpoints[time_index][agent_index])
-                n_items = sp_items.shape[0]
-                for item_index in range(n_items):
-                    sp_items[item_index][
-                        :VALUES_PER_3D_POINT
-                    ] = self._transform_coordinate(
-                        sp_items[item_index][:VALUES_PER_3D_POINT]
-                    )
-                data.agent_data.subpoints[time_index][agent_index][
-                    :n_sp
-                ] = sp_items.reshape(n_sp)
         return data
+
+    def apply_to_agent_data(self, agent_data: AgentData) -> AgentData:
+        """
+        Transform the agent positions and subpoints
+        """
+        # positions
+        positions = agent_data.positions
+        if isinstance(positions, RaggedArray):
+            positions.leaf[:] = self._transform_coordinate(positions.leaf)
+        else:
+            positions[:] = self._transform_coordinate(positions)
+        # subpoints, only the first 3 values of each item are a position
+        # (the rest are e.g. sphere group radii)
+        values, item_starts = self.get_all_subpoint_items(agent_data)
+        for values_per_item in item_starts:
+            if values_per_item < VALUES_PER_3D_POINT:
+                continue
+            value_indices = (
+                item_starts[values_per_item][:, np.newaxis]
+                + np.arange(VALUES_PER_3D_POINT)[np.newaxis, :]
+            )
+            values[value_indices] = self._transform_coordinate(values[value_indices])
+        return agent_data
@@ -7,7 +7,7 @@ import logging
 import numpy as np
 
 from .filter import Filter
-from ..data_objects import TrajectoryData
+from ..data_objects import TrajectoryData, AgentData
 from ..constants import VALUES_PER_3D_POINT
 from ..utils import translate_agent_positions
 
@@ -21,6 +21,7 @@ log = logging.getLogger(__name__)
 class TranslateFilter(Filter):
     translation_per_type: Dict[str, np.ndarray]
     default_translation: np.ndarray
+    per_frame = True
 
     def __init__(
         self,
@@ -51,9 +52,13 @@ class TranslateFilter(Filter):
         Add the XYZ translation to all spatial coordinates
         """
         print("Filtering: translation -------------")
-        data.agent_data = translate_agent_positions(
-            data.agent_data,
-            self.default_translation,
-            self.translation_per_type
-        )
+        data.agent_data = self.apply_to_agent_data(data.agent_data)
         return data
+
+    def apply_to_agent_data(self, agent_data: AgentData) -> AgentData:
+        """
+        Add the XYZ translation to the agent positions
+        """
+        return translate_agent_positions(
+            agent_data, self.default_translation, self.translation_per_type
+        )
@@ -16,6 +16,7 @@ from ..data_objects import (
     AgentData,
     UnitData,
     DimensionData,
+    BoundsData,
 )
 from .mcell_data import McellData
 from ..constants import VALUES_PER_3D_POINT
@@ -318,6 +319,7 @@ class McellConverter(TrajectoryConverter):
         molecule_info = {}
         total_steps = 0
         step_count = 0
+        bounds = BoundsData()
 
         for molecule in molecule_list:
             molecule_info[molecule["mol_name"]] = molecule
@@ -338,11 +340,14 @@ class McellConverter(TrajectoryConverter):
                 input_data,
                 result,
             )
+            bounds.add_frame(result, time_index)
             step_count += 1
             self.check_report_progress(step_count / dimensions.total_steps)
         result.n_timesteps = total_steps + 1
         return TrajectoryConverter.scale_agent_data(
-            result, input_data.meta_data.scale_factor
+            result,
+            input_data.meta_data.scale_factor,
+            bounds.get_min_max_positions(),
         )
 
     def _read(self, input_data: McellData) -> TrajectoryData:
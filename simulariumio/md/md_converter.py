@@ -11,7 +11,13 @@ from MDAnalysis.topology.core import guess_atom_element
 from MDAnalysis.topology.tables import vdwradii
 
 from ..trajectory_converter import TrajectoryConverter
-from ..data_objects import TrajectoryData, AgentData, DimensionData, DisplayData
+from ..data_objects import (
+    TrajectoryData,
+    AgentData,
+    DimensionData,
+    DisplayData,
+    BoundsData,
+)
 from ..constants import DISPLAY_TYPE, JMOL_COLORS
 from .md_data import MdData
 
@@ -169,6 +175,7 @@ class MdConverter(TrajectoryConverter):
         result = AgentData.from_dimensions(dimensions)
         get_type_name_func = np.frompyfunc(MdConverter._get_type_name, 2, 1)
         unique_raw_type_names = set([])
+        bounds = BoundsData()
         time_index = 0
 
         for frame in input_data.md_universe.trajectory[
@@ -189,6 +196,7 @@ class MdConverter(TrajectoryConverter):
                     for type_name in input_data.md_universe.atoms.names
                 ]
             )
+            bounds.add_frame(result, time_index)
             time_index += 1
             self.check_report_progress(time_index / dimensions.total_steps)
 
@@ -197,7 +205,9 @@ class MdConverter(TrajectoryConverter):
             unique_raw_type_names, input_data
         )
         return TrajectoryConverter.scale_agent_data(
-            result, input_data.meta_data.scale_factor
+            result,
+            input_data.meta_data.scale_factor,
+            bounds.get_min_max_positions(),
         )
 
     def _read(self, input_data: MdData) -> TrajectoryData:
@@ -12,6 +12,7 @@ from ..data_objects import (
     UnitData,
     DimensionData,
     DisplayData,
+    BoundsData,
 )
 from ..constants import (
     VIZ_TYPE,
@@ -162,6 +163,7 @@ class MedyanConverter(TrajectoryConverter):
             raise InputDataError(f"Error reading input medyan data: {e}")
 
         result = AgentData.from_dimensions(dimensions)
+        bounds = BoundsData()
         time_index = -1
         at_frame_start = True
         parsing_object = False
@@ -188,6 +190,12 @@ class MedyanConverter(TrajectoryConverter):
             cols = line.split()
             if at_frame_start:
                 # start of timestep
+                if time_index >= 0:
+                    bounds.add_frame(
+                        result,
+                        time_index,
+                        values_per_item=SUBPOINT_VALUES_PER_ITEM(DISPLAY_TYPE.FIBER),
+                    )
                 time_index += 1
                 agent_index = 0
                 result.times[time_index] = float(cols[1])
@@ -275,15 +283,25 @@ class MedyanConverter(TrajectoryConverter):
             line_count += 1
             self.check_report_progress(line_count / len(lines))
 
+        if time_index >= 0:
+            bounds.add_frame(
+                result,
+                time_index,
+                values_per_item=SUBPOINT_VALUES_PER_ITEM(DISPLAY_TYPE.FIBER),
+            )
         result.n_timesteps = time_index + 1
 
         if input_data.center:
             result, scale_factor = TrajectoryConverter.center_and_scale_agent_data(
-                result, input_data.meta_data.scale_factor
+                result,
+                input_data.meta_data.scale_factor,
+                bounds.get_min_max_positions(),
             )
         else:
             result, scale_factor = TrajectoryConverter.scale_agent_data(
-                result, input_data.meta_data.scale_factor
+                result,
+                input_data.meta_data.scale_factor,
+                bounds.get_min_max_positions(),
             )
         return (TrajectoryConverter.center_fiber_positions(result), scale_factor)
 
@@ -10,7 +10,13 @@ import pandas as pd
 from .dep.pyMCDS import pyMCDS
 
 from ..trajectory_converter import TrajectoryConverter
-from ..data_objects import TrajectoryData, AgentData, UnitData, DisplayData
+from ..data_objects import (
+    TrajectoryData,
+    AgentData,
+    UnitData,
+    DisplayData,
+    BoundsData,
+)
 from ..exceptions import MissingDataError, DataError, InputDataError
 from ..constants import (
     DISPLAY_TYPE,
@@ -261,6 +267,7 @@ class PhysicellConverter(TrajectoryConverter):
         )
         owner_cell_color_indices = {}
         next_color_index = 0
+        bounds = BoundsData()
         for time_index in range(dimensions.total_steps):
             agent_index = n_def_agents[time_index]
             self.check_report_progress(
@@ -317,10 +324,13 @@ class PhysicellConverter(TrajectoryConverter):
                     )
                 agent_index += 1
             result.n_agents[time_index] = agent_index
+            bounds.add_frame(result, time_index, values_per_item=values_per_subcell)
 
         if input_data.meta_data.scale_factor is None:
             # If scale factor wasn't provided, calculate one
-            scale_factor = TrajectoryConverter.calculate_scale_factor(result)
+            scale_factor = TrajectoryConverter.calculate_scale_factor(
+                result, bounds.get_min_max_positions()
+            )
         else:
             scale_factor = input_data.meta_data.scale_factor
         for index in range(dimensions.total_steps):
@@ -8,7 +8,13 @@ import numpy as np
 import readdy
 
 from ..trajectory_converter import TrajectoryConverter
-from ..data_objects import TrajectoryData, AgentData, DimensionData, DisplayData
+from ..data_objects import (
+    TrajectoryData,
+    AgentData,
+    DimensionData,
+    DisplayData,
+    BoundsData,
+)
 from ..constants import DISPLAY_TYPE, VIZ_TYPE
 from .readdy_data import ReaddyData
 from ..exceptions import InputDataError
@@ -84,6 +90,7 @@ class ReaddyConverter(TrajectoryConverter):
         result.viz_types = VIZ_TYPE.DEFAULT * np.ones(
             shape=(data_dimensions.total_steps, data_dimensions.max_agents)
         )
+        bounds = BoundsData()
         for time_index in range(data_dimensions.total_steps):
             new_agent_index = 0
             for agent_index in range(int(n_agents[time_index])):
@@ -114,9 +121,12 @@ class ReaddyConverter(TrajectoryConverter):
                 )
                 new_agent_index += 1
             result.n_agents[time_index] = new_agent_index
+            bounds.add_frame(result, time_index)
             self.check_report_progress(time_index / data_dimensions.total_steps)
         return TrajectoryConverter.scale_agent_data(
-            result, input_data.meta_data.scale_factor
+            result,
+            input_data.meta_data.scale_factor,
+            bounds.get_min_max_positions(),
         )
 
     def _read(
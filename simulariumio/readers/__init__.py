@@ -3,3 +3,4 @@
 
 from .simularium_binary_reader import SimulariumBinaryReader  # noqa: F401
 from .binary_info import BinaryFileData, BinaryBlockInfo  # noqa: F401
+from .simularium_json_scanner import SimulariumJsonScanner  # noqa: F401
@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import logging
-from typing import List
+import mmap
+from typing import List, Union
 import numpy as np
 
 ###############################################################################
@@ -13,7 +14,7 @@ log = logging.getLogger(__name__)
 
 
 class BinaryFileData:
-    byte_view: bytes
+    byte_view: Union[bytes, mmap.mmap]
     int_view: np.ndarray
     float_view: np.ndarray
 
@@ -21,13 +21,20 @@ log = logging.getLogger(__name__)
 
 class SimulariumBinaryReader:
     @staticmethod
-    def _binary_data_from_source(input_file: InputFileData) -> BinaryFileData:
+    def _binary_data_from_source(
+        input_file: InputFileData, memory_map: bool = False
+    ) -> BinaryFileData:
         """
         Read a .simularium binary file or take binary input bytes and return
-        multiple views of the data
+        multiple views of the data.
+        If memory_map, map the file into memory instead of reading it,
+        so only the pages that are accessed are read from disk
         """
         result = BinaryFileData()
-        result.byte_view = input_file.get_contents()
+        if memory_map and not input_file.file_contents:
+            result.byte_view = input_file.get_memory_map()
+        else:
+            result.byte_view = input_file.get_contents()
         result.int_view = np.frombuffer(
             result.byte_view, dtype=np.dtype("I").newbyteorder("<")
         )
@@ -175,9 +182,51 @@ class SimulariumBinaryReader:
             current_frame_offset += frame_n_values
         return result
 
+    @staticmethod
+    def _binary_block_spatial_frames(
+        block_index: int,
+        block_info: BinaryBlockInfo,
+        data_as_ints: np.ndarray,
+        data_as_floats: np.ndarray,
+    ) -> Dict[str, Any]:
+        """
+        Parse the frame table of a spatial data binary block
+        from a .simularium binary file, without reading the agent data.
+        Instead of bundleData, return the time of each frame,
+        the float view of the file, and the indices in it
+        where each frame's agent data starts and ends
+        """
+        block_offset = (
+            int(block_info.block_offsets[block_index] / BINARY_SETTINGS.BYTES_PER_VALUE)
+            + BINARY_SETTINGS.BLOCK_HEADER_N_VALUES
+        )
+        spatial_data_version = data_as_ints[block_offset]
+        n_frames = int(data_as_ints[block_offset + 1])
+        first_frame_offset = block_offset + 2 + 2 * n_frames
+        frame_info = data_as_ints[block_offset + 2 : first_frame_offset]
+        frame_n_values = (frame_info[1::2] / BINARY_SETTINGS.BYTES_PER_VALUE).astype(
+            np.int64
+        )
+        frame_offsets = first_frame_offset + np.concatenate(
+            ([0], np.cumsum(frame_n_values)[:-1])
+        ).astype(np.int64)
+        return {
+            "version": spatial_data_version,
+            "msgType": 1,
+            "bundleStart": data_as_ints[first_frame_offset] if n_frames > 0 else 0,
+            "bundleSize": n_frames,
+            "times": data_as_floats[frame_offsets + 1],
+            "frameValues": data_as_floats,
+            "frameStarts": frame_offsets + BINARY_SETTINGS.FRAME_HEADER_N_VALUES,
+            "frameEnds": frame_offsets + frame_n_values,
+        }
+
     @staticmethod
     def load_binary(
-        input_file: InputFileData, parse_spatial_data_as_binary: bool = False
+        input_file: InputFileData,
+        parse_spatial_data_as_binary: bool = False,
+        memory_map: bool = False,
+        spatial_data_as_frames: bool = False,
     ) -> Dict[str, Any]:
         """
         Load data from the input file in .simularium binary format and update it.
@@ -189,9 +238,33 @@ class SimulariumBinaryReader:
         parse_spatial_data_as_binary: bool (optional)
             Leave spatial data binary encoded in returned dict?
             Default = False
+        memory_map: bool (optional)
+            Map the file at input_file.file_path into memory
+            instead of reading it all at once?
+            Default = False
+        spatial_data_as_frames: bool (optional)
+            Return binary spatial data as the times, float values,
+            and start and end index of each frame instead of bundleData,
+            to decode with AgentData.from_frame_buffers()?
+            Default = False
+        """
+        binary_data = SimulariumBinaryReader._binary_data_from_source(
+            input_file, memory_map
+        )
+        return SimulariumBinaryReader._load_binary_file_data(
+            binary_data, parse_spatial_data_as_binary, spatial_data_as_frames
+        )
+
+    @staticmethod
+    def _load_binary_file_data(
+        binary_data: BinaryFileData,
+        parse_spatial_data_as_binary: bool = False,
+        spatial_data_as_frames: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Load data from views of .simularium binary data
         """
         result = {}
-        binary_data = SimulariumBinaryReader._binary_data_from_source(input_file)
         block_info = SimulariumBinaryReader._parse_binary_header(binary_data.byte_view)
         # parse blocks
         found_blocks = []
@@ -223,6 +296,15 @@ class SimulariumBinaryReader:
                 result[block_type] = SimulariumBinaryReader._binary_block_json(
                     block_index, block_info, binary_data.byte_view
                 )
+            elif spatial_data_as_frames:
+                result[
+                    block_type
+                ] = SimulariumBinaryReader._binary_block_spatial_frames(
+                    block_index,
+                    block_info,
+                    binary_data.int_view,
+                    binary_data.float_view,
+                )
             elif block_type == "spatialData":
                 result[block_type] = SimulariumBinaryReader._binary_block_spatial_data(
                     block_index,
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import mmap
+import re
+from typing import Tuple, Union
+
+import numpy as np
+
+from ..exceptions import DataError
+
+###############################################################################
+
+log = logging.getLogger(__name__)
+
+###############################################################################
+
+# nesting depth of the bundleData array and each frame in it:
+# {"spatialData": {"bundleData": [{...}, ...]}}
+BUNDLE_DATA_DEPTH = 3
+FRAME_DEPTH = 4
+
+BUNDLE_DATA_KEY = re.compile(rb'"bundleData"\s*:\s*\[')
+# backslashes, quotes, brackets and braces
+STRUCTURE_CHARACTERS = np.zeros(256, dtype=bool)
+STRUCTURE_CHARACTERS[[ord(char) for char in '\\"{}[]']] = True
+
+TIME_KEY = re.compile(rb'"time"\s*:\s*(-?[0-9][0-9.eE+\-]*)')
+
+###############################################################################
+
+
+class SimulariumJsonScanner:
+    @staticmethod
+    def _scan_structure(
+        data: Union[bytes, mmap.mmap], max_depth: int, chunk_size: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the brackets and braces outside of strings in JSON data,
+        reading chunk_size bytes at a time and finding them with numpy.
+        Return the position of each one that is at most max_depth deep,
+        the character, and the nesting depth after it
+        """
+        positions = []
+        characters = []
+        depths = []
+        in_string = 0
+        depth = 0
+        # number of backslashes at the end of the previous chunk
+        n_backslashes = 0
+        for chunk_start in range(0, len(data), chunk_size):
+            chunk = np.frombuffer(
+                data[chunk_start : chunk_start + chunk_size], dtype=np.uint8
+            )
+            # only look at the characters that affect the structure,
+            # since most of a .simularium file is numbers
+            indices = np.flatnonzero(STRUCTURE_CHARACTERS[chunk])
+            chars = chunk[indices]
+            n_chars = len(indices)
+            is_backslash = chars == ord("\\")
+            follows_backslash = np.zeros(n_chars, dtype=bool)
+            follows_backslash[1:] = is_backslash[:-1] & (
+                indices[1:] == indices[:-1] + 1
+            )
+            # length of the run of backslashes ending at each backslash
+            run_starts = np.maximum.accumulate(
+                np.where(is_backslash & ~follows_backslash, np.arange(n_chars), 0)
+            )
+            backslash_runs = np.where(
+                is_backslash, np.arange(n_chars) - run_starts + 1, 0
+            )
+            if n_chars > 0 and indices[0] == 0 and is_backslash[0]:
+                # the chunk starts by continuing a run of backslashes
+                backslash_runs[is_backslash & (run_starts == 0)] += n_backslashes
+            backslashes_before = np.zeros(n_chars, dtype=np.int64)
+            backslashes_before[1:] = np.where(
+                follows_backslash[1:], backslash_runs[:-1], 0
+            )
+            if n_chars > 0 and indices[0] == 0:
+                backslashes_before[0] = n_backslashes
+            # quotes that are not escaped start or end a string
+            is_quote = (chars == ord('"')) & (backslashes_before % 2 == 0)
+            inside = (np.cumsum(is_quote) + in_string) % 2 == 1
+            is_open = ((chars == ord("{")) | (chars == ord("["))) & ~inside
+            is_close = ((chars == ord("}")) | (chars == ord("]"))) & ~inside
+            depth_after = depth + np.cumsum(
+                is_open.astype(np.int64) - is_close.astype(np.int64)
+            )
+            keep = (is_open & (depth_after <= max_depth)) | (
+                is_close & (depth_after < max_depth)
+            )
+            positions.append(chunk_start + indices[keep])
+            characters.append(chars[keep])
+            depths.append(depth_after[keep])
+            if n_chars > 0:
+                in_string = int(inside[-1])
+                depth = int(depth_after[-1])
+            n_backslashes = (
+                int(backslash_runs[-1])
+                if n_chars > 0 and indices[-1] == len(chunk) - 1
+                else 0
+            )
+        if len(positions) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=np.uint8), np.zeros(0)
+        return (
+            np.concatenate(positions),
+            np.concatenate(characters),
+            np.concatenate(depths),
+        )
+
+    @staticmethod
+    def _bundle_data_offsets(
+        data: Union[bytes, mmap.mmap], chunk_size: int = 2**22
+    ) -> Tuple[int, int, np.ndarray, np.ndarray]:
+        """
+        Scan JSON .simularium data for the bundleData array without parsing it.
+        Return the byte index of the "[" that starts the array,
+        the "]" that ends it, and the "{" and "}" around each frame
+        """
+        positions, characters, depths = SimulariumJsonScanner._scan_structure(
+            data, FRAME_DEPTH, chunk_size
+        )
+        array_opens = positions[
+            (characters == ord("[")) & (depths == BUNDLE_DATA_DEPTH)
+        ]
+        array_start = None
+        for match in BUNDLE_DATA_KEY.finditer(data):
+            if match.end() - 1 in array_opens:
+                array_start = match.end() - 1
+                break
+        if array_start is None:
+            raise DataError("Could not find spatialData.bundleData in JSON data")
+        array_closes = positions[
+            (characters == ord("]")) & (depths == BUNDLE_DATA_DEPTH - 1)
+        ]
+        array_end = int(array_closes[np.searchsorted(array_closes, array_start)])
+        in_array = (positions > array_start) & (positions < array_end)
+        frame_starts = positions[
+            in_array & (characters == ord("{")) & (depths == FRAME_DEPTH)
+        ]
+        frame_ends = positions[
+            in_array & (characters == ord("}")) & (depths == FRAME_DEPTH - 1)
+        ]
+        return array_start, array_end, frame_starts, frame_ends
+
+    @staticmethod
+    def _frame_time(data: Union[bytes, mmap.mmap], start: int, end: int) -> float:
+        """
+        Read the time of the frame between start and end
+        without parsing the frame, or return None if it isn't found
+        """
+        match = TIME_KEY.search(data, start, end)
+        if match is None:
+            return None
+        return float(match.group(1))
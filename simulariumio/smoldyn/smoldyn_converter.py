@@ -6,7 +6,7 @@ from typing import List, Callable, Tuple
 import numpy as np
 
 from ..trajectory_converter import TrajectoryConverter
-from ..data_objects import TrajectoryData, AgentData, DimensionData
+from ..data_objects import TrajectoryData, AgentData, DimensionData, BoundsData
 from ..exceptions import InputDataError
 from .smoldyn_data import SmoldynData
 
@@ -79,6 +79,7 @@ class SmoldynConverter(TrajectoryConverter):
         """
         dimensions = SmoldynConverter._parse_dimensions(smoldyn_data_lines)
         result = AgentData.from_dimensions(dimensions)
+        bounds = BoundsData()
         time_index = -1
         agent_index = 0
         line_count = 0
@@ -90,6 +91,7 @@ class SmoldynConverter(TrajectoryConverter):
             if len(cols) == 2:
                 if time_index >= 0:
                     result.n_agents[time_index] = agent_index
+                    bounds.add_frame(result, time_index)
                 agent_index = 0
                 time_index += 1
                 result.times[time_index] = float(cols[0])
@@ -133,15 +135,21 @@ class SmoldynConverter(TrajectoryConverter):
             self.check_report_progress(line_count / len(smoldyn_data_lines))
 
         result.n_agents[time_index] = agent_index
+        if time_index >= 0:
+            bounds.add_frame(result, time_index)
         result.n_timesteps = time_index + 1
 
         if input_data.center:
             return TrajectoryConverter.center_and_scale_agent_data(
-                result, input_data.meta_data.scale_factor
+                result,
+                input_data.meta_data.scale_factor,
+                bounds.get_min_max_positions(),
             )
 
         return TrajectoryConverter.scale_agent_data(
-            result, input_data.meta_data.scale_factor
+            result,
+            input_data.meta_data.scale_factor,
+            bounds.get_min_max_positions(),
         )
 
     def _read(self, input_data: SmoldynData) -> TrajectoryData:
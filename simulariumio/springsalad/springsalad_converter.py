@@ -12,6 +12,7 @@ from ..data_objects import (
     UnitData,
     DimensionData,
     DisplayData,
+    BoundsData,
 )
 from .springsalad_data import SpringsaladData
 from ..constants import (
@@ -98,6 +99,7 @@ class SpringsaladConverter(TrajectoryConverter):
             springsalad_data, input_data.draw_bonds
         )
         result = AgentData.from_dimensions(dimensions)
+        bounds = BoundsData()
         box_size = np.zeros(VALUES_PER_3D_POINT)
         time_index = -1
         agent_index = 0
@@ -116,6 +118,12 @@ class SpringsaladConverter(TrajectoryConverter):
             if "z_inside" in line:
                 box_size[2] += 2 * float(cols[1])
             if "CurrentTime" in line:  # beginning of a scene (timepoint)
+                if time_index >= 0:
+                    bounds.add_frame(
+                        result,
+                        time_index,
+                        values_per_item=SUBPOINT_VALUES_PER_ITEM(DISPLAY_TYPE.FIBER),
+                    )
                 agent_index = 0
                 time_index += 1
                 result.times[time_index] = float(
@@ -173,10 +181,18 @@ class SpringsaladConverter(TrajectoryConverter):
                 agent_index += 1
             line_count += 1
             self.check_report_progress(line_count / len(springsalad_data))
+        if time_index >= 0:
+            bounds.add_frame(
+                result,
+                time_index,
+                values_per_item=SUBPOINT_VALUES_PER_ITEM(DISPLAY_TYPE.FIBER),
+            )
         result.n_timesteps = time_index + 1
 
         result, scale_factor = TrajectoryConverter.scale_agent_data(
-            result, input_data.meta_data.scale_factor
+            result,
+            input_data.meta_data.scale_factor,
+            bounds.get_min_max_positions(),
         )
         result = TrajectoryConverter.center_fiber_positions(result)
         return result, box_size, scale_factor
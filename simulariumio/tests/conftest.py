@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import copy
 from string import ascii_uppercase
 from random import choice
 from typing import Dict, Any
@@ -10,6 +11,7 @@ import numpy as np
 from simulariumio import (
     TrajectoryData,
     AgentData,
+    RaggedAgentData,
     UnitData,
     MetaData,
     ScatterPlotData,
@@ -1509,6 +1511,15 @@ binary_test_data = TrajectoryData(
 )
 
 
+def ragged_copy(trajectory: TrajectoryData) -> TrajectoryData:
+    """
+    Copy a trajectory with its agent data stored without padding
+    """
+    result = copy.deepcopy(trajectory)
+    result.agent_data = RaggedAgentData.from_agent_data(result.agent_data)
+    return result
+
+
 def assert_buffers_equal(
     test_buffer: Dict[str, Any],
     expected_buffer: Dict[str, Any],
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import copy
+
 import pytest
 import numpy as np
 from unittest.mock import Mock
@@ -346,6 +348,36 @@ def test_parse_dimensions():
     assert dimension_data.max_subpoints == 18
 
 
+@pytest.mark.parametrize("test_scale_factor", [0.5, 10.0])
+def test_scale_factor_applied_once(test_scale_factor):
+    unscaled_data = copy.deepcopy(aster_pull3D_objects)
+    unscaled_data.meta_data = MetaData(scale_factor=1.0)
+    unscaled = CytosimConverter(unscaled_data)._data.agent_data
+    scaled_data = copy.deepcopy(aster_pull3D_objects)
+    scaled_data.meta_data = MetaData(scale_factor=test_scale_factor)
+    scaled = CytosimConverter(scaled_data)._data.agent_data
+    assert np.array_equal(scaled.n_agents, unscaled.n_agents)
+    type_names = set()
+    for time_index, n_agents in enumerate(unscaled.n_agents.astype(int)):
+        for agent_index, type_name in enumerate(unscaled.types[time_index][:n_agents]):
+            assert scaled.types[time_index][agent_index] == type_name
+            type_names.add(type_name.rstrip("0123456789"))
+        assert np.allclose(
+            scaled.positions[time_index][:n_agents],
+            test_scale_factor * unscaled.positions[time_index][:n_agents],
+        )
+        assert np.allclose(
+            scaled.radii[time_index][:n_agents],
+            test_scale_factor * unscaled.radii[time_index][:n_agents],
+        )
+        assert np.allclose(
+            scaled.subpoints[time_index][:n_agents],
+            test_scale_factor * unscaled.subpoints[time_index][:n_agents],
+        )
+    # fibers, solids, singles, and couples were all converted
+    assert type_names == {"fiber", "solid", "single", "couple"}
+
+
 def test_input_file_error():
     # throws an error when the file is the right type, but is malformed
     malformed_data = CytosimData(
@@ -1,9 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pytest
 
-from simulariumio import TrajectoryConverter, JsonWriter, DisplayData
+from simulariumio import (
+    TrajectoryConverter,
+    JsonWriter,
+    DisplayData,
+    RaggedAgentData,
+)
 from simulariumio.tests.conftest import (
     fiber_agents_type_mapping,
     minimal_custom_data,
@@ -20,6 +26,7 @@ from simulariumio.constants import (
     VIZ_TYPE,
     MAX_AGENT_ID,
     DISPLAY_TYPE,
+    SUBPOINT_VALUES_PER_ITEM,
 )
 
 from simulariumio.exceptions import DataError
@@ -1435,3 +1442,52 @@ def test_get_display_data_for_agent(key, expected_data):
     assert expected_data == TrajectoryConverter._get_display_data_for_agent(
         key, display_dict
     )
+
+
+def expected_min_max_positions(trajectory):
+    """
+    Find the extent of the agents one agent at a time
+    """
+    agent_data = trajectory.agent_data
+    min_dimensions = np.full(3, np.inf)
+    max_dimensions = np.full(3, -np.inf)
+    for time_index in range(len(agent_data.n_agents)):
+        for agent_index in range(int(agent_data.n_agents[time_index])):
+            position = agent_data.positions[time_index][agent_index]
+            radius = agent_data.radii[time_index][agent_index]
+            min_dimensions = np.minimum(min_dimensions, position - radius)
+            max_dimensions = np.maximum(max_dimensions, position + radius)
+            n_subpoints = int(agent_data.n_subpoints[time_index][agent_index])
+            if n_subpoints < 1:
+                continue
+            values_per_item = SUBPOINT_VALUES_PER_ITEM(
+                agent_data.display_type_for_agent(time_index, agent_index)
+            )
+            items = agent_data.subpoints[time_index][agent_index][:n_subpoints].reshape(
+                -1, values_per_item
+            )
+            for item in items:
+                item_radius = item[3] if values_per_item > 3 else 0
+                min_dimensions = np.minimum(min_dimensions, item[:3] - item_radius)
+                max_dimensions = np.maximum(max_dimensions, item[:3] + item_radius)
+    return min_dimensions, max_dimensions
+
+
+@pytest.mark.parametrize(
+    "trajectory",
+    [minimal_custom_data(), fiber_agents(), mixed_agents(), sphere_group_agents()],
+)
+@pytest.mark.parametrize("ragged", [False, True])
+def test_get_min_max_positions(trajectory, ragged):
+    expected_min, expected_max = expected_min_max_positions(trajectory)
+    agent_data = trajectory.agent_data
+    if ragged:
+        agent_data = RaggedAgentData.from_agent_data(agent_data)
+    test_min, test_max = TrajectoryConverter.get_min_max_positions(agent_data)
+    assert np.allclose(test_min, expected_min)
+    assert np.allclose(test_max, expected_max)
+    # the bounds can be reused to center and scale the data
+    assert np.isclose(
+        TrajectoryConverter.calculate_scale_factor(agent_data, (test_min, test_max)),
+        TrajectoryConverter.calculate_scale_factor(agent_data),
+    )
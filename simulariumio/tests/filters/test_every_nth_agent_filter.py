@@ -1,15 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pytest
 
-from simulariumio import FileConverter, InputFileData, JsonWriter, DisplayData
+from simulariumio import (
+    FileConverter,
+    InputFileData,
+    JsonWriter,
+    DisplayData,
+    TrajectoryConverter,
+)
 from simulariumio.filters import EveryNthAgentFilter
 from simulariumio.constants import (
     DEFAULT_CAMERA_SETTINGS,
     CURRENT_VERSION,
     DISPLAY_TYPE,
 )
+from simulariumio.tests.conftest import mixed_agents, ragged_copy
 
 
 @pytest.mark.parametrize(
@@ -684,3 +692,61 @@ def test_every_nth_agent_filter(input_path, display_data, _filter, expected_data
     buffer_data = JsonWriter.format_trajectory_data(filtered_data)
     assert expected_data == buffer_data
     assert JsonWriter._check_agent_ids_are_unique_per_frame(buffer_data)
+
+
+def test_every_nth_agent_filter_kept_agents():
+    _filter = EveryNthAgentFilter(n_per_type={"A": 2, "B": 0}, default_n=1)
+    types = [["A", "B", "A", "C", "A", "unused"], ["A", "A", "C"]]
+    keep = _filter._get_kept_agents(types, np.array([5, 3]))
+    assert keep.tolist() == [True, False, False, True, True, True, False, True]
+
+
+def test_every_nth_agent_filter_output_size():
+    converter = FileConverter(
+        input_file=InputFileData(
+            file_path="simulariumio/tests/data/binary/binary_test.binary"
+        )
+    )
+    filtered_data = converter.filter_data(
+        [EveryNthAgentFilter(n_per_type={}, default_n=2)]
+    )
+    agent_data = filtered_data.agent_data
+    assert agent_data.viz_types.shape[1] == int(np.amax(agent_data.n_agents))
+
+
+@pytest.mark.parametrize(
+    "filtered_types, expected_max_subpoints",
+    [
+        # the only agent with 12 subpoint values
+        (["C"], 9),
+        # every agent with subpoints
+        (["A", "C", "J", "K", "L", "U"], 1),
+    ],
+)
+def test_every_nth_agent_filter_subpoints_size(filtered_types, expected_max_subpoints):
+    filtered_data = TrajectoryConverter(mixed_agents()).filter_data(
+        [
+            EveryNthAgentFilter(
+                n_per_type={type_name: 0 for type_name in filtered_types},
+                default_n=1,
+            )
+        ]
+    )
+    agent_data = filtered_data.agent_data
+    assert agent_data.subpoints.shape[2] == expected_max_subpoints
+    assert np.amax(agent_data.n_subpoints) <= expected_max_subpoints
+
+
+@pytest.mark.parametrize("ragged", [False, True])
+def test_every_nth_agent_filter_all_agents_filtered(ragged):
+    trajectory = mixed_agents()
+    if ragged:
+        trajectory = ragged_copy(trajectory)
+    filtered_data = TrajectoryConverter(trajectory).filter_data(
+        [EveryNthAgentFilter(n_per_type={}, default_n=0)]
+    )
+    assert not np.any(filtered_data.agent_data.n_agents)
+    buffer_data = JsonWriter.format_trajectory_data(filtered_data)
+    assert all(
+        len(frame["data"]) == 0 for frame in buffer_data["spatialData"]["bundleData"]
+    )
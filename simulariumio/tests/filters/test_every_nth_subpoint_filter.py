@@ -1,15 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pytest
 
-from simulariumio import FileConverter, InputFileData, JsonWriter, DisplayData
+from simulariumio import (
+    FileConverter,
+    InputFileData,
+    JsonWriter,
+    DisplayData,
+    RaggedAgentData,
+)
 from simulariumio.filters import EveryNthSubpointFilter
 from simulariumio.constants import (
     DEFAULT_CAMERA_SETTINGS,
     CURRENT_VERSION,
     DISPLAY_TYPE,
 )
+from simulariumio.tests.conftest import sphere_group_agents
 
 
 @pytest.mark.parametrize(
@@ -816,3 +824,23 @@ def test_every_nth_subpoint_filter(input_path, display_data, _filter, expected_d
     buffer_data = JsonWriter.format_trajectory_data(filtered_data)
     assert expected_data == buffer_data
     assert JsonWriter._check_agent_ids_are_unique_per_frame(buffer_data)
+
+
+@pytest.mark.parametrize("ragged", [False, True])
+def test_every_nth_subpoint_filter_sphere_groups(ragged):
+    trajectory = sphere_group_agents()
+    items = trajectory.agent_data.subpoints.reshape((3, 2, 3, 4))
+    if ragged:
+        trajectory.agent_data = RaggedAgentData.from_agent_data(trajectory.agent_data)
+    filtered_data = EveryNthSubpointFilter(n_per_type={"B": 3}, default_n=2).apply(
+        trajectory
+    )
+    agent_data = filtered_data.agent_data
+    if ragged:
+        agent_data = agent_data.to_agent_data()
+    # whole items (position and radius) are kept
+    assert np.array_equal(agent_data.n_subpoints, np.array(3 * [[8, 4]]))
+    assert np.array_equal(
+        agent_data.subpoints[:, 0, :8], items[:, 0, ::2].reshape(3, 8)
+    )
+    assert np.array_equal(agent_data.subpoints[:, 1, :4], items[:, 1, 0])
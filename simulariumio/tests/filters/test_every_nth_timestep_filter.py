@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pytest
 
 from simulariumio import FileConverter, InputFileData, JsonWriter, DisplayData
@@ -648,3 +649,17 @@ def test_every_nth_timestep_filter(input_path, display_data, _filter, expected_d
     buffer_data = JsonWriter.format_trajectory_data(filtered_data)
     assert expected_data == buffer_data
     assert JsonWriter._check_agent_ids_are_unique_per_frame(buffer_data)
+
+
+def test_every_nth_timestep_filter_views():
+    input_file = InputFileData(
+        file_path="simulariumio/tests/data/binary/binary_test.binary"
+    )
+    expected = JsonWriter.format_trajectory_data(
+        FileConverter(input_file).filter_data([EveryNthTimestepFilter(n=2)])
+    )
+    trajectory_data = FileConverter(input_file)._data
+    positions = trajectory_data.agent_data.positions
+    filtered_data = EveryNthTimestepFilter(n=2, copy_data=False).apply(trajectory_data)
+    assert np.shares_memory(filtered_data.agent_data.positions, positions)
+    assert JsonWriter.format_trajectory_data(filtered_data) == expected
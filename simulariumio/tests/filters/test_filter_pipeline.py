@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+
+import numpy as np
+import pytest
+
+from simulariumio import (
+    FileConverter,
+    InputFileData,
+    JsonWriter,
+    DisplayData,
+    TrajectoryConverter,
+    RaggedAgentData,
+)
+from simulariumio.filters import (
+    FilterPipeline,
+    EveryNthAgentFilter,
+    EveryNthSubpointFilter,
+    EveryNthTimestepFilter,
+    MultiplySpaceFilter,
+    MultiplyTimeFilter,
+    TransformSpatialAxesFilter,
+    TranslateFilter,
+)
+from simulariumio.constants import DISPLAY_TYPE
+from simulariumio.tests.conftest import (
+    fiber_agents,
+    mixed_agents,
+    sphere_group_agents,
+)
+
+
+def cytosim_data():
+    return FileConverter(
+        input_file=InputFileData(
+            file_path=(
+                "simulariumio/tests/data/cytosim/"
+                "aster_pull3D_couples_actin_solid_3_frames"
+                "/aster_pull3D_couples_actin_solid_3_frames_small.json"
+            )
+        ),
+        display_data={
+            1: DisplayData(
+                name="microtubule",
+                display_type=DISPLAY_TYPE.FIBER,
+            ),
+            2: DisplayData(
+                name="actin",
+                display_type=DISPLAY_TYPE.FIBER,
+            ),
+        },
+    )._data
+
+
+def filter_chains():
+    return [
+        [
+            TranslateFilter(
+                translation_per_type={"A": np.array([4, 5, 6])},
+                default_translation=np.array([1, 2, 3]),
+            ),
+            MultiplySpaceFilter(multiplier=2.0),
+            TransformSpatialAxesFilter(axes_mapping=["-Y", "+Z", "+X"]),
+            TranslateFilter(
+                translation_per_type={"B": np.array([-1, 0, 1])},
+                default_translation=np.array([0, 0, 10]),
+            ),
+        ],
+        [
+            EveryNthTimestepFilter(n=2),
+            EveryNthAgentFilter(n_per_type={"A": 2, "actin": 3}, default_n=1),
+            MultiplyTimeFilter(multiplier=3.0, apply_to_plots=False),
+            TransformSpatialAxesFilter(axes_mapping=["+X", "-Z", "+Y"]),
+            EveryNthAgentFilter(n_per_type={"B": 2}, default_n=1),
+        ],
+        [
+            MultiplySpaceFilter(multiplier=0.5),
+            EveryNthSubpointFilter(n_per_type={}, default_n=2),
+            TranslateFilter(default_translation=np.array([1, 2, 3])),
+        ],
+        [
+            # every agent is filtered out
+            EveryNthAgentFilter(n_per_type={}, default_n=0),
+            MultiplySpaceFilter(multiplier=2.0),
+        ],
+    ]
+
+
+def assert_close(test, expected):
+    """
+    Compare JSON buffer data, allowing for floating point differences
+    from composing the transforms
+    """
+    if isinstance(expected, dict):
+        assert test.keys() == expected.keys()
+        for key in expected:
+            assert_close(test[key], expected[key])
+    elif isinstance(expected, list) and all(
+        isinstance(value, (int, float)) for value in expected
+    ):
+        assert np.allclose(test, expected)
+    elif isinstance(expected, list):
+        assert len(test) == len(expected)
+        for test_value, expected_value in zip(test, expected):
+            assert_close(test_value, expected_value)
+    elif isinstance(expected, float):
+        assert np.isclose(test, expected)
+    else:
+        assert test == expected
+
+
+@pytest.mark.parametrize(
+    "trajectory",
+    [fiber_agents(), mixed_agents(), sphere_group_agents(), cytosim_data()],
+)
+@pytest.mark.parametrize("filters", filter_chains())
+@pytest.mark.parametrize("ragged", [False, True])
+def test_filter_pipeline(trajectory, filters, ragged):
+    trajectory = copy.deepcopy(trajectory)
+    if ragged:
+        trajectory.agent_data = RaggedAgentData.from_agent_data(trajectory.agent_data)
+    original = JsonWriter.format_trajectory_data(copy.deepcopy(trajectory))
+    converter = TrajectoryConverter(trajectory)
+    expected = converter.filter_data(filters)
+    test = converter.filter_data(filters, fused=True)
+    assert isinstance(test.agent_data, type(trajectory.agent_data))
+    assert_close(
+        JsonWriter.format_trajectory_data(test),
+        JsonWriter.format_trajectory_data(expected),
+    )
+    # the input data is not changed
+    assert JsonWriter.format_trajectory_data(trajectory) == original
+
+
+def test_filter_pipeline_plan():
+    pipeline = FilterPipeline(
+        [
+            EveryNthTimestepFilter(n=2),
+            MultiplySpaceFilter(multiplier=2.0),
+            EveryNthSubpointFilter(n_per_type={}, default_n=2),
+            TranslateFilter(default_translation=np.array([1, 2, 3])),
+        ]
+    )
+    assert pipeline.n_fused == 2
+    with pytest.raises(Exception):
+        FilterPipeline([EveryNthTimestepFilter(n=1)])
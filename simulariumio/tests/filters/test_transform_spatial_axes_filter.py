@@ -1,15 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pytest
 
-from simulariumio import FileConverter, InputFileData, JsonWriter, DisplayData
+from simulariumio import (
+    FileConverter,
+    InputFileData,
+    JsonWriter,
+    DisplayData,
+    RaggedAgentData,
+)
 from simulariumio.filters import TransformSpatialAxesFilter
 from simulariumio.constants import (
     DEFAULT_CAMERA_SETTINGS,
     CURRENT_VERSION,
     DISPLAY_TYPE,
 )
+from simulariumio.tests.conftest import sphere_group_agents
 
 
 @pytest.mark.parametrize(
@@ -252,3 +260,24 @@ def test_transform_spatial_axes_filter(
     buffer_data = JsonWriter.format_trajectory_data(filtered_data)
     assert expected_data == buffer_data
     assert JsonWriter._check_agent_ids_are_unique_per_frame(buffer_data)
+
+
+@pytest.mark.parametrize("ragged", [False, True])
+def test_transform_spatial_axes_filter_sphere_groups(ragged):
+    trajectory = sphere_group_agents()
+    trajectory.agent_data.positions[:] = np.array([1.0, 2.0, 3.0])
+    items = trajectory.agent_data.subpoints.reshape((3, 2, 3, 4))
+    expected_items = np.copy(items)
+    expected_items[..., :3] = items[..., [1, 0, 2]] * np.array([-1.0, 1.0, 1.0])
+    if ragged:
+        trajectory.agent_data = RaggedAgentData.from_agent_data(trajectory.agent_data)
+    filtered_data = TransformSpatialAxesFilter(axes_mapping=["-Y", "+X", "+Z"]).apply(
+        trajectory
+    )
+    agent_data = filtered_data.agent_data
+    if ragged:
+        agent_data = agent_data.to_agent_data()
+    assert np.array_equal(filtered_data.meta_data.box_size, [100.0, 100.0, 100.0])
+    assert np.array_equal(agent_data.positions, np.full((3, 2, 3), [-2.0, 1.0, 3.0]))
+    # sphere group radii are not transformed
+    assert np.array_equal(agent_data.subpoints.reshape((3, 2, 3, 4)), expected_items)
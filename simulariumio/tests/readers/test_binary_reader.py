@@ -1,14 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pytest
 
 from simulariumio import (
     FileConverter,
     InputFileData,
     TrajectoryConverter,
+    TrajectoryData,
     JsonWriter,
 )
+from simulariumio.readers import SimulariumBinaryReader
 from simulariumio.tests.conftest import binary_test_data, assert_buffers_equal
 
 
@@ -56,3 +59,31 @@ def test_binary_parsing(
             expected_converter._data
         )
         assert_buffers_equal(test_buffer_data, expected_buffer_data)
+
+
+@pytest.mark.parametrize(
+    "input_path",
+    [
+        "simulariumio/tests/data/binary/binary_test.binary",
+        "simulariumio/tests/data/binary/50filaments_motor_linker_binary.binary",
+    ],
+)
+def test_binary_spatial_data_as_frames(input_path):
+    input_file = InputFileData(file_path=input_path)
+    frames_data = SimulariumBinaryReader.load_binary(
+        input_file, spatial_data_as_frames=True
+    )
+    assert "bundleData" not in frames_data["spatialData"]
+    test_data = TrajectoryData.from_buffer_data(frames_data)
+    expected_data = TrajectoryData.from_buffer_data(
+        SimulariumBinaryReader.load_binary(input_file)
+    )
+    assert test_data.agent_data == expected_data.agent_data
+    assert test_data.agent_data.types == expected_data.agent_data.types
+    assert np.array_equal(
+        test_data.agent_data.subpoints, expected_data.agent_data.subpoints
+    )
+    assert_buffers_equal(
+        JsonWriter.format_trajectory_data(test_data),
+        JsonWriter.format_trajectory_data(expected_data),
+    )
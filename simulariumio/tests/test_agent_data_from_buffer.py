@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+
+import numpy as np
+import pytest
+
+from simulariumio import JsonWriter, TrajectoryData
+from simulariumio.data_objects import AgentData
+from simulariumio.tests.conftest import (
+    binary_test_data,
+    fiber_agents,
+    mixed_agents,
+    sphere_group_agents,
+    three_default_agents,
+)
+
+
+@pytest.mark.parametrize(
+    "frame_values, frame_starts, frame_ends, expected_starts, expected_frames",
+    [
+        # two frames of agents without subpoints
+        (np.zeros(44), [0, 22], [22, 44], [0, 11, 22, 33], [0, 0, 1, 1]),
+        # agents with 3 and 0 subpoints, then an empty frame
+        (
+            np.array(10 * [0] + [3, 1, 2, 3] + 10 * [0] + [0]),
+            [0, 25],
+            [25, 25],
+            [0, 14],
+            [0, 0],
+        ),
+        # the second frame starts with an agent with 1 subpoint
+        (
+            np.array(11 * [0] + 10 * [0] + [1, 5] + 11 * [0]),
+            [0, 11],
+            [11, 34],
+            [0, 11, 23],
+            [0, 1, 1],
+        ),
+    ],
+)
+def test_get_agent_start_indices(
+    frame_values, frame_starts, frame_ends, expected_starts, expected_frames
+):
+    agent_starts, agent_frames = AgentData._get_agent_start_indices(
+        frame_values, np.array(frame_starts), np.array(frame_ends)
+    )
+    assert agent_starts.tolist() == expected_starts
+    assert agent_frames.tolist() == expected_frames
+
+
+@pytest.mark.parametrize(
+    "trajectory",
+    [
+        three_default_agents(),
+        fiber_agents(),
+        mixed_agents(),
+        sphere_group_agents(),
+        binary_test_data,
+    ],
+)
+def test_from_buffer_data_round_trip(trajectory):
+    trajectory = copy.deepcopy(trajectory)
+    trajectory.agent_data.draw_fiber_points = False
+    expected = JsonWriter.format_trajectory_data(trajectory)
+    test = JsonWriter.format_trajectory_data(
+        TrajectoryData.from_buffer_data(copy.deepcopy(expected))
+    )
+    assert test["spatialData"] == expected["spatialData"]
+
+
+@pytest.mark.parametrize(
+    "type_names, unique_ids",
+    [
+        (["A", "D"], None),
+        (None, [1, 3]),
+        (["A", "D"], [1, 2]),
+        (["not a type"], None),
+    ],
+)
+def test_from_buffer_data_selected_agents(type_names, unique_ids):
+    buffer_data = JsonWriter.format_trajectory_data(copy.deepcopy(binary_test_data))
+    expected = AgentData.from_buffer_data(buffer_data)
+    test = AgentData.from_buffer_data(
+        buffer_data, type_names=type_names, unique_ids=unique_ids
+    )
+    for time_index in range(len(expected.times)):
+        n_agents = int(expected.n_agents[time_index])
+        selected = [
+            agent_index
+            for agent_index in range(n_agents)
+            if (
+                type_names is None
+                or expected.types[time_index][agent_index] in type_names
+            )
+            and (
+                unique_ids is None
+                or expected.unique_ids[time_index][agent_index] in unique_ids
+            )
+        ]
+        assert test.n_agents[time_index] == len(selected)
+        n_selected = len(selected)
+        assert test.types[time_index][:n_selected] == [
+            expected.types[time_index][agent_index] for agent_index in selected
+        ]
+        for attribute in ["unique_ids", "positions", "radii", "n_subpoints"]:
+            assert np.array_equal(
+                getattr(test, attribute)[time_index][:n_selected],
+                getattr(expected, attribute)[time_index][selected],
+            )
+        for index, agent_index in enumerate(selected):
+            n_subpoints = int(expected.n_subpoints[time_index][agent_index])
+            assert np.array_equal(
+                test.subpoints[time_index][index][:n_subpoints],
+                expected.subpoints[time_index][agent_index][:n_subpoints],
+            )
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from simulariumio import BoundsData, TrajectoryConverter
+from simulariumio.tests.conftest import (
+    fiber_agents,
+    minimal_custom_data,
+    mixed_agents,
+    sphere_group_agents,
+)
+
+
+@pytest.mark.parametrize(
+    "trajectory",
+    [minimal_custom_data(), fiber_agents(), mixed_agents(), sphere_group_agents()],
+)
+def test_bounds_data_add_frame(trajectory):
+    agent_data = trajectory.agent_data
+    bounds = BoundsData()
+    assert bounds.get_min_max_positions() is None
+    for time_index in range(len(agent_data.n_agents)):
+        # add the agents in each frame in two parts,
+        # like a converter that fills each frame more than once
+        n_agents = int(agent_data.n_agents[time_index])
+        first_n_agents = n_agents // 2
+        agent_data.n_agents[time_index] = first_n_agents
+        bounds.add_frame(agent_data, time_index)
+        agent_data.n_agents[time_index] = n_agents
+        bounds.add_frame(agent_data, time_index, first_n_agents)
+    expected_min, expected_max = TrajectoryConverter.get_min_max_positions(agent_data)
+    test_min, test_max = bounds.get_min_max_positions()
+    assert np.allclose(test_min, expected_min)
+    assert np.allclose(test_max, expected_max)
+
+
+@pytest.mark.parametrize(
+    "subpoints, values_per_item, expected_min, expected_max",
+    [
+        (
+            # fiber points
+            np.array([1.0, -2.0, 3.0, -4.0, 5.0, 0.5]),
+            3,
+            np.array([-4.0, -2.0, -1.0]),
+            np.array([1.0, 5.0, 3.0]),
+        ),
+        (
+            # spheres with radii
+            np.array([1.0, -2.0, 3.0, 1.0, -4.0, 5.0, 0.5, 2.0]),
+            4,
+            np.array([-6.0, -3.0, -1.5]),
+            np.array([2.0, 7.0, 4.0]),
+        ),
+        (
+            # not positions
+            np.array([100.0, 200.0]),
+            1,
+            np.array([-1.0, -1.0, -1.0]),
+            np.array([1.0, 1.0, 1.0]),
+        ),
+    ],
+)
+def test_bounds_data_add_subpoints(
+    subpoints, values_per_item, expected_min, expected_max
+):
+    bounds = BoundsData()
+    bounds.add_positions(np.zeros((1, 3)), np.ones(1))
+    bounds.add_subpoints(subpoints, values_per_item)
+    test_min, test_max = bounds.get_min_max_positions()
+    assert np.allclose(test_min, expected_min)
+    assert np.allclose(test_max, expected_max)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+
+import numpy as np
+import pytest
+
+from simulariumio import (
+    JsonWriter,
+    BinaryWriter,
+    TrajectoryConverter,
+    RaggedAgentData,
+)
+from simulariumio.filters import (
+    EveryNthAgentFilter,
+    EveryNthSubpointFilter,
+    EveryNthTimestepFilter,
+    MultiplySpaceFilter,
+    TransformSpatialAxesFilter,
+    TranslateFilter,
+    AddAgentsFilter,
+)
+from simulariumio.tests.conftest import (
+    assert_buffers_equal,
+    binary_test_data,
+    fiber_agents,
+    mixed_agents,
+    ragged_copy,
+    sphere_group_agents,
+    three_default_agents,
+)
+
+
+test_trajectories = [
+    three_default_agents(),
+    fiber_agents(),
+    mixed_agents(),
+    sphere_group_agents(),
+    binary_test_data,
+]
+
+
+@pytest.mark.parametrize("trajectory", test_trajectories)
+def test_ragged_round_trip(trajectory):
+    ragged = RaggedAgentData.from_agent_data(trajectory.agent_data)
+    assert ragged.positions.size == 3 * int(np.sum(trajectory.agent_data.n_agents))
+    dense = ragged.to_agent_data()
+    assert RaggedAgentData.from_agent_data(dense) == ragged
+    assert ragged.get_dimensions() == dense.get_dimensions()
+
+
+@pytest.mark.parametrize("trajectory", test_trajectories)
+def test_ragged_json_writer(trajectory):
+    expected = JsonWriter.format_trajectory_data(copy.deepcopy(trajectory))
+    test = JsonWriter.format_trajectory_data(ragged_copy(trajectory))
+    assert_buffers_equal(test, expected)
+
+
+@pytest.mark.parametrize("trajectory", test_trajectories)
+def test_ragged_binary_writer(trajectory):
+    expected = BinaryWriter.format_trajectory_data(copy.deepcopy(trajectory))
+    test = BinaryWriter.format_trajectory_data(ragged_copy(trajectory))
+    for expected_values, test_values in zip(expected[2], test[2]):
+        assert [v.format_string for v in expected_values] == [
+            v.format_string for v in test_values
+        ]
+        assert np.allclose(
+            np.concatenate([np.array(v.values, dtype=float) for v in expected_values]),
+            np.concatenate([np.array(v.values, dtype=float) for v in test_values]),
+        )
+
+
+@pytest.mark.parametrize(
+    "trajectory, _filter",
+    [
+        (mixed_agents(), EveryNthAgentFilter(n_per_type={"A": 2}, default_n=1)),
+        (mixed_agents(), EveryNthTimestepFilter(n=2)),
+        (fiber_agents(), EveryNthSubpointFilter(n_per_type={}, default_n=2)),
+        (fiber_agents(), MultiplySpaceFilter(multiplier=2.0)),
+        (fiber_agents(), TransformSpatialAxesFilter(axes_mapping=["+X", "-Z", "+Y"])),
+        (mixed_agents(), TranslateFilter(default_translation=np.array([1, 2, 3]))),
+        (
+            mixed_agents(),
+            TranslateFilter(
+                translation_per_type={"A": np.array([4, 5, 6])},
+                default_translation=np.array([1, 2, 3]),
+            ),
+        ),
+        (
+            three_default_agents(),
+            AddAgentsFilter(new_agent_data=three_default_agents().agent_data),
+        ),
+    ],
+)
+def test_ragged_filters(trajectory, _filter):
+    expected = TrajectoryConverter(copy.deepcopy(trajectory)).filter_data([_filter])
+    test = TrajectoryConverter(ragged_copy(trajectory)).filter_data([_filter])
+    assert isinstance(test.agent_data, RaggedAgentData)
+    assert_buffers_equal(
+        JsonWriter.format_trajectory_data(test),
+        JsonWriter.format_trajectory_data(expected),
+    )
+
+
+def test_ragged_center_and_scale():
+    trajectory = fiber_agents()
+    expected, expected_scale = TrajectoryConverter.center_and_scale_agent_data(
+        copy.deepcopy(trajectory.agent_data)
+    )
+    test, test_scale = TrajectoryConverter.center_and_scale_agent_data(
+        RaggedAgentData.from_agent_data(trajectory.agent_data)
+    )
+    assert np.isclose(test_scale, expected_scale)
+    assert test == RaggedAgentData.from_agent_data(expected)
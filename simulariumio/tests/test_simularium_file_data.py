@@ -1,23 +1,53 @@
+import copy
+import json
+import os
+import tempfile
+import threading
+
 import numpy as np
 import pytest
 import random
 
-from simulariumio.data_objects import JsonData, BinaryData, SimulariumFileData
-from simulariumio import FileConverter, InputFileData, JsonWriter
+from simulariumio.data_objects import (
+    AgentIndex,
+    JsonData,
+    BinaryData,
+    ChunkedBinaryData,
+    SimulariumFileData,
+)
+from simulariumio import FileConverter, InputFileData, JsonWriter, BinaryWriter
+from simulariumio.readers import SimulariumJsonScanner
+from simulariumio.exceptions import DataError
 
 
 bin_path = "simulariumio/tests/data/binary/binary_test.binary"
 binary_file_data = open(bin_path, "rb").read()
 binary_data_object = BinaryData(binary_file_data)
+memory_mapped_binary_data_object = BinaryData(file_path=bin_path, memory_map=True)
+cached_binary_data_object = BinaryData(
+    binary_file_data, cache_max_bytes=10**6, read_ahead=2
+)
 
 # convert to JSON
 traj_data_obj = FileConverter(input_file=InputFileData(file_path=bin_path))._data
-json_path = "simulariumio/tests/data/binary/json_test"
+# write the converted file outside the source tree
+json_path = os.path.join(tempfile.mkdtemp(), "json_test")
 JsonWriter.save(traj_data_obj, json_path, False)
 json_file_data = open(json_path + ".simularium", "r").read()
 json_data_object = JsonData(json_file_data)
+lazy_json_data_object = JsonData(json_file_data, lazy=True)
+memory_mapped_json_data_object = JsonData(
+    file_path=json_path + ".simularium", lazy=True
+)
 
-test_data_objects = [binary_data_object, json_data_object]
+test_data_objects = [
+    binary_data_object,
+    memory_mapped_binary_data_object,
+    cached_binary_data_object,
+    json_data_object,
+    lazy_json_data_object,
+    memory_mapped_json_data_object,
+]
 
 expected_traj_info = {
     "version": 3,
@@ -84,8 +114,317 @@ def test_frame_data(data_object: SimulariumFileData):
     assert np.isclose(frame.time, expected_time)
 
 
+def test_memory_mapped_frame_data():
+    for index in range(binary_data_object.get_num_frames()):
+        expected = binary_data_object.get_frame_at_index(index)
+        frame = memory_mapped_binary_data_object.get_frame_at_index(index)
+        assert frame.data == expected.data
+        assert frame.n_agents == expected.n_agents
+
+
 @pytest.mark.parametrize("data_object", test_data_objects)
 def test_get_index_for_time(data_object: SimulariumFileData):
     random_frame = random.randint(0, expected_traj_info["totalSteps"] - 1)
     expected_time = random_frame * expected_traj_info["timeStepSize"]
     assert data_object.get_index_for_time(expected_time) == random_frame
+
+
+@pytest.mark.parametrize("data_object", test_data_objects)
+def test_iter_frames(data_object: SimulariumFileData):
+    frames = list(data_object.iter_frames(start=1, step=2))
+    expected = list(range(1, data_object.get_num_frames(), 2))
+    assert [frame.frame_number for frame in frames] == expected
+
+
+@pytest.mark.parametrize("data_object", test_data_objects)
+def test_get_frames_batch(data_object: SimulariumFileData):
+    frame_numbers = [2, 0]
+    batch = data_object.get_frames_batch(frame_numbers)
+    agent_data = traj_data_obj.agent_data
+    assert np.array_equal(batch.frame_numbers, frame_numbers)
+    assert np.allclose(batch.times, agent_data.times[frame_numbers])
+    assert np.array_equal(batch.n_agents, agent_data.n_agents[frame_numbers])
+    max_agents = batch.positions.shape[1]
+    for time_index, frame_number in enumerate(frame_numbers):
+        n_agents = int(agent_data.n_agents[frame_number])
+        assert np.all(batch.unique_ids[time_index][n_agents:] == 0)
+        assert np.allclose(
+            batch.unique_ids[time_index][:n_agents],
+            agent_data.unique_ids[frame_number][:n_agents],
+        )
+        assert np.allclose(
+            batch.positions[time_index][:n_agents],
+            agent_data.positions[frame_number][:n_agents],
+        )
+        assert np.allclose(
+            batch.radii[time_index][:n_agents],
+            agent_data.radii[frame_number][:n_agents],
+        )
+    assert max_agents == int(np.amax(agent_data.n_agents[frame_numbers]))
+
+
+@pytest.mark.parametrize("data_object", test_data_objects)
+def test_get_frames_batch_out_of_range(data_object: SimulariumFileData):
+    with pytest.raises(IndexError):
+        data_object.get_frames_batch([data_object.get_num_frames()])
+
+
+@pytest.mark.parametrize("data_object", test_data_objects)
+def test_get_indices_for_times(data_object: SimulariumFileData):
+    time_step = expected_traj_info["timeStepSize"]
+    last_frame = expected_traj_info["totalSteps"] - 1
+    times = np.array([-1.0, 0.4, 0.5, 1.6, 100.0]) * time_step
+    expected = np.array([0, 0, 0, 2, last_frame])
+    assert np.array_equal(data_object.get_indices_for_times(times), expected)
+
+
+def test_get_index_for_time_unsorted():
+    data = JsonWriter.format_trajectory_data(traj_data_obj)
+    bundle_data = data["spatialData"]["bundleData"]
+    for frame, time in zip(bundle_data, [2.0, 0.0, 1.0, 0.0]):
+        frame["time"] = time
+    data_object = JsonData(json.dumps(data))
+    assert data_object.get_index_for_time(0.1) == 1
+    assert data_object.get_index_for_time(1.9) == 0
+    assert data_object.get_index_for_time(1.4) == 2
+    # equally close to frames 0 and 2
+    assert data_object.get_index_for_time(1.5) == 0
+
+
+class WrappedFileData(SimulariumFileData):
+    """
+    File data that doesn't set the frame times when it is created
+    and only implements the abstract methods
+    """
+
+    def __init__(self, data_object: SimulariumFileData):
+        self.data_object = data_object
+
+    def get_frame_at_index(self, frame_number):
+        return self.data_object.get_frame_at_index(frame_number)
+
+    def get_trajectory_info(self):
+        return self.data_object.get_trajectory_info()
+
+    def get_plot_data(self):
+        return self.data_object.get_plot_data()
+
+    def get_trajectory_data_object(self, type_names=None, unique_ids=None):
+        return self.data_object.get_trajectory_data_object(type_names, unique_ids)
+
+    def get_file_contents(self):
+        return self.data_object.get_file_contents()
+
+    def get_num_frames(self):
+        return self.data_object.get_num_frames()
+
+
+def test_get_index_for_time_without_frame_times():
+    data_object = WrappedFileData(binary_data_object)
+    assert data_object.get_index_for_time(0.9) == 1
+    assert np.array_equal(
+        data_object.get_indices_for_times([2.0, -1.0]), np.array([2, 0])
+    )
+
+
+@pytest.mark.parametrize("data_object", [binary_data_object, json_data_object])
+def test_get_frames_batch_default_frame_values(data_object: SimulariumFileData):
+    frame_numbers = [2, 0, 1]
+    batch = WrappedFileData(data_object).get_frames_batch(frame_numbers)
+    expected = data_object.get_frames_batch(frame_numbers)
+    assert np.allclose(batch.times, expected.times)
+    assert np.array_equal(batch.n_agents, expected.n_agents)
+    assert np.array_equal(batch.unique_ids, expected.unique_ids)
+    assert np.allclose(batch.positions, expected.positions)
+    assert np.allclose(batch.radii, expected.radii)
+    assert np.array_equal(batch.n_subpoints, expected.n_subpoints)
+
+
+def test_frame_cache():
+    frame_sizes = [
+        len(binary_data_object.get_frame_at_index(index).data)
+        for index in range(binary_data_object.get_num_frames())
+    ]
+    # room for the two largest frames only
+    with BinaryData(
+        binary_file_data, cache_max_bytes=sum(sorted(frame_sizes)[-2:])
+    ) as data_object:
+        for index in [0, 1, 0, 2, 1]:
+            frame = data_object.get_frame_at_index(index)
+            assert frame.data == binary_data_object.get_frame_at_index(index).data
+        stats = data_object.frame_cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["evictions"] == 2
+    assert stats["n_frames"] == 2
+    assert stats["n_bytes"] == frame_sizes[1] + frame_sizes[2]
+
+
+def test_frame_cache_read_ahead():
+    with BinaryData(
+        binary_file_data, cache_max_bytes=10**6, read_ahead=2, n_read_ahead_workers=2
+    ) as data_object:
+        data_object.get_frame_at_index(0)
+        # wait for the frames being read ahead
+        data_object.close()
+        assert data_object.frame_cache._executor is None
+        assert data_object.get_frame_at_index(1) is not None
+        assert data_object.get_frame_at_index(2) is not None
+        stats = data_object.frame_cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+
+
+def test_frame_cache_close_while_reading():
+    data_object = BinaryData(
+        binary_file_data, cache_max_bytes=10**6, read_ahead=2, n_read_ahead_workers=2
+    )
+    n_frames = data_object.get_num_frames()
+    errors = []
+
+    def read_frames():
+        try:
+            for index in range(100):
+                data_object.frame_cache.clear()
+                data_object.get_frame_at_index(index % n_frames)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=read_frames) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    data_object.close()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert data_object.frame_cache._executor is None
+
+
+def test_binary_data_close():
+    with BinaryData(
+        binary_file_data, cache_max_bytes=10**6, read_ahead=2
+    ) as data_object:
+        assert data_object.get_frame_at_index(0) is not None
+    assert data_object.frame_cache._executor is None
+    # closing a BinaryData without a cache does nothing
+    binary_data_object.close()
+
+
+def test_binary_data_close_memory_map():
+    with BinaryData(file_path=bin_path, memory_map=True) as data_object:
+        memory_map = data_object.file_data.byte_view
+        assert data_object.get_frame_at_index(1) is not None
+        assert data_object.get_frames_batch([0, 2]).n_agents is not None
+        assert not memory_map.closed
+    assert memory_map.closed
+    assert data_object.file_data.float_view is None
+    # closing again does nothing
+    data_object.close()
+
+
+def test_lazy_json_frame_data():
+    for index in range(json_data_object.get_num_frames()):
+        expected = json_data_object.get_frame_at_index(index)
+        frame = lazy_json_data_object.get_frame_at_index(index)
+        assert frame.data == expected.data
+        assert frame.n_agents == expected.n_agents
+        assert frame.time == expected.time
+    assert lazy_json_data_object.get_file_contents() == json_data_object.data
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 2**22])
+def test_scan_json_bundle_data(chunk_size):
+    data = JsonWriter.format_trajectory_data(traj_data_obj)
+    # strings that look like JSON structure shouldn't be counted
+    data["trajectoryInfo"]["title"] = '{"bundleData": [{"a\\": "\\"]}'
+    contents = json.dumps(data).encode("utf-8")
+    (
+        array_start,
+        array_end,
+        frame_starts,
+        frame_ends,
+    ) = SimulariumJsonScanner._bundle_data_offsets(contents, chunk_size)
+    assert json.loads(contents[array_start : array_end + 1]) == (
+        data["spatialData"]["bundleData"]
+    )
+    for index, frame in enumerate(data["spatialData"]["bundleData"]):
+        assert (
+            json.loads(contents[frame_starts[index] : frame_ends[index] + 1]) == frame
+        )
+
+
+def test_chunked_binary_data(tmp_path):
+    output_path = str(tmp_path / "chunked")
+    # small enough to split the frames into two files
+    BinaryWriter.save(traj_data_obj, output_path, False, max_bytes=2000)
+    with ChunkedBinaryData.from_output_path(output_path) as data_object:
+        assert len(data_object.chunks) > 1
+        assert data_object.get_num_frames() == binary_data_object.get_num_frames()
+        for index in range(binary_data_object.get_num_frames()):
+            expected = binary_data_object.get_frame_at_index(index)
+            frame = data_object.get_frame_at_index(index)
+            assert frame.frame_number == index
+            assert frame.n_agents == expected.n_agents
+            assert np.isclose(frame.time, expected.time)
+            assert frame.data[12:] == expected.data[12:]
+            assert data_object.get_index_for_time(expected.time) == index
+        assert data_object.get_frame_at_index(data_object.get_num_frames()) is None
+        assert data_object.get_trajectory_info() == expected_traj_info
+        assert data_object.get_trajectory_data_object() == traj_data_obj
+        memory_maps = [chunk.file_data.byte_view for chunk in data_object.chunks]
+    assert all(memory_map.closed for memory_map in memory_maps)
+
+
+def test_agent_time_series():
+    agent_data = traj_data_obj.agent_data
+    for unique_id in np.unique(agent_data.unique_ids).astype(int):
+        series = binary_data_object.get_agent_time_series(unique_id)
+        frames, agent_indices = np.nonzero(agent_data.unique_ids == unique_id)
+        index = (frames, agent_indices)
+        assert np.array_equal(series.frame_numbers, frames)
+        assert np.allclose(series.times, agent_data.times[frames])
+        assert np.allclose(series.positions, agent_data.positions[index])
+        assert np.allclose(series.radii, agent_data.radii[index])
+        assert np.array_equal(series.n_subpoints, agent_data.n_subpoints[index])
+        max_subpoints = series.subpoints.shape[1]
+        assert np.allclose(
+            series.subpoints, agent_data.subpoints[index][:, :max_subpoints]
+        )
+    with pytest.raises(DataError):
+        binary_data_object.get_agent_time_series(1000)
+
+
+def test_agent_index_sidecar(tmp_path):
+    file_path = str(tmp_path / "test.simularium")
+    with open(file_path, "wb") as binary_file:
+        binary_file.write(binary_file_data)
+    expected = BinaryData(file_path=file_path).get_agent_index(sidecar=True)
+    index_path = file_path + ".agent_index.npz"
+    assert AgentIndex.load(index_path, len(binary_file_data)) is not None
+    # a saved index for a different file size is rebuilt
+    assert AgentIndex.load(index_path, len(binary_file_data) + 4) is None
+    loaded = BinaryData(file_path=file_path).get_agent_index(sidecar=True)
+    for attribute in ["unique_ids", "offsets", "frames", "byte_offsets"]:
+        assert np.array_equal(getattr(loaded, attribute), getattr(expected, attribute))
+
+
+def test_agent_index_sidecar_rebuilt_for_changed_file(tmp_path):
+    output_path = str(tmp_path / "test")
+    file_path = output_path + ".simularium"
+    BinaryWriter.save(traj_data_obj, output_path, False)
+    BinaryData(file_path=file_path).get_agent_index(sidecar=True)
+    file_stat = os.stat(file_path)
+    # overwrite the file with the same size of data with different IDs,
+    # keeping its modification time
+    changed_data = copy.deepcopy(traj_data_obj)
+    changed_data.agent_data.unique_ids = changed_data.agent_data.unique_ids + 100
+    BinaryWriter.save(changed_data, output_path, False)
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+    assert os.path.getsize(file_path) == file_stat.st_size
+    index = BinaryData(file_path=file_path).get_agent_index(sidecar=True)
+    assert np.array_equal(
+        index.unique_ids, np.unique(traj_data_obj.agent_data.unique_ids) + 100
+    )
+    assert AgentIndex.load(file_path + ".agent_index.npz").source_key == (
+        index.source_key
+    )
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import struct
 from typing import List, Any
 
 from simulariumio import (
@@ -984,3 +985,36 @@ def test_binary_writer(
         assert_binary_values_equal(
             chunk_index, binary_spatial_data, expected_spatial_data
         )
+
+
+def test_binary_values_to_bytes():
+    converter = TrajectoryConverter(binary_test_data)
+    _, _, binary_spatial_data = BinaryWriter.format_trajectory_data(
+        converter._data, 2196
+    )
+    for chunk_index in range(len(binary_spatial_data)):
+        values = [
+            value
+            for binary_values in binary_spatial_data[chunk_index]
+            for value in binary_values.values
+        ]
+        format_string = "".join(
+            value.format_string for value in binary_spatial_data[chunk_index]
+        )
+        assert BinaryWriter._binary_values_to_bytes(
+            binary_spatial_data[chunk_index]
+        ) == struct.pack(format_string, *values)
+
+
+def test_binary_writer_save_streams_spatial_data(tmp_path):
+    converter = TrajectoryConverter(binary_test_data)
+    _, _, binary_spatial_data = BinaryWriter.format_trajectory_data(converter._data)
+    output_path = str(tmp_path / "test")
+    BinaryWriter.save(converter._data, output_path, False)
+    with open(f"{output_path}.simularium", "rb") as simularium_file:
+        saved = simularium_file.read()
+    expected = BinaryWriter._binary_values_to_bytes(binary_spatial_data[0])
+    block_header = struct.pack(
+        "<ii", BINARY_BLOCK_TYPE.SPATIAL_DATA_BINARY.value, len(expected) + 8
+    )
+    assert block_header + expected in saved
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+
+import numpy as np
+import pytest
+
+from simulariumio import TrajectoryConverter
+from simulariumio.exceptions import DataError
+from simulariumio.filters import (
+    EveryNthAgentFilter,
+    EveryNthSubpointFilter,
+    EveryNthTimestepFilter,
+    MultiplySpaceFilter,
+    MultiplyTimeFilter,
+    TransformSpatialAxesFilter,
+    TranslateFilter,
+)
+from simulariumio.writers.filtered_frames import FilteredFrames
+from simulariumio.tests.conftest import (
+    fiber_agents,
+    mixed_agents,
+    ragged_copy,
+    sphere_group_agents,
+)
+
+
+def per_frame_filters():
+    return [
+        EveryNthAgentFilter(n_per_type={"A": 2}, default_n=1),
+        EveryNthSubpointFilter(n_per_type={}, default_n=2),
+        MultiplySpaceFilter(multiplier=2.0),
+        MultiplyTimeFilter(multiplier=3.0, apply_to_plots=False),
+        TransformSpatialAxesFilter(axes_mapping=["+X", "-Z", "+Y"]),
+        TranslateFilter(default_translation=np.array([1, 2, 3])),
+    ]
+
+
+@pytest.mark.parametrize(
+    "trajectory",
+    [
+        fiber_agents(),
+        mixed_agents(),
+        sphere_group_agents(),
+        ragged_copy(fiber_agents()),
+        ragged_copy(mixed_agents()),
+    ],
+)
+@pytest.mark.parametrize("binary", [True, False])
+def test_filtered_save(trajectory, binary, tmp_path):
+    filters = per_frame_filters()
+    converter = TrajectoryConverter(copy.deepcopy(trajectory))
+    TrajectoryConverter(converter.filter_data(filters)).save(
+        str(tmp_path / "expected"), binary=binary
+    )
+    converter.save(str(tmp_path / "streamed"), binary=binary, filters=filters)
+    with open(tmp_path / "expected.simularium", "rb") as expected_file:
+        expected = expected_file.read()
+    with open(tmp_path / "streamed.simularium", "rb") as streamed_file:
+        assert streamed_file.read() == expected
+    # the converter's data is not changed
+    assert converter._data == trajectory
+
+
+def test_filtered_save_whole_data_filters(tmp_path):
+    # the timestep filter is applied to all the data, then the others per frame
+    filters = [
+        MultiplySpaceFilter(multiplier=2.0),
+        EveryNthTimestepFilter(n=2),
+        TranslateFilter(default_translation=np.array([1, 2, 3])),
+    ]
+    assert [_filter.per_frame for _filter in filters] == [True, False, True]
+    converter = TrajectoryConverter(mixed_agents())
+    TrajectoryConverter(converter.filter_data(filters)).save(str(tmp_path / "expected"))
+    converter.save(str(tmp_path / "streamed"), filters=filters)
+    with open(tmp_path / "expected.simularium", "rb") as expected_file:
+        expected = expected_file.read()
+    with open(tmp_path / "streamed.simularium", "rb") as streamed_file:
+        assert streamed_file.read() == expected
+
+
+def test_filtered_frames_whole_data_filter():
+    _filter = EveryNthTimestepFilter(n=2)
+    with pytest.raises(DataError):
+        FilteredFrames(mixed_agents(), [_filter])
+    with pytest.raises(DataError):
+        _filter.apply_to_agent_data(mixed_agents().agent_data)
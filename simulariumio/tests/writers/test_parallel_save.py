@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from simulariumio import TrajectoryConverter
+from simulariumio.tests.conftest import (
+    binary_test_data,
+    fiber_agents,
+    mixed_agents,
+    ragged_copy,
+    sphere_group_agents,
+    three_default_agents,
+)
+
+
+@pytest.mark.parametrize(
+    "trajectory",
+    [
+        three_default_agents(),
+        fiber_agents(),
+        mixed_agents(),
+        sphere_group_agents(),
+        binary_test_data,
+        ragged_copy(fiber_agents()),
+        ragged_copy(mixed_agents()),
+    ],
+)
+@pytest.mark.parametrize("binary", [True, False])
+def test_parallel_save(trajectory, binary, tmp_path):
+    converter = TrajectoryConverter(trajectory)
+    converter.save(str(tmp_path / "serial"), binary=binary)
+    converter.save(str(tmp_path / "parallel"), binary=binary, n_workers=2)
+    with open(tmp_path / "serial.simularium", "rb") as serial_file:
+        expected = serial_file.read()
+    with open(tmp_path / "parallel.simularium", "rb") as parallel_file:
+        assert parallel_file.read() == expected
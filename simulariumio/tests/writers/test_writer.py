@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from simulariumio import RaggedAgentData
+from simulariumio.writers.writer import Writer
+from simulariumio.tests.conftest import (
+    binary_test_data,
+    fiber_agents,
+    mixed_agents,
+    sphere_group_agents,
+)
+
+
+@pytest.mark.parametrize(
+    "raw_uids, uids, used_unique_IDs, expected_uids, expected_used_unique_IDs",
+    [
+        (
+            [100.0, 102.0, 100.0],
+            {},
+            [],
+            [100.0, 102.0, 100.0],
+            [100.0, 102.0],
+        ),
+        (
+            [100.0, 102.0, 100.0],
+            {},
+            [100.0, 202.0],
+            [200.0, 102.0, 200.0],
+            [100.0, 202.0, 200.0, 102.0],
+        ),
+        (
+            [200.0, 102.0, 300.0],
+            {102.0: 402.0},
+            [200.0, 300.0, 402.0],
+            [400.0, 402.0, 500.0],
+            [200.0, 300.0, 402.0, 400.0, 500.0],
+        ),
+    ],
+)
+def test_get_fiber_point_uids(
+    raw_uids, uids, used_unique_IDs, expected_uids, expected_used_unique_IDs
+):
+    result = Writer._get_fiber_point_uids(np.array(raw_uids), uids, used_unique_IDs)
+    assert result.tolist() == expected_uids
+    assert used_unique_IDs == expected_used_unique_IDs
+
+
+@pytest.mark.parametrize(
+    "agent_data, expected_sizes",
+    [
+        (binary_test_data.agent_data, [82, 79, 76]),
+        (fiber_agents().agent_data, [115, 112, 98]),
+        (mixed_agents().agent_data, [82, 79, 76]),
+        (sphere_group_agents().agent_data, [46, 46, 46]),
+        (
+            RaggedAgentData.from_agent_data(fiber_agents().agent_data),
+            [115, 112, 98],
+        ),
+    ],
+)
+def test_get_frame_buffer_sizes(agent_data, expected_sizes):
+    sizes = Writer._get_frame_buffer_sizes(agent_data)
+    assert sizes.tolist() == [
+        Writer._get_frame_buffer_size(time_index, agent_data)
+        for time_index in range(agent_data.total_timesteps())
+    ]
+    assert sizes.tolist() == expected_sizes
@@ -19,9 +19,11 @@ from .data_objects import (
     TrajectoryData,
     DisplayData,
     AgentData,
+    RaggedAgentData,
+    BoundsData,
 )
-from .filters import Filter
-from .exceptions import UnsupportedPlotTypeError
+from .filters import Filter, FilterPipeline
+from .exceptions import DataError, UnsupportedPlotTypeError
 from .writers import JsonWriter, BinaryWriter
 from .constants import DISPLAY_TYPE, VIEWER_DIMENSION_RANGE
 from .utils import translate_agent_positions
@@ -83,6 +85,7 @@ class TrajectoryConverter:
             self.progress_callback(percent_complete)
             self.last_report_time = current_time
 
+    @staticmethod
     def _get_valid_agents(data: np.array, n_agents: np.array) -> np.array:
         """
         Given position data (shape = [timesteps, agents, 3]), and
@@ -90,17 +93,9 @@ class TrajectoryConverter:
         return arrays of X, Y, and Z values from data, skipping values
         that do not correspond with agents, as specified by n_agents.
         """
-        x_data = np.array([])
-        y_data = np.array([])
-        z_data = np.array([])
-        x = data[:, :, 0]
-        y = data[:, :, 1]
-        z = data[:, :, 2]
-        for i in range(len(n_agents)):
-            x_data = np.append(x_data, x[i][0 : int(n_agents[i])])
-            y_data = np.append(y_data, y[i][0 : int(n_agents[i])])
-            z_data = np.append(z_data, z[i][0 : int(n_agents[i])])
-        return np.array([x_data, y_data, z_data])
+        n_agents = np.asarray(n_agents)
+        mask = np.arange(data.shape[1])[np.newaxis, :] < n_agents[:, np.newaxis]
+        return data[: len(n_agents)][mask].T
 
     @staticmethod
     def get_xyz_max(data: np.array, n_agents: np.array = None) -> np.array:
@@ -111,14 +106,10 @@ class TrajectoryConverter:
         maximum X, Y, and Z values from remaining data
         """
         if n_agents is not None:
-            [x_data, y_data, z_data] = TrajectoryConverter._get_valid_agents(
-                data, n_agents
-            )
+            xyz_data = TrajectoryConverter._get_valid_agents(data, n_agents)
         else:
-            x_data = data[:, :, 0].flatten()
-            y_data = data[:, :, 1].flatten()
-            z_data = data[:, :, 2].flatten()
-        return np.array([max(x_data), max(y_data), max(z_data)])
+            xyz_data = data.reshape(-1, 3).T
+        return np.amax(xyz_data, 1)
 
     @staticmethod
     def get_xyz_min(data: np.array, n_agents: np.array = None) -> np.array:
@@ -129,15 +120,10 @@ class TrajectoryConverter:
         minimum X, Y, and Z values from remaining data
         """
         if n_agents is not None:
-            [x_data, y_data, z_data] = TrajectoryConverter._get_valid_agents(
-                data, n_agents
-            )
+            xyz_data = TrajectoryConverter._get_valid_agents(data, n_agents)
         else:
-            x_data = data[:, :, 0].flatten()
-            y_data = data[:, :, 1].flatten()
-            z_data = data[:, :, 2].flatten()
-
-        return np.array([min(x_data), min(y_data), min(z_data)])
+            xyz_data = data.reshape(-1, 3).T
+        return np.amin(xyz_data, 1)
 
     @staticmethod
     def get_subpoints_xyz(subpoints: np.array, n_subpoints: np.array) -> np.array:
@@ -147,42 +133,100 @@ class TrajectoryConverter:
         extract all subpoint data, skipping the zeros which represent no data.
         Reshape resulting subpoint data into a 2D array of XYZ coordinate data
         """
-        xyz_subpoints = np.array([])
-        for timestep in range(len(n_subpoints)):
-            for agent in range(len(n_subpoints[timestep])):
-                xyz_subpoints = np.append(
-                    xyz_subpoints,
-                    subpoints[timestep][agent][0 : int(n_subpoints[timestep][agent])],
-                )
-        return xyz_subpoints.reshape(1, -1, 3)
+        n_subpoints = np.asarray(n_subpoints)
+        mask = (
+            np.arange(subpoints.shape[2])[np.newaxis, np.newaxis, :]
+            < n_subpoints[:, :, np.newaxis]
+        )
+        return subpoints[: len(n_subpoints)][mask].reshape(1, -1, 3)
 
     @staticmethod
-    def get_min_max_positions(
+    def _get_agent_values(
         agent_data: AgentData,
-    ) -> Tuple[np.array, np.array]:
-        max_dimensions = TrajectoryConverter.get_xyz_max(
-            agent_data.positions + agent_data.radii[:, :, np.newaxis],
-            agent_data.n_agents,
-        )
-        min_dimensions = TrajectoryConverter.get_xyz_min(
-            agent_data.positions - agent_data.radii[:, :, np.newaxis],
-            agent_data.n_agents,
-        )
-
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the values for every agent in every frame,
+        in order by frame then by index in the frame,
+        skipping the padding in AgentData arrays.
+        Return the number of agents in each frame, and the positions,
+        radii, and number of subpoint values of each agent,
+        and all the agents' subpoint values in one flat array
+        """
+        if isinstance(agent_data, RaggedAgentData):
+            return (
+                np.asarray(agent_data.n_agents).astype(int),
+                agent_data.positions.values,
+                agent_data.radii.values,
+                np.asarray(agent_data.n_subpoints.values).astype(int),
+                agent_data.subpoints.leaf,
+            )
+        total_steps = agent_data.total_timesteps()
+        mask = RaggedAgentData._agents_mask(agent_data)
+        positions = agent_data.positions[:total_steps][mask]
+        radii = agent_data.radii[:total_steps][mask]
         if (
-            agent_data.subpoints is not None
-            and agent_data.n_subpoints is not None
-            and agent_data.subpoints.size > 0
+            agent_data.subpoints is None
+            or agent_data.n_subpoints is None
+            or agent_data.subpoints.ndim < 3
         ):
-            xyz_subpoints = TrajectoryConverter.get_subpoints_xyz(
-                agent_data.subpoints, agent_data.n_subpoints
+            n_subpoints = np.zeros(len(radii), dtype=int)
+            subpoints = np.zeros(0)
+        else:
+            frame_n_subpoints = agent_data.n_subpoints[:total_steps]
+            n_subpoints = frame_n_subpoints[mask].astype(int)
+            subpoints_mask = mask[:, :, np.newaxis] & (
+                np.arange(agent_data.subpoints.shape[2])[np.newaxis, np.newaxis, :]
+                < frame_n_subpoints[:, :, np.newaxis]
             )
-            max_subpoints = TrajectoryConverter.get_xyz_max(xyz_subpoints)
-            min_subpoints = TrajectoryConverter.get_xyz_min(xyz_subpoints)
-            max_dimensions = np.amax([max_dimensions, max_subpoints], 0)
-            min_dimensions = np.amin([min_dimensions, min_subpoints], 0)
-        return (min_dimensions, max_dimensions)
+            subpoints = agent_data.subpoints[:total_steps][subpoints_mask]
+        return (
+            np.count_nonzero(mask, axis=1),
+            positions,
+            radii,
+            n_subpoints,
+            subpoints,
+        )
 
+    @staticmethod
+    def get_min_max_positions(
+        agent_data: AgentData,
+    ) -> Tuple[np.array, np.array]:
+        """
+        Get the min and max XYZ extent of all the agents in all the frames,
+        from their positions +/- their radii and their subpoints,
+        skipping the padding in AgentData arrays.
+        Fiber subpoints are XYZ points, sphere group subpoints
+        are XYZ +/- the radius of each sphere, and other subpoints
+        aren't positions so they're skipped.
+        The result can be passed to calculate_scale_factor
+        and center_and_scale_agent_data so it isn't computed again
+        """
+        (
+            n_agents,
+            positions,
+            radii,
+            n_subpoints,
+            subpoints,
+        ) = TrajectoryConverter._get_agent_values(agent_data)
+        values_per_item = BoundsData._get_subpoints_values_per_item(
+            [
+                type_name
+                for time_index, frame_n_agents in enumerate(n_agents)
+                for type_name in agent_data.types[time_index][:frame_n_agents]
+            ]
+            if np.any(n_subpoints > 0)
+            else [],
+            n_subpoints,
+            agent_data.display_data,
+        )
+        bounds = BoundsData()
+        bounds.add_agents(positions, radii, n_subpoints, subpoints, values_per_item)
+        result = bounds.get_min_max_positions()
+        if result is None:
+            raise DataError("There are no agents to find the extent of")
+        return result
+
+    @staticmethod
     def _get_scale_factor_with_min_max(
         min_dimensions: np.array,
         max_dimensions: np.array,
@@ -200,15 +244,18 @@ class TrajectoryConverter:
     @staticmethod
     def calculate_scale_factor(
         agent_data: AgentData,
+        min_max_positions: Tuple[np.ndarray, np.ndarray] = None,
     ) -> float:
         """
         Return a scale factor, using the given position, radii,
         and subpoints, data from AgentData, so that the final range of agent
         locations is within the dimensions defined by VIEWER_DIMENSION_RANGE.
+        Pass min_max_positions if the result of get_min_max_positions()
+        for the agent data is already known.
         """
-        min_dimensions, max_dimensions = TrajectoryConverter.get_min_max_positions(
-            agent_data
-        )
+        if min_max_positions is None:
+            min_max_positions = TrajectoryConverter.get_min_max_positions(agent_data)
+        min_dimensions, max_dimensions = min_max_positions
         return TrajectoryConverter._get_scale_factor_with_min_max(
             min_dimensions, max_dimensions
         )
@@ -217,16 +264,21 @@ class TrajectoryConverter:
     def scale_agent_data(
         agent_data: AgentData,
         input_scale_factor: float = None,
+        min_max_positions: Tuple[np.ndarray, np.ndarray] = None,
     ) -> Tuple[AgentData, float]:
         """
         Return a scaled AgentData object, either using a provided scale
         factor if input_scale_factor is given, or using a calculated scale
         factor using calculate_scale_factor() with the provided agent data.
         Also returns the scale factor that was used on the AgentData object.
+        Pass min_max_positions if the result of get_min_max_positions()
+        for the agent data is already known.
         """
         if input_scale_factor is None:
             # If scale factor wasn't provided, calculate one
-            scale_factor = TrajectoryConverter.calculate_scale_factor(agent_data)
+            scale_factor = TrajectoryConverter.calculate_scale_factor(
+                agent_data, min_max_positions
+            )
         else:
             scale_factor = input_scale_factor
         agent_data.radii *= scale_factor
@@ -234,20 +286,24 @@ class TrajectoryConverter:
         agent_data.subpoints *= scale_factor
         return agent_data, scale_factor
 
+    @staticmethod
     def center_and_scale_agent_data(
         agent_data: AgentData,
         input_scale_factor: float = None,
+        min_max_positions: Tuple[np.ndarray, np.ndarray] = None,
     ) -> Tuple[AgentData, float]:
         """
         Center the provided agent_data at the origin, based on the range of
         XYZ position data and subpoint data. In addition, scale position
         and radii data based on the input_scale_factor if provided, otherwise
         calculate the scale factor using calculate_scale_factor(). Returns the
-        centered and scaled AgentData, and the scale factor that was applied
+        centered and scaled AgentData, and the scale factor that was applied.
+        Pass min_max_positions if the result of get_min_max_positions()
+        for the agent data is already known.
         """
-        min_dimensions, max_dimensions = TrajectoryConverter.get_min_max_positions(
-            agent_data
-        )
+        if min_max_positions is None:
+            min_max_positions = TrajectoryConverter.get_min_max_positions(agent_data)
+        min_dimensions, max_dimensions = min_max_positions
         translation = -0.5 * (max_dimensions + min_dimensions)
 
         translated_data = translate_agent_positions(agent_data, translation)
@@ -406,10 +462,22 @@ class TrajectoryConverter:
             )
         )
 
-    def filter_data(self, filters: List[Filter]) -> TrajectoryData:
+    def filter_data(self, filters: List[Filter], fused: bool = False) -> TrajectoryData:
         """
         Return the simularium data with the given filter applied
-        """
+
+        Parameters
+        ----------
+        filters: List[Filter]
+            the filters to apply, in order
+        fused: bool (optional)
+            Apply the filters with a FilterPipeline, which copies
+            only the kept agents once and transforms them in one pass,
+            instead of copying all the data and then applying each filter?
+            Default: False
+        """
+        if fused:
+            return FilterPipeline(filters).apply(self._data)
         filtered_data = copy.deepcopy(self._data)
         for f in filters:
             filtered_data = f.apply(filtered_data)
@@ -435,7 +503,14 @@ class TrajectoryConverter:
         """
         JsonWriter.save_plot_data(self._data.plots, output_path)
 
-    def save(self, output_path: str, binary: bool = True, validate_ids: bool = True):
+    def save(
+        self,
+        output_path: str,
+        binary: bool = True,
+        validate_ids: bool = True,
+        n_workers: int = 1,
+        filters: List[Filter] = None,
+    ):
         """
         Save the current simularium data in .simularium JSON format
         at the output path
@@ -450,8 +525,40 @@ class TrajectoryConverter:
         validate_ids: bool
             additional validation to check agent ID size?
             Default = True
+        n_workers: int (optional)
+            encode frames in this many worker processes,
+            the agent data is shared with them through memory-mapped files
+            Default = 1 (encode in this process)
+        filters: List[Filter] (optional)
+            filters to apply to the saved data, the current data is not changed.
+            Per-frame filters after the last filter that needs
+            the whole trajectory (Filter.per_frame is False)
+            are applied to each frame as it is written,
+            the filters before them are applied to all the data first
+            Default: None
         """
+        data = self._data
+        if filters is None:
+            filters = []
+        n_whole_data = max(
+            [index + 1 for index, f in enumerate(filters) if not f.per_frame],
+            default=0,
+        )
+        if n_whole_data > 0:
+            data = self.filter_data(filters[:n_whole_data], fused=True)
         if binary:
-            BinaryWriter.save(self._data, output_path, validate_ids)
+            BinaryWriter.save(
+                data,
+                output_path,
+                validate_ids,
+                n_workers,
+                filters=filters[n_whole_data:],
+            )
         else:
-            JsonWriter.save(self._data, output_path, validate_ids)
+            JsonWriter.save(
+                data,
+                output_path,
+                validate_ids,
+                n_workers,
+                filters=filters[n_whole_data:],
+            )
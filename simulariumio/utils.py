@@ -1,7 +1,7 @@
 import numpy as np
 from typing import Dict, Any
 
-from .data_objects import DisplayData, AgentData
+from .data_objects import DisplayData, AgentData, RaggedAgentData
 
 
 def unpack_position_vector(
@@ -70,16 +70,42 @@ def translate_agent_positions(
         Default: {}
     """
     total_steps = data.times.size
-    for time_index in range(total_steps):
-        for agent_index in range(int(data.n_agents[time_index])):
-            if (
-                data.types[time_index][agent_index]
-                in translation_per_type
-            ):
-                translation = translation_per_type[
-                    data.types[time_index][agent_index]
+    n_agents = np.asarray(data.n_agents[:total_steps]).astype(int)
+    if isinstance(data, RaggedAgentData):
+        positions = data.positions.leaf[: int(np.sum(n_agents))]
+    else:
+        frame_indices, agent_indices = np.nonzero(
+            np.arange(data.positions.shape[1])[np.newaxis, :] < n_agents[:, np.newaxis]
+        )
+        positions = data.positions[frame_indices, agent_indices]
+    if len(translation_per_type) > 0:
+        # build a table with the translation for each type ID,
+        # and look up the type ID of each agent
+        type_names, type_ids = np.unique(
+            np.array(
+                [
+                    str(type_name)
+                    for time_index in range(total_steps)
+                    for type_name in data.types[time_index][: n_agents[time_index]]
                 ]
-            else:
-                translation = default_translation
-            data.positions[time_index][agent_index] += translation
+            ),
+            return_inverse=True,
+        )
+        type_translations = {
+            str(type_name): translation
+            for type_name, translation in translation_per_type.items()
+        }
+        translation_table = np.array(
+            [
+                type_translations.get(type_name, default_translation)
+                for type_name in type_names
+            ],
+            dtype=float,
+        ).reshape(-1, 3)
+        translation = translation_table[type_ids.reshape(-1)]
+    else:
+        translation = np.asarray(default_translation)
+    positions += translation
+    if not isinstance(data, RaggedAgentData):
+        data.positions[frame_indices, agent_indices] = positions
     return data
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import logging
-from typing import List, Tuple, Any, Dict, Union
+from typing import BinaryIO, List, Tuple, Any, Dict, Union
 import struct
 import json
 
@@ -13,9 +13,12 @@ from ..data_objects import (
     TrajectoryData,
 )
 from ..constants import BINARY_SETTINGS, BINARY_BLOCK_TYPE, CURRENT_VERSION
+from ..filters import Filter
 from .writer import Writer
 from .binary_chunk import BinaryChunk
 from .binary_values import BinaryValues
+from .parallel_frame_encoder import ParallelFrameEncoder
+from .filtered_frames import FilteredFrames
 
 ###############################################################################
 
@@ -23,6 +26,14 @@ log = logging.getLogger(__name__)
 
 ###############################################################################
 
+# numpy dtypes matching struct format characters for little-endian values
+BINARY_DTYPES = {
+    "f": np.dtype("<f4"),
+    "I": np.dtype("<u4"),
+}
+
+###############################################################################
+
 
 class BinaryWriter(Writer):
     @staticmethod
@@ -41,13 +52,7 @@ class BinaryWriter(Writer):
         """
         Get the number of values in the bundle data buffer for each frame
         """
-        total_steps = trajectory_data.agent_data.total_timesteps()
-        result = []
-        for frame_index in range(total_steps):
-            result.append(
-                Writer._get_frame_buffer_size(frame_index, trajectory_data.agent_data)
-            )
-        return result
+        return Writer._get_frame_buffer_sizes(trajectory_data.agent_data).tolist()
 
     @staticmethod
     def _header_n_bytes() -> int:
@@ -118,35 +123,48 @@ class BinaryWriter(Writer):
         max_spatial_bytes = (
             max_bytes - header_n_bytes - traj_info_n_bytes - plot_data_n_bytes
         )
-        file_chunks = [BinaryChunk()]
-        current_chunk = 0
-        current_frames_bytes = 0
-        for frame_index, buffer_size in enumerate(frame_buffers_n_values):
-            spatial_header_n_values = (
-                BINARY_SETTINGS.BLOCK_HEADER_N_VALUES
-                + BINARY_SETTINGS.SPATIAL_BLOCK_HEADER_CONSTANT_N_VALUES
-                + BINARY_SETTINGS.SPATIAL_BLOCK_HEADER_N_VALUES_PER_FRAME
-                * (file_chunks[current_chunk].n_frames + 1)
-            )
-            spatial_header_n_bytes = (
-                BINARY_SETTINGS.BYTES_PER_VALUE * spatial_header_n_values
+        frame_n_values = BINARY_SETTINGS.FRAME_HEADER_N_VALUES + np.array(
+            frame_buffers_n_values, dtype=np.int64
+        )
+        frame_n_bytes = BINARY_SETTINGS.BYTES_PER_VALUE * frame_n_values
+        too_large = np.flatnonzero(frame_n_bytes > max_spatial_bytes)
+        if len(too_large) > 0:
+            raise Exception(
+                f"Frame {too_large[0]} is too large for a simularium file "
+                f"({frame_n_bytes[too_large[0]]} bytes), try filtering out some data."
             )
-            frame_n_values = BINARY_SETTINGS.FRAME_HEADER_N_VALUES + buffer_size
-            frame_n_bytes = BINARY_SETTINGS.BYTES_PER_VALUE * frame_n_values
-            if frame_n_bytes > max_spatial_bytes:
-                raise Exception(
-                    f"Frame {frame_index} is too large for a simularium file "
-                    f"({frame_n_bytes} bytes), try filtering out some data."
+        # each frame adds its bytes and its offset and length in the spatial header
+        cumulative_bytes = np.cumsum(
+            frame_n_bytes
+            + BINARY_SETTINGS.BYTES_PER_VALUE
+            * BINARY_SETTINGS.SPATIAL_BLOCK_HEADER_N_VALUES_PER_FRAME
+        )
+        max_frames_bytes = max_spatial_bytes - BINARY_SETTINGS.BYTES_PER_VALUE * (
+            BINARY_SETTINGS.BLOCK_HEADER_N_VALUES
+            + BINARY_SETTINGS.SPATIAL_BLOCK_HEADER_CONSTANT_N_VALUES
+        )
+        file_chunks = []
+        start_index = 0
+        n_frames = len(frame_n_values)
+        while start_index < n_frames or len(file_chunks) == 0:
+            previous_bytes = cumulative_bytes[start_index - 1] if start_index > 0 else 0
+            end_index = int(
+                np.searchsorted(
+                    cumulative_bytes, previous_bytes + max_frames_bytes, side="right"
                 )
-            new_bytes = spatial_header_n_bytes + current_frames_bytes + frame_n_bytes
-            if new_bytes > max_spatial_bytes:
-                file_chunks.append(BinaryChunk(frame_index))
-                current_chunk += 1
-                current_frames_bytes = 0
-            file_chunks[current_chunk].n_frames += 1
-            file_chunks[current_chunk].n_values += frame_n_values
-            file_chunks[current_chunk].frame_n_values.append(frame_n_values)
-            current_frames_bytes += frame_n_bytes
+            )
+            if end_index <= start_index and start_index < n_frames:
+                # a frame that doesn't fit with the headers is added alone
+                # to a new chunk (after an empty first chunk if it's the first frame)
+                if start_index == 0:
+                    file_chunks.append(BinaryChunk(start_index))
+                end_index = start_index + 1
+            chunk = BinaryChunk(start_index)
+            chunk.frame_n_values = frame_n_values[start_index:end_index].tolist()
+            chunk.n_frames = len(chunk.frame_n_values)
+            chunk.n_values = int(np.sum(frame_n_values[start_index:end_index]))
+            file_chunks.append(chunk)
+            start_index = end_index
         for chunk in file_chunks:
             chunk.n_bytes = BINARY_SETTINGS.BYTES_PER_VALUE * (
                 BINARY_SETTINGS.BLOCK_HEADER_N_VALUES
@@ -219,6 +237,24 @@ class BinaryWriter(Writer):
             format_string=f"<{n_header_values}I",
         )
 
+    @staticmethod
+    def _frame_header(
+        global_time_index: int,
+        chunk_time_index: int,
+        agent_data: AgentData,
+    ) -> BinaryValues:
+        """
+        Return the frame number, time, and number of agents for a frame
+        """
+        return BinaryValues(
+            values=[
+                int(chunk_time_index),
+                float(agent_data.times[global_time_index]),
+                int(agent_data.n_agents[global_time_index]),
+            ],
+            format_string="IfI",
+        )
+
     @staticmethod
     def _formatted_frame(
         global_time_index: int,
@@ -230,18 +266,11 @@ class BinaryWriter(Writer):
         """
         Return the frame of data as a list of BinaryValues
         """
-        frame_buffer, _, _ = Writer._get_frame_buffer(
+        frame_buffer, _, _ = Writer._get_frame_buffer_array(
             global_time_index, agent_data, type_ids, buffer_size
         )
         return [
-            BinaryValues(
-                values=[
-                    int(chunk_time_index),
-                    float(agent_data.times[global_time_index]),
-                    int(agent_data.n_agents[global_time_index]),
-                ],
-                format_string="IfI",
-            ),
+            BinaryWriter._frame_header(global_time_index, chunk_time_index, agent_data),
             BinaryValues(
                 values=frame_buffer,
                 format_string=f"{len(frame_buffer)}f",
@@ -271,6 +300,61 @@ class BinaryWriter(Writer):
             result += frame_data
         return result
 
+    @staticmethod
+    def _plan_binary_data(
+        trajectory_data: TrajectoryData,
+        max_bytes: int = BINARY_SETTINGS.MAX_BYTES,
+    ) -> Tuple[np.ndarray, Dict[str, Any], List[int], List[BinaryChunk], int, int]:
+        """
+        Get the type IDs and mapping, the number of values in each frame,
+        and how the frames will be chunked into files,
+        also return size of trajectory info and plot data
+        """
+        trajectory_data.agent_data._check_subpoints_match_display_type()
+        frame_buffers_n_values = BinaryWriter._frame_buffers_n_values(trajectory_data)
+        type_ids, type_mapping = trajectory_data.agent_data.get_type_ids_and_mapping()
+        file_chunks, traj_info_n_bytes, plot_data_n_bytes = BinaryWriter._chunk_files(
+            trajectory_data, type_mapping, frame_buffers_n_values, max_bytes
+        )
+        return (
+            type_ids,
+            type_mapping,
+            frame_buffers_n_values,
+            file_chunks,
+            traj_info_n_bytes,
+            plot_data_n_bytes,
+        )
+
+    @staticmethod
+    def _format_chunk(
+        file_chunk: BinaryChunk,
+        trajectory_data: TrajectoryData,
+        type_ids: np.ndarray,
+        type_mapping: Dict[str, Any],
+        frame_buffers_n_values: List[int],
+        traj_info_n_bytes: int,
+        plot_data_n_bytes: int,
+    ) -> Tuple[BinaryValues, Dict[str, Any], List[BinaryValues]]:
+        """
+        Return the binary header, trajectory info, and spatial data
+        for one file chunk
+        """
+        binary_header = BinaryWriter._binary_header(
+            traj_info_n_bytes,
+            file_chunk.n_bytes,
+            plot_data_n_bytes,
+        )
+        trajectory_info = Writer._get_trajectory_info(
+            trajectory_data, file_chunk.n_frames, type_mapping
+        )
+        binary_spatial_data = BinaryWriter._binary_spatial_data(
+            file_chunk,
+            trajectory_data,
+            type_ids,
+            frame_buffers_n_values,
+        )
+        return binary_header, trajectory_info, binary_spatial_data
+
     @staticmethod
     def format_trajectory_data(
         trajectory_data: TrajectoryData,
@@ -284,38 +368,35 @@ class BinaryWriter(Writer):
             the data to format
         """
         print("Converting Trajectory Data to Binary -------------")
-        trajectory_data.agent_data._check_subpoints_match_display_type()
-        frame_buffers_n_values = BinaryWriter._frame_buffers_n_values(trajectory_data)
-        type_ids, type_mapping = trajectory_data.agent_data.get_type_ids_and_mapping()
-        file_chunks, traj_info_n_bytes, plot_data_n_bytes = BinaryWriter._chunk_files(
-            trajectory_data, type_mapping, frame_buffers_n_values, max_bytes
-        )
+        (
+            type_ids,
+            type_mapping,
+            frame_buffers_n_values,
+            file_chunks,
+            traj_info_n_bytes,
+            plot_data_n_bytes,
+        ) = BinaryWriter._plan_binary_data(trajectory_data, max_bytes)
         # format data
-        binary_headers = [[] for chunk in file_chunks]
+        binary_headers = []
         trajectory_infos = []
-        binary_spatial_data = [[] for chunk in file_chunks]
-        for chunk_index, file_chunk in enumerate(file_chunks):
-            # binary header
-            binary_headers[chunk_index].append(
-                BinaryWriter._binary_header(
-                    traj_info_n_bytes,
-                    file_chunk.n_bytes,
-                    plot_data_n_bytes,
-                )
-            )
-            # trajectory info
-            trajectory_infos.append(
-                Writer._get_trajectory_info(
-                    trajectory_data, file_chunk.n_frames, type_mapping
-                )
-            )
-            # spatial data
-            binary_spatial_data[chunk_index] += BinaryWriter._binary_spatial_data(
+        binary_spatial_data = []
+        for file_chunk in file_chunks:
+            (
+                binary_header,
+                trajectory_info,
+                chunk_spatial_data,
+            ) = BinaryWriter._format_chunk(
                 file_chunk,
                 trajectory_data,
                 type_ids,
+                type_mapping,
                 frame_buffers_n_values,
+                traj_info_n_bytes,
+                plot_data_n_bytes,
             )
+            binary_headers.append([binary_header])
+            trajectory_infos.append(trajectory_info)
+            binary_spatial_data.append(chunk_spatial_data)
         return (
             binary_headers,
             trajectory_infos,
@@ -323,35 +404,37 @@ class BinaryWriter(Writer):
         )
 
     @staticmethod
-    def _data_buffer_with_format(
-        index: int, binary_data: List[BinaryValues]
-    ) -> Tuple[List[float], str]:
+    def _binary_values_to_bytes(binary_values: List[BinaryValues]) -> bytes:
         """
-        Return the buffer of data at index and its format string
+        Pack a list of BinaryValues into little-endian bytes.
+        Values held in numpy arrays are cast and copied as a block
+        instead of being passed to struct.pack one Python object at a time
         """
-        return (
-            [
-                value
-                for binary_values in binary_data[index]
-                for value in binary_values.values
-            ],
-            "".join(value.format_string for value in binary_data[index]),
-        )
+        result = []
+        for values in binary_values:
+            format_string = values.format_string.lstrip("<")
+            if isinstance(values.values, np.ndarray):
+                dtype = BINARY_DTYPES[format_string[-1]]
+                result.append(values.values.astype(dtype, copy=False).tobytes())
+            else:
+                result.append(struct.pack(f"<{format_string}", *values.values))
+        return b"".join(result)
 
     @staticmethod
-    def _write_block(
-        data: Union[str, List[float]],
+    def _write_block_to_file(
+        data: Union[str, bytes, List[float]],
         block_type: int,
-        file_name: str,
+        outfile: BinaryIO,
         binary_format: str = "",
-        append: bool = True,
     ) -> int:
         """
-        Write a binary block to a file
+        Write a binary block to an open file
         Return number of bytes written
         """
         # pad to 4 byte boundary with zeros
-        if isinstance(data, str):
+        if isinstance(data, bytes):
+            databytes = data
+        elif isinstance(data, str):
             databytes = data.encode("utf-8")
             orig_len = len(databytes)
             padding = BinaryWriter._padding(orig_len)
@@ -366,23 +449,116 @@ class BinaryWriter(Writer):
         block_header_length = (
             BINARY_SETTINGS.BYTES_PER_VALUE * BINARY_SETTINGS.BLOCK_HEADER_N_VALUES
         )
-        mode = ("a" if append else "w") + "b"
-        with open(file_name, mode) as outfile:
-            # write block type
-            outfile.write(struct.pack("<i", block_type))
-            # write block size
-            outfile.write(struct.pack("<i", len(databytes) + block_header_length))
-            # write block data
-            outfile.write(databytes)
+        # write block type
+        outfile.write(struct.pack("<i", block_type))
+        # write block size
+        outfile.write(struct.pack("<i", len(databytes) + block_header_length))
+        # write block data
+        outfile.write(databytes)
         return len(databytes) + block_header_length
 
+    @staticmethod
+    def _write_spatial_data_block(
+        file_chunk: BinaryChunk,
+        trajectory_data: TrajectoryData,
+        type_ids: np.ndarray,
+        frame_buffers_n_values: List[int],
+        outfile: BinaryIO,
+        frame_encoder: ParallelFrameEncoder = None,
+        filtered_frames: FilteredFrames = None,
+    ) -> int:
+        """
+        Write the spatial data block for a file chunk to an open file,
+        encoding and writing one frame at a time.
+        The block length and frame offsets are known from the chunk,
+        so only one frame is held in memory
+        (or a few per worker if a ParallelFrameEncoder is used).
+        If FilteredFrames are given, each frame is filtered before it is encoded.
+        Return number of bytes written
+        """
+        outfile.write(
+            struct.pack(
+                "<ii", BINARY_BLOCK_TYPE.SPATIAL_DATA_BINARY.value, file_chunk.n_bytes
+            )
+        )
+        n_bytes = (
+            BINARY_SETTINGS.BYTES_PER_VALUE * BINARY_SETTINGS.BLOCK_HEADER_N_VALUES
+        )
+        n_bytes += outfile.write(
+            BinaryWriter._binary_values_to_bytes(
+                [BinaryWriter._spatial_data_header(file_chunk)]
+            )
+        )
+        if frame_encoder is not None:
+            global_frame_indices = range(
+                file_chunk.first_frame_index,
+                file_chunk.get_global_index(file_chunk.n_frames),
+            )
+            encoded_frames = frame_encoder.binary_frames(
+                global_frame_indices,
+                [frame_buffers_n_values[index] for index in global_frame_indices],
+            )
+            for chunk_frame_index, frame_bytes in enumerate(encoded_frames):
+                n_bytes += outfile.write(
+                    BinaryWriter._binary_values_to_bytes(
+                        [
+                            BinaryWriter._frame_header(
+                                global_frame_indices[chunk_frame_index],
+                                chunk_frame_index,
+                                trajectory_data.agent_data,
+                            )
+                        ]
+                    )
+                )
+                n_bytes += outfile.write(frame_bytes)
+        elif filtered_frames is not None:
+            for chunk_frame_index in range(file_chunk.n_frames):
+                global_frame_index = file_chunk.get_global_index(chunk_frame_index)
+                frame = filtered_frames.get_frame(global_frame_index)
+                n_bytes += outfile.write(
+                    BinaryWriter._binary_values_to_bytes(
+                        BinaryWriter._formatted_frame(
+                            0,
+                            chunk_frame_index,
+                            frame,
+                            filtered_frames.get_type_ids(frame),
+                            frame_buffers_n_values[global_frame_index],
+                        )
+                    )
+                )
+        else:
+            for chunk_frame_index in range(file_chunk.n_frames):
+                global_frame_index = file_chunk.get_global_index(chunk_frame_index)
+                n_bytes += outfile.write(
+                    BinaryWriter._binary_values_to_bytes(
+                        BinaryWriter._formatted_frame(
+                            global_frame_index,
+                            chunk_frame_index,
+                            trajectory_data.agent_data,
+                            type_ids,
+                            frame_buffers_n_values[global_frame_index],
+                        )
+                    )
+                )
+        if n_bytes != file_chunk.n_bytes:
+            raise ValueError(
+                f"Spatial data block is {n_bytes} bytes, "
+                f"expected {file_chunk.n_bytes} bytes"
+            )
+        return n_bytes
+
     @staticmethod
     def save(
-        trajectory_data: TrajectoryData, output_path: str, validate_ids: bool
+        trajectory_data: TrajectoryData,
+        output_path: str,
+        validate_ids: bool,
+        n_workers: int = 1,
+        max_bytes: int = BINARY_SETTINGS.MAX_BYTES,
+        filters: List[Filter] = None,
     ) -> None:
         """
         Save the simularium data in .simularium binary format
-        at the output path
+        at the output path, streaming frames to disk as they are encoded
         Parameters
         ----------
         trajectory_data: TrajectoryData
@@ -391,53 +567,158 @@ class BinaryWriter(Writer):
             where to save the file
         validate_ids: bool
             additional validation to check agent ID size?
+        n_workers: int (optional)
+            encode frames in this many worker processes
+            Default: 1 (encode in this process)
+        max_bytes: int (optional)
+            max size of each file, the data is split into
+            output_path_{index}.simularium files if it doesn't fit in one
+            Default: BINARY_SETTINGS.MAX_BYTES
+        filters: List[Filter] (optional)
+            per-frame filters to apply to each frame as it is written,
+            instead of filtering all the data first.
+            Filtered frames are encoded in this process
+            Default: None
         """
+        if filters:
+            BinaryWriter._save_filtered(
+                trajectory_data, output_path, validate_ids, max_bytes, filters
+            )
+            return
         if validate_ids:
             Writer._validate_ids(trajectory_data)
+        print("Converting Trajectory Data to Binary -------------")
         (
-            binary_headers,
-            trajectory_infos,
-            binary_spatial_data,
-        ) = BinaryWriter.format_trajectory_data(trajectory_data)
+            type_ids,
+            type_mapping,
+            frame_buffers_n_values,
+            file_chunks,
+            traj_info_n_bytes,
+            plot_data_n_bytes,
+        ) = BinaryWriter._plan_binary_data(trajectory_data, max_bytes)
         print("Writing Binary -------------")
-        for chunk_index in range(len(binary_spatial_data)):
+        frame_encoder = None
+        if n_workers > 1:
+            frame_encoder = ParallelFrameEncoder(
+                trajectory_data.agent_data, type_ids, n_workers
+            )
+        try:
+            BinaryWriter._write_chunks(
+                trajectory_data,
+                output_path,
+                type_ids,
+                type_mapping,
+                frame_buffers_n_values,
+                file_chunks,
+                traj_info_n_bytes,
+                plot_data_n_bytes,
+                frame_encoder,
+            )
+        finally:
+            if frame_encoder is not None:
+                frame_encoder.close()
+
+    @staticmethod
+    def _save_filtered(
+        trajectory_data: TrajectoryData,
+        output_path: str,
+        validate_ids: bool,
+        max_bytes: int,
+        filters: List[Filter],
+    ) -> None:
+        """
+        Save the simularium data in .simularium binary format
+        at the output path, applying per-frame filters to each frame
+        as it is written
+        """
+        print("Converting Trajectory Data to Binary -------------")
+        filtered_frames = FilteredFrames(trajectory_data, filters)
+        if validate_ids:
+            filtered_frames.validate_ids()
+        file_chunks, traj_info_n_bytes, plot_data_n_bytes = BinaryWriter._chunk_files(
+            filtered_frames.trajectory_data,
+            filtered_frames.type_mapping,
+            filtered_frames.frame_buffers_n_values,
+            max_bytes,
+        )
+        print("Writing Binary -------------")
+        BinaryWriter._write_chunks(
+            filtered_frames.trajectory_data,
+            output_path,
+            None,
+            filtered_frames.type_mapping,
+            filtered_frames.frame_buffers_n_values,
+            file_chunks,
+            traj_info_n_bytes,
+            plot_data_n_bytes,
+            filtered_frames=filtered_frames,
+        )
+
+    @staticmethod
+    def _write_chunks(
+        trajectory_data: TrajectoryData,
+        output_path: str,
+        type_ids: np.ndarray,
+        type_mapping: Dict[str, Any],
+        frame_buffers_n_values: List[int],
+        file_chunks: List[BinaryChunk],
+        traj_info_n_bytes: int,
+        plot_data_n_bytes: int,
+        frame_encoder: ParallelFrameEncoder = None,
+        filtered_frames: FilteredFrames = None,
+    ) -> None:
+        """
+        Write each file chunk to a .simularium file
+        """
+        plot_data = json.dumps(
+            {
+                "version": CURRENT_VERSION.PLOT_DATA,
+                "data": trajectory_data.plots,
+            }
+        )
+        for chunk_index, file_chunk in enumerate(file_chunks):
             # determine filename(s)
-            if len(binary_headers) < 2:
+            if len(file_chunks) < 2:
                 output_name = f"{output_path}.simularium"
             else:
                 output_name = f"{output_path}_{chunk_index}.simularium"
-            # binary header
-            header_buffer, header_format = BinaryWriter._data_buffer_with_format(
-                chunk_index, binary_headers
-            )
             with open(output_name, "wb") as outfile:
-                outfile.write(struct.pack(header_format, *header_buffer))
-            # trajectory info
-            BinaryWriter._write_block(
-                json.dumps(trajectory_infos[chunk_index]),
-                BINARY_BLOCK_TYPE.TRAJ_INFO_JSON.value,
-                output_name,
-            )
-            # spatial data
-            (
-                spatial_data_buffer,
-                spatial_format,
-            ) = BinaryWriter._data_buffer_with_format(chunk_index, binary_spatial_data)
-            BinaryWriter._write_block(
-                spatial_data_buffer,
-                BINARY_BLOCK_TYPE.SPATIAL_DATA_BINARY.value,
-                output_name,
-                spatial_format,
-            )
-            # plot data
-            BinaryWriter._write_block(
-                json.dumps(
-                    {
-                        "version": CURRENT_VERSION.PLOT_DATA,
-                        "data": trajectory_data.plots,
-                    }
-                ),
-                BINARY_BLOCK_TYPE.PLOT_DATA_JSON.value,
-                output_name,
-            )
+                # binary header
+                outfile.write(
+                    BinaryWriter._binary_values_to_bytes(
+                        [
+                            BinaryWriter._binary_header(
+                                traj_info_n_bytes,
+                                file_chunk.n_bytes,
+                                plot_data_n_bytes,
+                            )
+                        ]
+                    )
+                )
+                # trajectory info
+                BinaryWriter._write_block_to_file(
+                    json.dumps(
+                        Writer._get_trajectory_info(
+                            trajectory_data, file_chunk.n_frames, type_mapping
+                        )
+                    ),
+                    BINARY_BLOCK_TYPE.TRAJ_INFO_JSON.value,
+                    outfile,
+                )
+                # spatial data
+                BinaryWriter._write_spatial_data_block(
+                    file_chunk,
+                    trajectory_data,
+                    type_ids,
+                    frame_buffers_n_values,
+                    outfile,
+                    frame_encoder,
+                    filtered_frames,
+                )
+                # plot data
+                BinaryWriter._write_block_to_file(
+                    plot_data,
+                    BINARY_BLOCK_TYPE.PLOT_DATA_JSON.value,
+                    outfile,
+                )
             print(f"saved to {output_name}")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+import logging
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ..data_objects import AgentData, DimensionData, TrajectoryData
+from ..constants import MAX_AGENT_ID
+from ..exceptions import DataError
+from ..filters import Filter
+from .writer import Writer
+
+###############################################################################
+
+log = logging.getLogger(__name__)
+
+###############################################################################
+
+
+class FilteredFrames:
+    def __init__(self, trajectory_data: TrajectoryData, filters: List[Filter]):
+        """
+        This object applies per-frame filters to one frame
+        of simularium data at a time, so writers can save filtered data
+        without filtering all of it first.
+        Each frame is filtered once to plan the output
+        (the number of values in each frame and the type mapping),
+        and again when it is written. The input data is not changed
+
+        Parameters
+        ----------
+        trajectory_data: TrajectoryData
+            the data to filter
+        filters: List[Filter]
+            the filters to apply, in order,
+            they must all be per-frame filters (Filter.per_frame)
+        """
+        for _filter in filters:
+            if not _filter.per_frame:
+                raise DataError(
+                    f"{type(_filter).__name__} can't be applied to each frame "
+                    "on its own, filter the data before saving instead"
+                )
+        self.filters = filters
+        self.agent_data = trajectory_data.agent_data
+        self.display_data = copy.deepcopy(self.agent_data.display_data)
+        # filter everything but the agent data
+        result = copy.copy(trajectory_data)
+        result.agent_data = None
+        result = copy.deepcopy(result)
+        for _filter in filters:
+            result = _filter.apply_to_meta_data(result)
+        self.trajectory_data = result
+        self._plan()
+
+    def get_frame(self, time_index: int) -> AgentData:
+        """
+        Get a filtered copy of the agent data for the frame at time_index
+        """
+        result = self.agent_data.take_frames([time_index])
+        result.display_data = self.display_data
+        for _filter in self.filters:
+            result = _filter.apply_to_agent_data(result)
+        return result
+
+    def get_type_ids(self, frame: AgentData) -> np.ndarray:
+        """
+        Get the type ID for each agent in a filtered frame
+        (shape = [1, agents])
+        """
+        n_agents = int(frame.n_agents[0])
+        result = np.zeros((1, max(n_agents, 1)))
+        result[0, :n_agents] = [
+            self.type_id_mapping.get(type_name, 0)
+            for type_name in frame.types[0][:n_agents]
+        ]
+        return result
+
+    def _add_types(self, frame: AgentData) -> None:
+        """
+        Add the types in a filtered frame to the type mapping,
+        numbered in the order they first appear,
+        like AgentData.get_type_ids_and_mapping()
+        """
+        for type_name in frame.types[0][: int(frame.n_agents[0])]:
+            if len(type_name) == 0 or type_name in self.type_id_mapping:
+                continue
+            if type_name not in frame.display_data:
+                raise DataError(
+                    f"Please provide DisplayData for agent type {type_name}"
+                )
+            type_id = len(self.type_id_mapping)
+            self.type_id_mapping[type_name] = type_id
+            self.type_mapping[str(type_id)] = {
+                "name": type_name,
+                "geometry": dict(frame.display_data[type_name]),
+            }
+
+    def _plan(self) -> None:
+        """
+        Filter each frame to find the time, number of agents,
+        and number of buffer values for each frame,
+        the type mapping, and the unique IDs used
+        """
+        total_steps = self.agent_data.total_timesteps()
+        times = np.zeros(total_steps)
+        n_agents = np.zeros(total_steps)
+        self.frame_buffers_n_values: List[int] = []
+        self.type_id_mapping: Dict[str, int] = {}
+        self.type_mapping: Dict[str, Any] = {}
+        unique_ids = []
+        for time_index in range(total_steps):
+            frame = self.get_frame(time_index)
+            frame._check_subpoints_match_display_type()
+            frame_n_agents = int(frame.n_agents[0])
+            times[time_index] = frame.times[0]
+            n_agents[time_index] = frame_n_agents
+            self.frame_buffers_n_values.append(
+                int(Writer._get_frame_buffer_sizes(frame)[0])
+            )
+            self._add_types(frame)
+            unique_ids.append(
+                np.unique(np.asarray(frame.unique_ids[0][:frame_n_agents]))
+            )
+        self.unique_ids = (
+            np.unique(np.concatenate(unique_ids)) if unique_ids else np.zeros(0)
+        )
+        # the filtered times and number of agents in each frame,
+        # for the trajectory info and frame headers
+        self.trajectory_data.agent_data = AgentData.from_dimensions(
+            DimensionData(total_steps=total_steps, max_agents=0)
+        )
+        self.trajectory_data.agent_data.times = times
+        self.trajectory_data.agent_data.n_agents = n_agents
+        self.trajectory_data.agent_data.display_data = self.display_data
+        self.trajectory_data.agent_data.draw_fiber_points = (
+            self.agent_data.draw_fiber_points
+        )
+
+    def validate_ids(self) -> None:
+        """
+        Check if the filtered agent unique IDs are valid 32 bit integers
+        """
+        if len(self.unique_ids) > 0 and self.unique_ids[-1] > MAX_AGENT_ID:
+            raise DataError(
+                f"Agent IDs is larger than a 32 bit integer: {self.unique_ids[-1]} "
+            )
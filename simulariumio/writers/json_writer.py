@@ -3,7 +3,7 @@
 
 import json
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import numpy as np
 
@@ -12,7 +12,10 @@ from ..data_objects import (
     TrajectoryData,
 )
 from ..constants import V1_SPATIAL_BUFFER_STRUCT, CURRENT_VERSION, VALUES_PER_3D_POINT
+from ..filters import Filter
 from .writer import Writer
+from .parallel_frame_encoder import ParallelFrameEncoder
+from .filtered_frames import FilteredFrames
 
 ###############################################################################
 
@@ -33,7 +36,7 @@ class JsonWriter(Writer):
         """
         bundle_data: List[Dict[str, Any]] = []
         uids = {}
-        used_unique_IDs = list(np.unique(agent_data.unique_ids))
+        used_unique_IDs = list(np.unique(agent_data.unique_ids.flatten()))
         total_steps = (
             agent_data.n_timesteps
             if agent_data.n_timesteps >= 0
@@ -164,7 +167,11 @@ class JsonWriter(Writer):
 
     @staticmethod
     def save(
-        trajectory_data: TrajectoryData, output_path: str, validate_ids: bool
+        trajectory_data: TrajectoryData,
+        output_path: str,
+        validate_ids: bool,
+        n_workers: int = 1,
+        filters: List[Filter] = None,
     ) -> None:
         """
         Save the simularium data in .simularium JSON format
@@ -177,15 +184,154 @@ class JsonWriter(Writer):
             where to save the file
         validate_ids: bool (optional)
             additional validation to check agent ID size?
+        n_workers: int (optional)
+            encode frames in this many worker processes.
+            Fiber point spheres get IDs that depend on earlier frames,
+            so data with draw_fiber_points is always encoded in this process
+            Default: 1 (encode in this process)
+        filters: List[Filter] (optional)
+            per-frame filters to apply to each frame as it is written,
+            instead of filtering all the data first.
+            Filtered frames are encoded in this process
+            Default: None
         """
+        if filters:
+            JsonWriter._save_filtered(
+                trajectory_data, output_path, validate_ids, filters
+            )
+            return
         if validate_ids:
             Writer._validate_ids(trajectory_data)
+        agent_data = trajectory_data.agent_data
+        if n_workers > 1 and not (
+            agent_data.draw_fiber_points and np.amax(agent_data.n_subpoints) > 0
+        ):
+            JsonWriter._save_in_parallel(trajectory_data, output_path, n_workers)
+            return
         json_data = JsonWriter.format_trajectory_data(trajectory_data)
         print("Writing JSON -------------")
         with open(f"{output_path}.simularium", "w+") as outfile:
             json.dump(json_data, outfile)
         print(f"saved to {output_path}.simularium")
 
+    @staticmethod
+    def _save_in_parallel(
+        trajectory_data: TrajectoryData, output_path: str, n_workers: int
+    ) -> None:
+        """
+        Save the simularium data in .simularium JSON format
+        at the output path, encoding the frames in worker processes
+        and writing the bundleData as they are returned in order.
+        The output matches json.dump() of format_trajectory_data()
+        """
+        print("Converting Trajectory Data to JSON -------------")
+        agent_data = trajectory_data.agent_data
+        agent_data._check_subpoints_match_display_type()
+        total_steps = agent_data.total_timesteps()
+        type_ids, type_mapping = agent_data.get_type_ids_and_mapping()
+        print("Writing JSON -------------")
+        with ParallelFrameEncoder(agent_data, type_ids, n_workers) as frame_encoder:
+            JsonWriter._write_streamed(
+                trajectory_data,
+                output_path,
+                total_steps,
+                type_mapping,
+                frame_encoder.json_frames(range(total_steps)),
+            )
+
+    @staticmethod
+    def _write_streamed(
+        trajectory_data: TrajectoryData,
+        output_path: str,
+        total_steps: int,
+        type_mapping: Dict[str, Any],
+        frames: Iterator[str],
+    ) -> None:
+        """
+        Write the simularium data in .simularium JSON format
+        at the output path, writing each bundleData frame
+        as it is encoded. The output matches json.dump()
+        of format_trajectory_data()
+        """
+        trajectory_info = Writer._get_trajectory_info(
+            trajectory_data, total_steps, type_mapping
+        )
+        spatial_data_header = {
+            "version": CURRENT_VERSION.SPATIAL_DATA,
+            "msgType": 1,
+            "bundleStart": 0,
+            "bundleSize": total_steps,
+        }
+        plot_data = {
+            "version": CURRENT_VERSION.PLOT_DATA,
+            "data": trajectory_data.plots,
+        }
+        with open(f"{output_path}.simularium", "w+") as outfile:
+            outfile.write('{"trajectoryInfo": ')
+            outfile.write(json.dumps(trajectory_info))
+            outfile.write(', "spatialData": ')
+            # leave the spatialData object open to add the bundleData
+            outfile.write(json.dumps(spatial_data_header)[:-1])
+            outfile.write(', "bundleData": [')
+            for time_index, frame in enumerate(frames):
+                if time_index > 0:
+                    outfile.write(", ")
+                outfile.write(frame)
+            outfile.write(']}, "plotData": ')
+            outfile.write(json.dumps(plot_data))
+            outfile.write("}")
+        print(f"saved to {output_path}.simularium")
+
+    @staticmethod
+    def _filtered_json_frames(filtered_frames: FilteredFrames) -> Iterator[str]:
+        """
+        Filter each frame and yield its JSON bundleData entry
+        """
+        uids = {}
+        used_unique_IDs = list(filtered_frames.unique_ids)
+        for time_index in range(len(filtered_frames.frame_buffers_n_values)):
+            frame = filtered_frames.get_frame(time_index)
+            frame_buffer, uids, used_unique_IDs = Writer._get_frame_buffer(
+                0,
+                frame,
+                filtered_frames.get_type_ids(frame),
+                -1,
+                uids,
+                used_unique_IDs,
+            )
+            yield json.dumps(
+                {
+                    "frameNumber": time_index,
+                    "time": float(frame.times[0]),
+                    "data": frame_buffer,
+                }
+            )
+
+    @staticmethod
+    def _save_filtered(
+        trajectory_data: TrajectoryData,
+        output_path: str,
+        validate_ids: bool,
+        filters: List[Filter],
+    ) -> None:
+        """
+        Save the simularium data in .simularium JSON format
+        at the output path, applying per-frame filters to each frame
+        as it is written
+        """
+        print("Converting Trajectory Data to JSON -------------")
+        filtered_frames = FilteredFrames(trajectory_data, filters)
+        if validate_ids:
+            filtered_frames.validate_ids()
+        print("Writing JSON -------------")
+        JsonWriter._write_streamed(
+            filtered_frames.trajectory_data,
+            output_path,
+            len(filtered_frames.frame_buffers_n_values),
+            filtered_frames.type_mapping,
+            JsonWriter._filtered_json_frames(filtered_frames),
+        )
+
     @staticmethod
     def save_plot_data(plot_data: List[Dict[str, Any]], output_path: str):
         """
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+import copy
+import json
+import logging
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, List, Tuple
+
+import numpy as np
+
+from ..data_objects import AgentData, RaggedArray
+from .writer import Writer
+
+###############################################################################
+
+log = logging.getLogger(__name__)
+
+###############################################################################
+
+# AgentData and type IDs opened by each worker process
+_worker_data = {}
+
+###############################################################################
+
+
+def _load_shared(descriptor: Tuple) -> Any:
+    """
+    Open an array saved by ParallelFrameEncoder._share as a read-only memmap
+    """
+    if descriptor[0] == "ragged":
+        return RaggedArray(_load_shared(descriptor[1]), _load_shared(descriptor[2]))
+    return np.load(descriptor[1], mmap_mode="r")
+
+
+def _init_worker(template: AgentData, shared: List[Tuple], type_ids: Tuple) -> None:
+    """
+    Rebuild the AgentData in a worker process from memory-mapped arrays
+    """
+    agent_data = copy.copy(template)
+    for name, descriptor in shared:
+        setattr(agent_data, name, _load_shared(descriptor))
+    _worker_data["agent_data"] = agent_data
+    _worker_data["type_ids"] = _load_shared(type_ids)
+
+
+def _encode_binary_frames(
+    frame_indices: List[int], buffer_sizes: List[int]
+) -> List[bytes]:
+    """
+    Encode the values for each frame as little-endian float32 bytes
+    """
+    agent_data = _worker_data["agent_data"]
+    type_ids = _worker_data["type_ids"]
+    result = []
+    for time_index, buffer_size in zip(frame_indices, buffer_sizes):
+        frame_buffer, _, _ = Writer._get_frame_buffer_array(
+            time_index, agent_data, type_ids, buffer_size
+        )
+        result.append(frame_buffer.astype("<f4").tobytes())
+    return result
+
+
+def _encode_json_frames(frame_indices: List[int]) -> List[str]:
+    """
+    Encode each frame as a JSON bundleData entry
+    """
+    agent_data = _worker_data["agent_data"]
+    type_ids = _worker_data["type_ids"]
+    result = []
+    for time_index in frame_indices:
+        frame_buffer, _, _ = Writer._get_frame_buffer_array(
+            time_index, agent_data, type_ids
+        )
+        result.append(
+            json.dumps(
+                {
+                    "frameNumber": time_index,
+                    "time": float(agent_data.times[time_index]),
+                    "data": frame_buffer.tolist(),
+                }
+            )
+        )
+    return result
+
+
+###############################################################################
+
+
+class ParallelFrameEncoder:
+    def __init__(
+        self,
+        agent_data: AgentData,
+        type_ids: np.ndarray,
+        n_workers: int,
+        frames_per_task: int = -1,
+    ):
+        """
+        This object encodes frames of AgentData in worker processes.
+        The agent arrays are saved once to .npy files in a temporary
+        directory that each worker opens as read-only memmaps,
+        so they are not pickled for every task.
+        Encoded frames are returned in order
+
+        Use as a context manager to shut down the workers
+        and remove the temporary files when finished
+
+        Parameters
+        ----------
+        agent_data: AgentData
+            the data to encode
+        type_ids: np.ndarray
+            the type ID for each agent, from get_type_ids_and_mapping()
+        n_workers: int
+            how many worker processes to use
+        frames_per_task: int (optional)
+            how many frames each worker encodes per task
+            Default: -1 (split the frames into about 4 tasks per worker)
+        """
+        self.n_workers = n_workers
+        self.frames_per_task = frames_per_task
+        self._temp_dir = tempfile.TemporaryDirectory()
+        template = copy.copy(agent_data)
+        shared = []
+        for name, value in vars(agent_data).items():
+            if not self._can_share(value):
+                continue
+            shared.append((name, self._share(value, name)))
+            setattr(template, name, None)
+        template.types = []
+        if agent_data.draw_fiber_points:
+            # only needed to check the display type of fibers
+            shared.append(
+                ("types", self._share(self._types_array(agent_data.types), "types"))
+            )
+        self._executor = ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(template, shared, self._share(type_ids, "type_ids")),
+        )
+
+    @staticmethod
+    def _can_share(value: Any) -> bool:
+        """
+        Can the value be saved to a file and opened as a memmap?
+        """
+        if isinstance(value, RaggedArray):
+            return ParallelFrameEncoder._can_share(value.values)
+        return isinstance(value, np.ndarray) and value.dtype != object
+
+    @staticmethod
+    def _types_array(types: List[List[str]]) -> np.ndarray:
+        """
+        Get the type names as a numpy array padded with empty strings
+        """
+        max_agents = max([len(frame_types) for frame_types in types], default=0)
+        max_length = max(
+            [len(type_name) for frame_types in types for type_name in frame_types],
+            default=0,
+        )
+        result = np.full((len(types), max_agents), "", dtype=f"<U{max(max_length, 1)}")
+        for time_index, frame_types in enumerate(types):
+            result[time_index, : len(frame_types)] = frame_types
+        return result
+
+    def _share(self, value: Any, name: str) -> Tuple:
+        """
+        Save an array (or each level of a RaggedArray) to a .npy file
+        and return a description of how to open it
+        """
+        if isinstance(value, RaggedArray):
+            return (
+                "ragged",
+                self._share(value.values, f"{name}_values"),
+                self._share(value.offsets, f"{name}_offsets"),
+            )
+        path = os.path.join(self._temp_dir.name, f"{name}.npy")
+        np.save(path, np.ascontiguousarray(value))
+        return ("array", path)
+
+    def _tasks(self, frame_indices: List[int]) -> Iterator[slice]:
+        """
+        Split the frames into contiguous ranges for the workers
+        """
+        frames_per_task = self.frames_per_task
+        if frames_per_task < 1:
+            frames_per_task = max(
+                1, math.ceil(len(frame_indices) / float(4 * self.n_workers))
+            )
+        for start in range(0, len(frame_indices), frames_per_task):
+            yield slice(start, start + frames_per_task)
+
+    def _map_in_order(
+        self, function: Callable, frame_indices: List[int], *args: List[Any]
+    ) -> Iterator[Any]:
+        """
+        Run the function on ranges of frames in the workers
+        and yield the results for each frame in order,
+        keeping a limited number of tasks in flight
+        """
+        pending = collections.deque()
+        for task in self._tasks(frame_indices):
+            pending.append(
+                self._executor.submit(
+                    function, frame_indices[task], *[arg[task] for arg in args]
+                )
+            )
+            if len(pending) >= 2 * self.n_workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def binary_frames(
+        self, frame_indices: List[int], buffer_sizes: List[int]
+    ) -> Iterator[bytes]:
+        """
+        Yield the float32 bytes for the values of each frame
+
+        Parameters
+        ----------
+        frame_indices: List[int]
+            the time indices to encode
+        buffer_sizes: List[int]
+            the number of values in each frame's buffer
+        """
+        return self._map_in_order(
+            _encode_binary_frames, list(frame_indices), list(buffer_sizes)
+        )
+
+    def json_frames(self, frame_indices: List[int]) -> Iterator[str]:
+        """
+        Yield the JSON bundleData entry for each frame
+
+        Parameters
+        ----------
+        frame_indices: List[int]
+            the time indices to encode
+        """
+        return self._map_in_order(_encode_json_frames, list(frame_indices))
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        self._temp_dir.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
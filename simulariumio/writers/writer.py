@@ -4,7 +4,6 @@
 import logging
 from abc import ABC, abstractmethod
 from typing import Any, List, Dict, Tuple
-import math
 
 import numpy as np
 
@@ -12,6 +11,7 @@ from ..data_objects import (
     TrajectoryData,
     AgentData,
     DisplayData,
+    RaggedArray,
 )
 from ..constants import (
     V1_SPATIAL_BUFFER_STRUCT,
@@ -113,6 +113,25 @@ class Writer(ABC):
             result["modelInfo"] = dict(trajectory_data.meta_data.model_meta_data)
         return result
 
+    @staticmethod
+    def _get_subpoints_buffer_sizes(
+        n_subpoints: np.ndarray, draw_fiber_points: bool
+    ) -> np.ndarray:
+        """
+        Get the number of buffer values needed for each agent's subpoints,
+        and for the spheres drawn at its fiber points if draw_fiber_points
+        """
+        n_subpoints = np.asarray(n_subpoints).astype(np.int64)
+        result = np.where(n_subpoints > 0, n_subpoints, 0)
+        if draw_fiber_points:
+            result += np.where(
+                n_subpoints > 0,
+                V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT
+                * np.maximum(-(-n_subpoints // 6), 1),
+                0,
+            )
+        return result
+
     @staticmethod
     def _get_frame_buffer_size(
         time_index: int,
@@ -122,16 +141,53 @@ class Writer(ABC):
         Get the required size for a buffer to hold the given frame of AgentData
         """
         n_agents = int(agent_data.n_agents[time_index])
-        buffer_size = (V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT) * n_agents
-        for agent_index in range(n_agents):
-            n_subpoints = int(agent_data.n_subpoints[time_index][agent_index])
-            if n_subpoints > 0:
-                buffer_size += n_subpoints
-                if agent_data.draw_fiber_points:
-                    buffer_size += (
-                        V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT
-                    ) * max(math.ceil(n_subpoints / 6.0), 1)
-        return buffer_size
+        return int(
+            (V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT) * n_agents
+            + np.sum(
+                Writer._get_subpoints_buffer_sizes(
+                    agent_data.n_subpoints[time_index][:n_agents],
+                    agent_data.draw_fiber_points,
+                )
+            )
+        )
+
+    @staticmethod
+    def _get_frame_buffer_sizes(agent_data: AgentData) -> np.ndarray:
+        """
+        Get the required size for a buffer to hold each frame of AgentData,
+        computed for all frames at once
+        """
+        total_steps = agent_data.total_timesteps()
+        n_agents = np.asarray(agent_data.n_agents[:total_steps]).astype(np.int64)
+        if isinstance(agent_data.n_subpoints, RaggedArray):
+            n_subpoints = agent_data.n_subpoints[:total_steps]
+            subpoints_sizes = np.bincount(
+                np.repeat(np.arange(total_steps), n_subpoints.lengths),
+                weights=Writer._get_subpoints_buffer_sizes(
+                    n_subpoints.leaf, agent_data.draw_fiber_points
+                ),
+                minlength=total_steps,
+            )
+        else:
+            n_subpoints = np.asarray(agent_data.n_subpoints[:total_steps])
+            n_subpoints = n_subpoints.reshape(total_steps, -1)
+            valid_agents = (
+                np.arange(n_subpoints.shape[1])[np.newaxis, :] < n_agents[:, np.newaxis]
+            )
+            subpoints_sizes = np.sum(
+                np.where(
+                    valid_agents,
+                    Writer._get_subpoints_buffer_sizes(
+                        n_subpoints, agent_data.draw_fiber_points
+                    ),
+                    0,
+                ),
+                axis=1,
+            )
+        return (
+            V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT * n_agents
+            + subpoints_sizes.astype(np.int64)
+        )
 
     @staticmethod
     def _get_frame_buffer(
@@ -145,6 +201,23 @@ class Writer(ABC):
         """
         Get a float buffer for one frame of AgentData
         """
+        result, uids, used_unique_IDs = Writer._get_frame_buffer_array(
+            time_index, agent_data, type_ids, buffer_size, uids, used_unique_IDs
+        )
+        return result.tolist(), uids, used_unique_IDs
+
+    @staticmethod
+    def _get_frame_buffer_array(
+        time_index: int,
+        agent_data: AgentData,
+        type_ids: np.ndarray,
+        buffer_size: int = -1,
+        uids: Dict[int, int] = None,
+        used_unique_IDs: List[int] = None,
+    ) -> Tuple[np.ndarray, Dict[int, int], List[int]]:
+        """
+        Get a float buffer for one frame of AgentData as a numpy array
+        """
         if buffer_size < 0:
             buffer_size = Writer._get_frame_buffer_size(time_index, agent_data)
         if uids is None:
@@ -153,92 +226,177 @@ class Writer(ABC):
             used_unique_IDs = []
         result = np.zeros(buffer_size)
         n_agents = int(agent_data.n_agents[time_index])
-        i = 0
-        for agent_index in range(n_agents):
-            # add agent
-            result[i + V1_SPATIAL_BUFFER_STRUCT.VIZ_TYPE_INDEX] = agent_data.viz_types[
-                time_index, agent_index
-            ]
-            result[i + V1_SPATIAL_BUFFER_STRUCT.UID_INDEX] = agent_data.unique_ids[
-                time_index, agent_index
-            ]
-            result[i + V1_SPATIAL_BUFFER_STRUCT.TID_INDEX] = type_ids[
-                time_index, agent_index
-            ]
-            result[
-                i
-                + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX : i
-                + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX
-                + VALUES_PER_3D_POINT
-            ] = agent_data.positions[time_index, agent_index]
-            result[
-                i
-                + V1_SPATIAL_BUFFER_STRUCT.ROTX_INDEX : i
-                + V1_SPATIAL_BUFFER_STRUCT.ROTX_INDEX
-                + VALUES_PER_3D_POINT
-            ] = agent_data.rotations[time_index, agent_index]
-            result[i + V1_SPATIAL_BUFFER_STRUCT.R_INDEX] = agent_data.radii[
-                time_index, agent_index
-            ]
-            n_subpoints = int(agent_data.n_subpoints[time_index][agent_index])
-            result[i + V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX] = n_subpoints
-            if n_subpoints > 0:
-                # add subpoints
-                sp_start_index = i + V1_SPATIAL_BUFFER_STRUCT.SP_INDEX
-                result[
-                    sp_start_index : sp_start_index + n_subpoints
-                ] = agent_data.subpoints[time_index][agent_index][:n_subpoints]
-                i += (V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT) + n_subpoints
-                # optionally draw spheres at points
-                if agent_data.draw_fiber_points:
-                    type_name = agent_data.types[time_index][agent_index]
-                    if type_name not in agent_data.display_data:
-                        continue
-                    display_type = agent_data.display_data[type_name].display_type
-                    if display_type != DISPLAY_TYPE.FIBER:
-                        continue
-                    n_fiber_points = math.floor(
-                        n_subpoints
-                        / float(SUBPOINT_VALUES_PER_ITEM(DISPLAY_TYPE.FIBER))
-                    )
-                    for p in range(n_fiber_points):
-                        # every other fiber point
-                        if p % 2 != 0:
-                            continue
-                        # unique instance ID
-                        raw_uid = (
-                            100 * (agent_data.unique_ids[time_index, agent_index] + 1)
-                            + p
-                        )
-                        if raw_uid not in uids:
-                            uid = raw_uid
-                            while uid in used_unique_IDs:
-                                uid += 100
-                            uids[raw_uid] = uid
-                            used_unique_IDs.append(uid)
-                        # add sphere
-                        result[
-                            i + V1_SPATIAL_BUFFER_STRUCT.VIZ_TYPE_INDEX
-                        ] = VIZ_TYPE.DEFAULT
-                        result[i + V1_SPATIAL_BUFFER_STRUCT.UID_INDEX] = uids[raw_uid]
-                        result[i + V1_SPATIAL_BUFFER_STRUCT.TID_INDEX] = type_ids[
-                            time_index, agent_index
-                        ]
-                        first_subpoint_index = VALUES_PER_3D_POINT * p
-                        result[
-                            i
-                            + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX : i
-                            + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX
-                            + VALUES_PER_3D_POINT
-                        ] = agent_data.subpoints[time_index][agent_index][
-                            first_subpoint_index : first_subpoint_index
-                            + VALUES_PER_3D_POINT
-                        ]
-                        result[i + V1_SPATIAL_BUFFER_STRUCT.R_INDEX] = 0.5
-                        i += V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT
-            else:
-                i += V1_SPATIAL_BUFFER_STRUCT.MIN_VALUES_PER_AGENT
-        return result.tolist(), uids, used_unique_IDs
+        if n_agents < 1:
+            return result, uids, used_unique_IDs
+        buffer_struct = V1_SPATIAL_BUFFER_STRUCT
+        n_subpoints = np.asarray(agent_data.n_subpoints[time_index][:n_agents]).astype(
+            np.int64
+        )
+        subpoints_lengths = np.maximum(n_subpoints, 0)
+        # how many fiber point spheres to draw for each agent
+        n_spheres = np.zeros(n_agents, dtype=np.int64)
+        if agent_data.draw_fiber_points:
+            n_spheres = Writer._get_n_fiber_point_spheres(
+                time_index, agent_data, n_subpoints
+            )
+        # the index in the buffer where each agent starts
+        agent_lengths = (
+            buffer_struct.MIN_VALUES_PER_AGENT
+            + subpoints_lengths
+            + buffer_struct.MIN_VALUES_PER_AGENT * n_spheres
+        )
+        agent_starts = np.zeros(n_agents, dtype=np.int64)
+        np.cumsum(agent_lengths[:-1], out=agent_starts[1:])
+        # add agents
+        frame_type_ids = type_ids[time_index, :n_agents]
+        result[agent_starts + buffer_struct.VIZ_TYPE_INDEX] = agent_data.viz_types[
+            time_index, :n_agents
+        ]
+        result[agent_starts + buffer_struct.UID_INDEX] = agent_data.unique_ids[
+            time_index, :n_agents
+        ]
+        result[agent_starts + buffer_struct.TID_INDEX] = frame_type_ids
+        xyz = np.arange(VALUES_PER_3D_POINT)
+        result[
+            agent_starts[:, np.newaxis] + buffer_struct.POSX_INDEX + xyz
+        ] = agent_data.positions[time_index, :n_agents]
+        result[
+            agent_starts[:, np.newaxis] + buffer_struct.ROTX_INDEX + xyz
+        ] = agent_data.rotations[time_index, :n_agents]
+        result[agent_starts + buffer_struct.R_INDEX] = agent_data.radii[
+            time_index, :n_agents
+        ]
+        result[agent_starts + buffer_struct.NSP_INDEX] = n_subpoints
+        total_subpoints = int(np.sum(subpoints_lengths))
+        if total_subpoints < 1:
+            return result, uids, used_unique_IDs
+        # add subpoints
+        subpoints, subpoints_starts = Writer._get_frame_subpoints(
+            agent_data.subpoints[time_index][:n_agents], subpoints_lengths
+        )
+        result[
+            np.repeat(
+                agent_starts + buffer_struct.SP_INDEX - subpoints_starts[:-1],
+                subpoints_lengths,
+            )
+            + np.arange(total_subpoints)
+        ] = subpoints
+        total_spheres = int(np.sum(n_spheres))
+        if total_spheres < 1:
+            return result, uids, used_unique_IDs
+        # optionally draw spheres at every other fiber point
+        sphere_agents = np.repeat(np.arange(n_agents), n_spheres)
+        sphere_offsets = RaggedArray.offsets_from_lengths(n_spheres)
+        sphere_index_in_agent = (
+            np.arange(total_spheres) - sphere_offsets[:-1][sphere_agents]
+        )
+        sphere_starts = (
+            agent_starts[sphere_agents]
+            + buffer_struct.SP_INDEX
+            + subpoints_lengths[sphere_agents]
+            + buffer_struct.MIN_VALUES_PER_AGENT * sphere_index_in_agent
+        )
+        fiber_point_index = 2 * sphere_index_in_agent
+        raw_uids = (
+            100
+            * (
+                np.asarray(agent_data.unique_ids[time_index, :n_agents])[sphere_agents]
+                + 1
+            )
+            + fiber_point_index
+        )
+        sphere_uids = Writer._get_fiber_point_uids(raw_uids, uids, used_unique_IDs)
+        result[sphere_starts + buffer_struct.VIZ_TYPE_INDEX] = VIZ_TYPE.DEFAULT
+        result[sphere_starts + buffer_struct.UID_INDEX] = sphere_uids
+        result[sphere_starts + buffer_struct.TID_INDEX] = np.asarray(frame_type_ids)[
+            sphere_agents
+        ]
+        result[
+            sphere_starts[:, np.newaxis] + buffer_struct.POSX_INDEX + xyz
+        ] = subpoints[
+            (
+                subpoints_starts[:-1][sphere_agents]
+                + VALUES_PER_3D_POINT * fiber_point_index
+            )[:, np.newaxis]
+            + xyz
+        ]
+        result[sphere_starts + buffer_struct.R_INDEX] = 0.5
+        return result, uids, used_unique_IDs
+
+    @staticmethod
+    def _get_n_fiber_point_spheres(
+        time_index: int,
+        agent_data: AgentData,
+        n_subpoints: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Get the number of spheres drawn at every other fiber point
+        for each agent in a frame
+        """
+        frame_types = agent_data.types[time_index]
+        is_fiber = np.zeros(len(n_subpoints), dtype=bool)
+        for agent_index in np.flatnonzero(n_subpoints > 0):
+            type_name = frame_types[agent_index]
+            is_fiber[agent_index] = (
+                type_name in agent_data.display_data
+                and agent_data.display_data[type_name].display_type
+                == DISPLAY_TYPE.FIBER
+            )
+        n_fiber_points = n_subpoints // SUBPOINT_VALUES_PER_ITEM(DISPLAY_TYPE.FIBER)
+        return np.where(is_fiber, (n_fiber_points + 1) // 2, 0)
+
+    @staticmethod
+    def _get_frame_subpoints(
+        frame_subpoints: Any, subpoints_lengths: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the first subpoints_lengths subpoints of each agent in a frame
+        concatenated, and the offsets where each agent's subpoints start
+        """
+        offsets = RaggedArray.offsets_from_lengths(subpoints_lengths)
+        if isinstance(frame_subpoints, RaggedArray):
+            values = frame_subpoints.leaf
+            starts = frame_subpoints.offsets[:-1]
+        else:
+            frame_subpoints = np.asarray(frame_subpoints)
+            frame_subpoints = frame_subpoints.reshape(frame_subpoints.shape[0], -1)
+            values = frame_subpoints.ravel()
+            starts = frame_subpoints.shape[1] * np.arange(frame_subpoints.shape[0])
+        if np.any(starts + subpoints_lengths > np.append(starts[1:], len(values))):
+            raise DataError("n_subpoints is larger than the number of subpoints")
+        return (
+            values[
+                np.repeat(starts - offsets[:-1], subpoints_lengths)
+                + np.arange(offsets[-1])
+            ],
+            offsets,
+        )
+
+    @staticmethod
+    def _get_fiber_point_uids(
+        raw_uids: np.ndarray,
+        uids: Dict[int, int],
+        used_unique_IDs: List[int],
+    ) -> np.ndarray:
+        """
+        Get a unique ID for each fiber point sphere,
+        adding new IDs to uids and used_unique_IDs in order of first appearance.
+        A raw ID that collides with a used ID is increased by 100 until unique
+        """
+        raw_uids = raw_uids.tolist()
+        new_raw_uids = [
+            raw_uid for raw_uid in dict.fromkeys(raw_uids) if raw_uid not in uids
+        ]
+        if len(new_raw_uids) > 0:
+            used = set(used_unique_IDs)
+            for raw_uid in new_raw_uids:
+                uid = raw_uid
+                while uid in used:
+                    uid += 100
+                uids[raw_uid] = uid
+                used.add(uid)
+                used_unique_IDs.append(uid)
+        return np.array([uids[raw_uid] for raw_uid in raw_uids])
 
     @staticmethod
     def _check_agent_ids_are_unique_per_frame(buffer_data: Dict[str, Any]) -> bool:
@@ -284,7 +442,7 @@ class Writer(ABC):
         returns a message identifying violating agent ID
         """
         agent_unique_ids = trajectory_data.agent_data.unique_ids
-        for uid in np.ndarray.flatten(agent_unique_ids):
+        for uid in agent_unique_ids.flatten():
             if uid > MAX_AGENT_ID:
                 raise DataError(f"Agent IDs is larger than a 32 bit integer: {uid} ")
 